@@ -1,59 +1,16 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
+"""Simulate one hour of one DC motor at 1 Hz into simulated_dc_motor_data.csv.
 
-# Simulation settings
-duration_minutes = 60       # 1 hour of data
-sampling_rate = 1           # samples per second
-total_samples = duration_minutes * 60 * sampling_rate
+Thin wrapper around dataset_generator.py with the original settings: one
+motor with the nominal linear aging model. Extra arguments are passed
+through, e.g. ``--plot`` to show the signals or ``--seed 7``. For
+training-scale data use the generator directly:
 
-# Time array
-time = np.arange(total_samples)
+    python dataset_generator.py --motors 10000 --samples-per-motor 86400 --output fleet.dcts
+"""
+import sys
 
-# Simulate voltage (mostly stable)
-voltage = np.random.normal(loc=12.0, scale=0.2, size=total_samples)
+from dataset_generator import main
 
-# Simulate RPM (slightly varies, drops slightly over time)
-rpm = 1500 - 0.2 * time + np.random.normal(0, 20, total_samples)
-
-# Simulate current (increases slowly as motor ages)
-current = 1.5 + 0.0005 * time + np.random.normal(0, 0.05, total_samples)
-
-# Improved Fault label logic: create more fault cases based on stress conditions
-fault = (
-    (current > 2.5) |
-    (rpm < 1200) |
-    ((current > 2.2) & (rpm < 1300)) |
-    ((voltage > 12.2) & (current > 2.0))
-).astype(int)
-
-# Create DataFrame
-data = pd.DataFrame({
-    'Time (s)': time,
-    'Voltage (V)': voltage,
-    'Current (A)': current,
-    'RPM': rpm,
-    'Fault': fault
-})
-
-# Save to CSV
-data.to_csv("simulated_dc_motor_data.csv", index=False)
-print("Data saved to 'simulated_dc_motor_data.csv'.")
-
-# Fault label counts to check distribution
-print("Fault Label Counts:\n", data['Fault'].value_counts())
-
-# Plot sensor data for visualization
-plt.figure(figsize=(12, 6))
-plt.subplot(3,1,1)
-plt.plot(time, voltage, label="Voltage")
-plt.ylabel("Voltage (V)")
-plt.subplot(3,1,2)
-plt.plot(time, current, label="Current", color='orange')
-plt.ylabel("Current (A)")
-plt.subplot(3,1,3)
-plt.plot(time, rpm, label="RPM", color='green')
-plt.ylabel("RPM")
-plt.xlabel("Time (seconds)")
-plt.tight_layout()
-plt.show()
\ No newline at end of file
+if __name__ == "__main__":
+    main(["--output", "simulated_dc_motor_data.csv", "--motors", "1", "--samples-per-motor", "3600",
+          "--scenarios", "aging", "--spread", "0", "--workers", "1", *sys.argv[1:]])
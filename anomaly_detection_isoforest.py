@@ -1,48 +1,135 @@
-import pandas as pd
 import numpy as np
 from sklearn.ensemble import IsolationForest
-import joblib
+import argparse
 import os
+from model_registry import dump_model
+from telemetry_store import load_frame, telemetry_exists
+from streaming_anomaly import HalfSpaceTrees
+from out_of_core_training import budget_rows, iter_chunks, sample_rows
 
 # --- Paths ---
 DATA_PATH = "realtime_dc_motor_data.csv"
 MODEL_DIR = "model"
 MODEL_PATH = os.path.join(MODEL_DIR, "iso_forest_model.pkl")
+ONLINE_MODEL_PATH = os.path.join(MODEL_DIR, "hst_model.pkl")
+LABELED_PATH = "anomaly_labeled_data.csv"
+FEATURES = ['Voltage (V)', 'Current (A)', 'RPM']
 
-# --- Load Data ---
-if not os.path.exists(DATA_PATH):
-    raise FileNotFoundError(f"{DATA_PATH} not found. Please generate the real-time data first.")
 
-data = pd.read_csv(DATA_PATH)
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fit the DC motor anomaly detector.")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--online", action="store_true",
+                        help="stream the data through half-space trees instead of fitting IsolationForest")
+    parser.add_argument("--window-size", type=int, default=250, help="online mode: samples per mass window")
+    parser.add_argument("--batch-size", type=int, default=1000, help="online mode: rows fed per call")
+    parser.add_argument("--streaming", action="store_true",
+                        help="read --data in chunks: fit IsolationForest on a bounded sample (or stream "
+                             "--online), then label chunk by chunk")
+    parser.add_argument("--memory-budget", type=float, default=512,
+                        help="streaming: MiB for the chunk being read plus the fitting sample")
+    parser.add_argument("--chunk-rows", type=int, default=None,
+                        help="streaming: rows per chunk (default: derived from --memory-budget)")
+    return parser.parse_args()
 
-# --- Features for Anomaly Detection ---
-features = data[['Voltage (V)', 'Current (A)', 'RPM']]
 
-# --- Train Isolation Forest ---
-model = IsolationForest(n_estimators=100, contamination=0.05, random_state=42)
-model.fit(features)
+def new_model(args):
+    if args.online:
+        return HalfSpaceTrees(window_size=args.window_size, seed=42)
+    return IsolationForest(n_estimators=100, contamination=0.05, random_state=42)
 
-# --- Predict Anomalies (-1 is anomaly, 1 is normal) ---
-data['Anomaly'] = model.predict(features)
-data['Anomaly'] = data['Anomaly'].map({1: 0, -1: 1})  # Convert: 1 = normal → 0, -1 = anomaly → 1
 
-# --- Save the model ---
-os.makedirs(MODEL_DIR, exist_ok=True)
-joblib.dump(model, MODEL_PATH)
-print(f"✅ Isolation Forest model saved to {MODEL_PATH}")
+def label_anomalies(model, features, batch_size=1000):
+    """0/1 anomaly labels; half-space trees score, then learn, each row once."""
+    if isinstance(model, HalfSpaceTrees):
+        values = features.to_numpy()
+        scores = np.concatenate([model.score_partial_fit(values[i:i + batch_size])
+                                 for i in range(0, len(values), batch_size)] or [np.empty(0)])
+        return (scores < 0).astype(int)  # warm-up rows (NaN score) count as normal
+    return (model.predict(features) == -1).astype(int)  # -1 is anomaly, 1 is normal
 
-# --- Save data with anomaly labels to preview results ---
-data.to_csv("anomaly_labeled_data.csv", index=False)
-print("📄 Data with anomaly labels saved to anomaly_labeled_data.csv")
 
-# --- 🔽 NEW: Classification report (if Fault column exists) ---
-from sklearn.metrics import classification_report
+def save_model(model, online):
+    model_path = ONLINE_MODEL_PATH if online else MODEL_PATH  # HST resumes with score_partial_fit on newer rows
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    dump_model(model, model_path)
+    print(f"✅ {type(model).__name__} model saved to {model_path}")
 
-if 'Fault' in data.columns:
-    report = classification_report(data['Fault'], data['Anomaly'], target_names=["Healthy", "Faulty"])
+
+def save_report(y_true, y_pred, sample_weight=None):
+    from sklearn.metrics import classification_report
+
+    report = classification_report(y_true, y_pred, labels=[0, 1], target_names=["Healthy", "Faulty"],
+                                   sample_weight=sample_weight, zero_division=0)
     report_path = os.path.join(MODEL_DIR, "anomaly_classification_report.txt")
     with open(report_path, "w") as f:
         f.write(report)
     print(f"📊 Anomaly Classification Report saved to {report_path}")
-else:
-    print("⚠️ No 'Fault' column found. Skipping anomaly classification report.")
+
+
+def run_streaming(args):
+    """Out-of-core path: memory follows --memory-budget, not the size of --data."""
+    model = new_model(args)
+    chunk_rows = args.chunk_rows or budget_rows(args.memory_budget, len(FEATURES))[0]
+    if not args.online:
+        # --- Fit Isolation Forest on a uniform sample (each tree only draws 256 rows anyway) ---
+        sample, n_seen = sample_rows(args.data, FEATURES, args.memory_budget, chunk_rows)
+        model.fit(sample)
+        print(f"📦 Fitted on {len(sample):,} of {n_seen:,} rows")
+        del sample
+
+    # --- Label chunk by chunk, appending to the labeled CSV and counting (Fault, Anomaly) pairs ---
+    confusion = np.zeros((2, 2), dtype=np.int64)
+    has_fault = True
+    with open(LABELED_PATH, "w", newline="") as f:
+        for i, chunk in enumerate(iter_chunks(args.data, chunk_rows=chunk_rows)):
+            chunk['Anomaly'] = label_anomalies(model, chunk[FEATURES], args.batch_size)
+            chunk.to_csv(f, index=False, header=i == 0)
+            has_fault = has_fault and 'Fault' in chunk.columns
+            if has_fault:
+                np.add.at(confusion, (chunk['Fault'].to_numpy(dtype=np.int64), chunk['Anomaly'].to_numpy()), 1)
+    save_model(model, args.online)
+    print(f"📄 Data with anomaly labels saved to {LABELED_PATH}")
+    if has_fault:
+        save_report([0, 0, 1, 1], [0, 1, 0, 1], sample_weight=confusion.ravel())
+    else:
+        print("⚠️ No 'Fault' column found. Skipping anomaly classification report.")
+
+
+def main():
+    args = parse_args()
+
+    # --- Load Data ---
+    if not telemetry_exists(args.data):
+        raise FileNotFoundError(f"{args.data} not found. Please generate the real-time data first.")
+    if args.streaming:
+        run_streaming(args)
+        return
+
+    data = load_frame(args.data)
+
+    # --- Features for Anomaly Detection ---
+    features = data[FEATURES]
+
+    # --- Fit Isolation Forest, or stream through Half-Space Trees (each row scored, then learned, once) ---
+    model = new_model(args)
+    if not args.online:
+        model.fit(features)
+    data['Anomaly'] = label_anomalies(model, features, args.batch_size)
+
+    # --- Save the model ---
+    save_model(model, args.online)
+
+    # --- Save data with anomaly labels to preview results ---
+    data.to_csv(LABELED_PATH, index=False)
+    print(f"📄 Data with anomaly labels saved to {LABELED_PATH}")
+
+    # --- Classification report (if Fault column exists) ---
+    if 'Fault' in data.columns:
+        save_report(data['Fault'], data['Anomaly'])
+    else:
+        print("⚠️ No 'Fault' column found. Skipping anomaly classification report.")
+
+
+if __name__ == "__main__":
+    main()
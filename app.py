@@ -1,43 +1,88 @@
 import streamlit as st
-import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
-import joblib
-
-# Load trained model
-model = joblib.load("dc_motor_fault_model.pkl")
+from fast_forest import FlatForest
+from data_watch import file_signature
+from model_registry import get_registry
+from prediction_lattice import PredictionLattice
+from telemetry_store import load_frame, store_path_for
+from plot_decimation import pixel_budget
+from rul_estimator import SeriesRulTracker, format_seconds
+from time_index import TimeIndex
+
+DATA_PATH = "simulated_dc_motor_data.csv"
+
+
+# Load trained model once per process (reloaded if the file changes), plus its flattened
+# copy for single-sample scoring
+registry = get_registry()
+model = registry.get("fault_model")
+fast_model = registry.derived("fault_model", "flat_forest", FlatForest.from_sklearn)
+
+# Simulation sliders as (min, max, step) per model input; every grid point is scored once per model
+SIM_GRID = ((11.0, 13.0, 0.05), (1.0, 3.0, 0.05), (1000, 1600, 10))
+sim_lattice = registry.derived(
+    "fault_model", ("prediction_lattice", SIM_GRID),
+    # Built from the entry's own model and saved under that same entry's hash
+    lambda entry: PredictionLattice.load_or_build(FlatForest.from_sklearn(entry.model), SIM_GRID, entry.sha256),
+    pass_entry=True)
 
 # Title
 st.title("DC Motor Digital Twin - Predictive Maintenance Dashboard")
 st.markdown("Simulated predictive maintenance monitoring with ML and RUL estimation.")
 
-# Load data
-data = pd.read_csv("simulated_dc_motor_data.csv")
+# Load data (memory-mapped binary store if one was imported next to the CSV); the signature, taken
+# first, changes whenever the file or store is regenerated or appended to
+data_version = file_signature(store_path_for(DATA_PATH) or DATA_PATH)
+data = load_frame(DATA_PATH)
+times = data['Time (s)'].to_numpy()
+sample_step = float(np.median(np.diff(times[-1000:]))) if len(times) > 1 else 1.0
+
+
+# Every row is scored and aggregated once into a multi-resolution index; range queries read its tiers
+@st.cache_resource(max_entries=2)
+def get_time_index(path, model_sha256):
+    return TimeIndex(fault_model=fast_model)
+
+
+time_index = get_time_index(DATA_PATH, registry.entry("fault_model").sha256)
+time_index.update(data, source_version=data_version)
+
+
+# The degradation-trend filter also sees every row once; its state is kept every RUL_CHECKPOINT_ROWS
+# rows, so the RUL at the end of any range replays at most that many rows
+RUL_CHECKPOINT_ROWS = 600
+
+
+@st.cache_resource(max_entries=2)
+def get_rul_tracker(path):
+    return SeriesRulTracker(checkpoint_every=RUL_CHECKPOINT_ROWS)
+
+
+rul_tracker = get_rul_tracker(DATA_PATH)
+rul_tracker.update(data, source_version=data_version)
 
 # Sidebar: Input sliders for simulation
 st.sidebar.header("Simulate Motor Input")
-sim_voltage = st.sidebar.slider("Voltage (V)", 11.0, 13.0, 12.0, step=0.05)
-sim_current = st.sidebar.slider("Current (A)", 1.0, 3.0, 1.5, step=0.05)
-sim_rpm = st.sidebar.slider("RPM", 1000, 1600, 1500, step=10)
+(v_min, v_max, v_step), (c_min, c_max, c_step), (r_min, r_max, r_step) = SIM_GRID
+sim_voltage = st.sidebar.slider("Voltage (V)", v_min, v_max, 12.0, step=v_step)
+sim_current = st.sidebar.slider("Current (A)", c_min, c_max, 1.5, step=c_step)
+sim_rpm = st.sidebar.slider("RPM", r_min, r_max, 1500, step=r_step)
 
 # Sidebar: Select time range for historical data
-time_range = st.slider("Select Time Range (seconds)", 0, len(data)-1, (0, len(data)-1), step=60)
-filtered_data = data.iloc[time_range[0]:time_range[1]]
+first_time, last_time = int(times[0]), int(times[-1])
+time_range = st.slider("Select Time Range (seconds)", first_time, last_time, (first_time, last_time), step=60)
+start, stop = np.searchsorted(times, [time_range[0], time_range[1] + 1])  # rows of the selected range
 
-# --- ML Predictions for historical data ---
-features = filtered_data[['Voltage (V)', 'Current (A)', 'RPM']]
-filtered_data['Predicted Fault'] = model.predict(features)
+# --- ML Predictions for historical data: counts and pixel-wide buckets come from the time index ---
+totals = time_index.totals(*time_range)
+resolution, buckets = time_index.query(*time_range, pixel_budget(10))
 
 # --- Predict Fault & RUL for simulated input ---
 st.subheader("Simulation: Predict Fault & Remaining Useful Life (RUL)")
 
-sim_input = pd.DataFrame([[sim_voltage, sim_current, sim_rpm]],
-                         columns=['Voltage (V)', 'Current (A)', 'RPM'])
-
-sim_fault = model.predict(sim_input)[0]
-sim_proba = model.predict_proba(sim_input)[0][1]  # Probability of fault
-
-# Simple RUL estimation: inverse of fault probability squared for more sensitivity
-rul_estimate = max(0, int(100 * (1 - sim_proba)**2))
+# Label, probability of fault and RUL (inverse of fault probability squared) looked up in the lattice
+sim_fault, sim_proba, rul_estimate = sim_lattice.lookup([sim_voltage, sim_current, sim_rpm])
 
 st.write(f"🔌 Input Voltage: **{sim_voltage:.2f} V**, ⚡ Current: **{sim_current:.2f} A**, 🔄 RPM: **{sim_rpm}**")
 
@@ -59,6 +104,13 @@ elif rul_estimate < 50:
 else:
     st.success("✅ Remaining Useful Life is healthy.")
 
+# --- Degradation-trend RUL at the end of the selected range (trend over the history up to it) ---
+if stop - start > 1:
+    trend = rul_tracker.estimate_at(data, int(stop))
+    st.info(f"📉 Degradation-trend RUL at {int(times[stop - 1])} s: "
+            f"**{format_seconds(trend['rul_s'])}** (95% band {format_seconds(trend['lower_s'])} – "
+            f"{format_seconds(trend['upper_s'])}, limited by {trend['signal']})")
+
 # --- Fault Points Explanation and Count ---
 st.subheader("Predictive Maintenance Status (Historical Data)")
 
@@ -69,7 +121,7 @@ Fault points are moments in time where the machine learning model predicts a hig
 A high number of predicted fault points may indicate the motor is under stress or approaching failure.
 """)
 
-pred_fault_count = filtered_data['Predicted Fault'].sum()
+pred_fault_count = totals['Predicted Fault']
 st.write(f"Predicted fault points in selected time range: **{pred_fault_count}**")
 
 if pred_fault_count > 0:
@@ -78,17 +130,16 @@ else:
     st.success("✅ Motor predicted to be operating normally in the selected range.")
 
 # Display timestamps where faults are predicted
-fault_times = filtered_data[filtered_data['Predicted Fault'] == 1]['Time (s)'].values
 st.markdown("### 🕒 Fault Occurrence Timeline")
 
-if len(fault_times) > 0:
-    # Create a series with 1 where fault occurred, 0 otherwise, indexed by time
-    fault_series = pd.Series(0, index=filtered_data['Time (s)'])
-    fault_series.loc[fault_times] = 1
+if pred_fault_count > 0:
+    # One rectangle per run of consecutive predicted faults, kept as intervals by the time index
+    fault_ranges = time_index.intervals.xranges("Fault", sample_step, *time_range)
 
     # Plot fault occurrence as bars (spikes) over time
     fig_fault, ax_fault = plt.subplots(figsize=(10, 2))
-    ax_fault.bar(fault_series.index, fault_series.values, width=1.0, color='red')
+    ax_fault.broken_barh(fault_ranges, (0, 1), color='red')
+    ax_fault.set_xlim(time_range[0], time_range[1] + sample_step)
     ax_fault.set_ylabel('Fault')
     ax_fault.set_xlabel('Time (seconds)')
     ax_fault.set_yticks([0, 1])
@@ -96,33 +147,39 @@ if len(fault_times) > 0:
     ax_fault.set_title('Fault Occurrence Over Time')
     ax_fault.grid(True, axis='x', linestyle='--', alpha=0.7)
     st.pyplot(fig_fault)
+    st.caption(f"{len(fault_ranges):,} fault episodes in the selected range")
 else:
     st.success("✅ No predicted faults in selected time range.")
 
 # --- Plots for historical data ---
 st.subheader("Sensor Data Over Time")
 
-fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(10, 8), sharex=True)
-ax1.plot(filtered_data['Time (s)'], filtered_data['Voltage (V)'], color='blue')
-ax1.set_ylabel('Voltage (V)')
-ax1.grid(True)
 
-ax2.plot(filtered_data['Time (s)'], filtered_data['Current (A)'], color='orange')
-ax2.set_ylabel('Current (A)')
-ax2.grid(True)
+# Each pixel-wide bucket is drawn as its min-max band around the mean, so spikes stay visible
+def plot_buckets(ax, col, color):
+    centers = buckets['Time (s)'] + resolution / 2
+    ax.fill_between(centers, buckets[f'{col} min'], buckets[f'{col} max'], color=color, alpha=0.3, linewidth=0)
+    ax.plot(centers, buckets[f'{col} mean'], color=color)
+    ax.set_ylabel(col)
+    ax.grid(True)
 
-ax3.plot(filtered_data['Time (s)'], filtered_data['RPM'], color='green')
-ax3.set_ylabel('RPM')
+
+fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(10, 8), sharex=True)
+plot_buckets(ax1, 'Voltage (V)', 'blue')
+plot_buckets(ax2, 'Current (A)', 'orange')
+plot_buckets(ax3, 'RPM', 'green')
 ax3.set_xlabel('Time (seconds)')
-ax3.grid(True)
 
 st.pyplot(fig)
+st.caption(f"{totals['Samples']:,} readings shown in {len(buckets):,} buckets of {resolution} s")
 
 # Display actual faults recorded in the data
 st.subheader("Actual Faults Recorded")
-actual_faults = filtered_data['Fault'].sum()
+actual_faults = totals['Fault']
 st.write(f"Number of actual faults recorded in selected range: **{actual_faults}**")
 
 # Show raw data option
 if st.checkbox("Show raw data with prediction"):
+    filtered_data = data.iloc[start:stop].copy()
+    filtered_data['Predicted Fault'] = model.predict(filtered_data[['Voltage (V)', 'Current (A)', 'RPM']])
     st.write(filtered_data)
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""Redraws per minute and dashboard CPU: unconditional rerun loop vs data-watch driven refresh.
+
+A separate writer process appends rows to a CSV at ``--rate`` rows/s for
+``--active`` seconds, then stops for ``--idle`` seconds. The dashboard side
+is emulated in this process by a redraw that reads the new rows and renders
+the three decimated sensor plots to PNG (the bulk of a realtime_app.py
+rerun). ``loop`` redraws back to back, as the old ``st.rerun()`` at the end
+of the script did; ``watch`` checks a DataWatch every ``--check-interval``
+seconds, as the poller fragment does, and redraws only on a new version.
+CPU is this process's CPU time over each phase (the writer is not counted).
+
+Run from the repository root:
+    python -m benchmarks.bench_data_watch --rate 1 --active 20 --idle 20
+"""
+import argparse
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+from csv_tail_reader import CsvTailReader  # noqa: E402
+from data_watch import DataWatch  # noqa: E402
+from generate_realtime_data import COLUMNS, motor_sample  # noqa: E402
+from plot_decimation import minmax_indices, pixel_budget  # noqa: E402
+from telemetry_writer import BufferedCsvWriter  # noqa: E402
+
+WRITER = """
+import sys, time
+import numpy as np
+from generate_realtime_data import motor_sample
+from telemetry_writer import BufferedCsvWriter
+path, rate, duration, start = sys.argv[1], float(sys.argv[2]), float(sys.argv[3]), int(sys.argv[4])
+rng = np.random.default_rng(0)
+with BufferedCsvWriter(path, {columns!r}, batch_size=1, flush_interval=0, append=True) as writer:
+    t0 = time.monotonic()
+    i = 0
+    while time.monotonic() - t0 < duration:
+        writer.write_row((start + i, *motor_sample(float(start + i), rng)))
+        i += 1
+        time.sleep(max(0.0, t0 + i / rate - time.monotonic()))
+"""
+
+
+def redraw(reader):
+    data = reader.read()
+    times = data["Time (s)"].to_numpy()
+    for col in ["Voltage (V)", "Current (A)", "RPM"]:
+        values = data[col].to_numpy()
+        idx = minmax_indices(values, pixel_budget(6))
+        fig, ax = plt.subplots(figsize=(6, 2))
+        ax.plot(times[idx], values[idx])
+        fig.savefig(io.BytesIO(), format="png")
+        plt.close(fig)
+
+
+def run_phase(mode, reader, watch, seconds, check_interval):
+    redraws = 0
+    seen = watch.version
+    cpu, wall = time.process_time(), time.monotonic()
+    while time.monotonic() - wall < seconds:
+        if mode == "loop":
+            redraw(reader)
+            redraws += 1
+        else:
+            time.sleep(check_interval)
+            if watch.version != seen:
+                seen = watch.version
+                redraw(reader)
+                redraws += 1
+    elapsed = time.monotonic() - wall
+    return redraws * 60 / elapsed, 100 * (time.process_time() - cpu) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=1.0, help="rows per second while active")
+    parser.add_argument("--active", type=float, default=20.0)
+    parser.add_argument("--idle", type=float, default=20.0)
+    parser.add_argument("--history", type=int, default=3600, help="rows in the file before the run")
+    parser.add_argument("--check-interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    env = {**os.environ, "PYTHONPATH": os.getcwd() + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    print(f"{'mode':>6} | {'phase':>6} | {'redraws/min':>11} | {'CPU %':>6}")
+    for mode in ("loop", "watch"):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "telemetry.csv")
+            rng = np.random.default_rng(1)
+            with BufferedCsvWriter(path, COLUMNS) as history:
+                for i in range(args.history):
+                    history.write_row((i, *motor_sample(float(i), rng)))
+            reader = CsvTailReader(path)
+            reader.read()
+            watch = DataWatch(path).start()
+            writer = subprocess.Popen([sys.executable, "-c", WRITER.format(columns=COLUMNS), path,
+                                       str(args.rate), str(args.active), str(args.history)], env=env)
+            results = {"active": run_phase(mode, reader, watch, args.active, args.check_interval)}
+            writer.wait()
+            results["idle"] = run_phase(mode, reader, watch, args.idle, args.check_interval)
+            watch.close()
+            for phase in ("active", "idle"):
+                per_minute, cpu = results[phase]
+                print(f"{mode:>6} | {phase:>6} | {per_minute:>11.0f} | {cpu:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""FlatForest vs. sklearn: exactness, batch-1 latency and large-batch throughput.
+
+Run from the repository root:
+    python -m benchmarks.bench_fast_forest
+"""
+import argparse
+import time
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from fast_forest import FlatForest
+from inference_cache import FEATURE_COLUMNS
+
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+def random_inputs(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Voltage (V)': rng.uniform(10.0, 14.0, n_rows),
+        'Current (A)': rng.uniform(0.0, 5.0, n_rows),
+        'RPM': rng.uniform(1000, 1600, n_rows),
+    }, columns=FEATURE_COLUMNS)
+
+
+def median_time(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="dc_motor_fault_model.pkl")
+    parser.add_argument("--batch", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    start = time.perf_counter()
+    flat = FlatForest.from_sklearn(model)
+    print(f"Converted {flat.n_trees} trees ({len(flat.feature)} nodes) in "
+          f"{(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    # --- Exactness ---
+    X = random_inputs(args.batch)
+    labels, proba = flat.predict_with_proba(X)
+    assert np.array_equal(proba, model.predict_proba(X)), "probabilities differ from sklearn"
+    assert np.array_equal(labels, model.predict(X)), "labels differ from sklearn"
+    print(f"Exact match with sklearn on {args.batch:,} samples")
+
+    # --- Batch size 1 latency (what a slider change costs) ---
+    one = X.iloc[:1]
+    values = one.to_numpy()[0]
+    sk_one = median_time(lambda: (model.predict(one), model.predict_proba(one)), args.repeats)
+    flat_one = median_time(lambda: flat.predict_one(values), args.repeats)
+    print(f"batch 1    sklearn predict+predict_proba: {sk_one * 1e3:8.3f} ms | "
+          f"FlatForest: {flat_one * 1e3:8.3f} ms")
+
+    # --- Throughput at large batch ---
+    sk_big = median_time(lambda: model.predict_proba(X), 1)
+    flat_big = median_time(lambda: flat.predict_with_proba(X), 1)
+    print(f"batch {args.batch:,}  sklearn predict_proba: {args.batch / sk_big:,.0f} samples/s | "
+          f"FlatForest: {args.batch / flat_big:,.0f} samples/s")
+
+
+if __name__ == "__main__":
+    main()
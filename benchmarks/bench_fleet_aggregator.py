@@ -0,0 +1,82 @@
+"""Fleet overview aggregation: incremental per-rerun cost vs recomputing from the full history.
+
+A FleetSimulator fleet is replayed in ``--refresh``-tick batches, as the fleet
+page sees it between reruns; each rerun folds the new rows into a
+FleetAggregator and builds the sorted first page. The full-history baseline
+is a pandas groupby over every row so far. The selected motor's detail chart
+is timed from the aggregator's ring buffer against scanning the fleet frame
+for that motor's rows, as the page used to on every refresh.
+
+Run from the repository root:
+    python -m benchmarks.bench_fleet_aggregator --motors 1000 --ticks 600 --refresh 5
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from fleet_aggregator import FleetAggregator
+from fleet_simulator import FLEET_COLUMNS, FleetSimulator
+from model_registry import get_registry
+from fast_forest import FlatForest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--motors", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=600, help="seconds of 1 Hz data")
+    parser.add_argument("--refresh", type=int, default=5, help="ticks between reruns")
+    parser.add_argument("--no-models", action="store_true", help="use the Fault column, skip the anomaly model")
+    args = parser.parse_args()
+
+    registry = get_registry()
+    fault_model = anomaly_model = None
+    if not args.no_models:
+        fault_model = registry.derived("fault_model", "flat_forest", FlatForest.from_sklearn)
+        anomaly_model = registry.get("anomaly_model")
+    simulator = FleetSimulator(args.motors, seed=0)
+    history = pd.concat([simulator.tick() for _ in range(args.ticks)], ignore_index=True)[FLEET_COLUMNS]
+    aggregator = FleetAggregator(fault_model, anomaly_model)
+
+    incremental, page = [], []
+    step = args.motors * args.refresh
+    for stop in range(step, len(history) + 1, step):
+        start = time.perf_counter()
+        aggregator.update(history.iloc[:stop])
+        summary = aggregator.summary()
+        incremental.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        summary.sort_values("RUL (s)", kind="stable", na_position="last").iloc[:50]
+        page.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    full = history.groupby("motor_id").agg(samples=("Fault", "size"), fault_rate=("Fault", "mean"),
+                                           last_seen=("Time (s)", "max"))
+    groupby_s = time.perf_counter() - start
+    if args.no_models:
+        summary = aggregator.summary().set_index("motor_id")
+        assert np.array_equal(summary["Samples"], full["samples"])
+        assert np.allclose(summary["Fault rate"], full["fault_rate"])
+
+    print(f"{args.motors:,} motors, {args.ticks} ticks, rerun every {args.refresh} ticks "
+          f"({step:,} new rows per rerun)")
+    print(f"  incremental update + summary: median {np.median(incremental) * 1e3:.1f} ms, "
+          f"max {np.max(incremental) * 1e3:.1f} ms")
+    print(f"  sort + first page: median {np.median(page) * 1e3:.2f} ms")
+    print(f"  full-history groupby (counters only, no models or RUL) at the end: {groupby_s * 1e3:.1f} ms")
+
+    motor = int(history["motor_id"].iloc[-1])
+    start = time.perf_counter()
+    scanned = history.iloc[np.flatnonzero(history["motor_id"].to_numpy() == motor)[-aggregator.detail_rows:]]
+    scan_s = time.perf_counter() - start
+    start = time.perf_counter()
+    detail = aggregator.detail(motor)
+    ring_s = time.perf_counter() - start
+    match = np.array_equal(detail["Time (s)"].to_numpy(), scanned["Time (s)"].to_numpy(dtype=np.float64))
+    print(f"  motor detail ({len(detail)} readings): full-history scan {scan_s * 1e3:.2f} ms, "
+          f"ring buffer {ring_s * 1e3:.2f} ms, match {match}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Per-tick cost of the vectorized fleet simulator at growing fleet sizes.
+
+Run from the repository root:
+    python -m benchmarks.bench_fleet_simulator
+"""
+import argparse
+import time
+
+import numpy as np
+
+from fleet_simulator import FleetSimulator
+
+
+def bench(fleet_sizes, ticks, seed=0):
+    results = []
+    for n in fleet_sizes:
+        simulator = FleetSimulator(n, seed=seed)
+        timings = []
+        for _ in range(ticks):
+            start = time.perf_counter()
+            simulator.tick()
+            timings.append(time.perf_counter() - start)
+        per_tick = float(np.median(timings))
+        results.append({"motors": n, "tick_ms": per_tick * 1e3, "samples_per_s": n / per_tick})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument("--ticks", type=int, default=50)
+    args = parser.parse_args()
+
+    # Same seed, same batches
+    a, b = FleetSimulator(1_000, seed=7), FleetSimulator(1_000, seed=7)
+    for _ in range(3):
+        assert a.tick().equals(b.tick()), "fleet simulator is not reproducible for a fixed seed"
+
+    print(f"{'motors':>8} | {'ms / tick':>9} | {'samples/s':>12}")
+    for r in bench(args.sizes, args.ticks):
+        print(f"{r['motors']:>8} | {r['tick_ms']:>9.2f} | {r['samples_per_s']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
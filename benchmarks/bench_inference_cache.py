@@ -0,0 +1,76 @@
+"""Per-refresh inference cost: full rescoring vs. the incremental ScoreStore.
+
+Run from the repository root:
+    python -m benchmarks.bench_inference_cache
+"""
+import argparse
+import time
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from inference_cache import FEATURE_COLUMNS, ScoreStore
+
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+def synthetic_history(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Time (s)': np.arange(n_rows),
+        'Voltage (V)': rng.normal(12.0, 0.2, n_rows),
+        'Current (A)': rng.normal(1.9, 0.4, n_rows),
+        'RPM': rng.normal(1350, 120, n_rows),
+    })
+
+
+def full_rescore(data, model, anomaly_model):
+    # What realtime_app.py did on every rerun before the score store.
+    features = data[FEATURE_COLUMNS]
+    model.predict(features)
+    anomaly_model.predict(features)
+    model.predict_proba(data.tail(60)[FEATURE_COLUMNS])
+
+
+def bench(history_sizes, new_rows, refreshes, model, anomaly_model):
+    results = []
+    for n in history_sizes:
+        data = synthetic_history(n + new_rows * refreshes)
+
+        start = time.perf_counter()
+        full_rescore(data.iloc[:n], model, anomaly_model)
+        full_s = time.perf_counter() - start
+
+        store = ScoreStore()
+        store.update(data.iloc[:n], model, anomaly_model)  # warm: history already scored
+        timings = []
+        for k in range(1, refreshes + 1):
+            frame = data.iloc[:n + k * new_rows]
+            start = time.perf_counter()
+            store.update(frame, model, anomaly_model)
+            timings.append(time.perf_counter() - start)
+
+        results.append({"history_rows": n, "full_ms": full_s * 1e3,
+                        "incremental_ms": float(np.median(timings)) * 1e3})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--new-rows", type=int, default=20, help="rows appended per refresh")
+    parser.add_argument("--refreshes", type=int, default=5)
+    args = parser.parse_args()
+
+    model = joblib.load("dc_motor_fault_model.pkl")
+    anomaly_model = joblib.load("iso_forest_model.pkl")
+
+    print(f"{'history rows':>12} | {'full rescore (ms)':>17} | {'score store (ms)':>16}")
+    for r in bench(args.sizes, args.new_rows, args.refreshes, model, anomaly_model):
+        print(f"{r['history_rows']:>12} | {r['full_ms']:>17.1f} | {r['incremental_ms']:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
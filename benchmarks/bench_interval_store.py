@@ -0,0 +1,94 @@
+"""Fault timelines and timestamp tables from run-length intervals vs per-row flags, on long runs.
+
+The flags are synthetic episodes: runs of faults (and shorter anomaly bursts)
+separated by healthy stretches, ``--episodes`` of them over each run. Two
+ways of drawing one realtime_app.py timeline bar are rendered to PNG (what
+st.pyplot does server-side): one bar per row with a color list and one
+rectangle per interval. The timestamp table is the list
+of flagged times vs the interval frame.
+
+Run from the repository root:
+    python -m benchmarks.bench_interval_store --sizes 86400 604800 2592000
+"""
+import argparse
+import io
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from interval_store import IntervalStore  # noqa: E402
+
+
+def episodic_flags(n_rows, n_episodes, mean_length, rng):
+    """0/1 flags with about ``n_episodes`` runs of geometric length around ``mean_length``."""
+    flags = np.zeros(n_rows, dtype=np.int64)
+    starts = np.sort(rng.choice(n_rows, n_episodes, replace=False))
+    lengths = rng.geometric(1 / mean_length, n_episodes)
+    for start, length in zip(starts, lengths):
+        flags[start:start + length] = 1
+    return flags
+
+
+def render(draw):
+    start = time.perf_counter()
+    fig, ax = plt.subplots(figsize=(6, 0.6))
+    draw(ax)
+    fig.savefig(io.BytesIO(), format="png")
+    plt.close(fig)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[86_400, 604_800, 2_592_000])
+    parser.add_argument("--episodes", type=int, default=5_000, help="fault episodes per run")
+    parser.add_argument("--per-row-max", type=int, default=100_000,
+                        help="skip the one-bar-per-row render above this many rows")
+    parser.add_argument("--append-rows", type=int, default=60)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} | {'flagged':>8} | {'intervals':>9} | {'row times (KiB)':>15} | {'intervals (KiB)':>15} | "
+          f"{'per-row (ms)':>12} | {'intervals (ms)':>14} | {'append (ms)':>11}")
+    for n in args.sizes:
+        rng = np.random.default_rng(0)
+        times = np.arange(n, dtype=np.float64)
+        episodes = min(args.episodes, n // 20)
+        scores = pd.DataFrame({
+            "Predicted Fault": episodic_flags(n, episodes, 30, rng), "Fault Probability": rng.random(n),
+            "Anomaly": episodic_flags(n, episodes, 3, rng), "Anomaly Score": rng.normal(0, 0.1, n),
+        })
+        flags = scores["Predicted Fault"].to_numpy()
+
+        store = IntervalStore()
+        first = n - 20 * args.append_rows
+        store.update(times[:first], scores.iloc[:first])
+        appends = []
+        for stop in range(first + args.append_rows, n + 1, args.append_rows):
+            start = time.perf_counter()
+            store.update(times[:stop], scores)
+            appends.append(time.perf_counter() - start)
+
+        flagged_times = pd.Series(times[flags == 1], name="Time (s)")
+        table = store.frame("Fault")
+
+        def per_row(ax):
+            ax.bar(times, 1, width=1, color=['red' if f == 1 else 'green' for f in flags])
+
+        def intervals(ax):
+            ax.broken_barh([(times[0], times[-1] - times[0] + 1)], (0, 1), color="green")
+            ax.broken_barh(store.xranges("Fault", 1.0), (0, 1), color="red")
+
+        slow = render(per_row) * 1e3 if n <= args.per_row_max else float("nan")
+        fast = render(intervals) * 1e3
+        print(f"{n:>9,} | {int(flags.sum()):>8,} | {len(table):>9,} | "
+              f"{flagged_times.memory_usage(index=True) / 1024:>15,.0f} | {store.nbytes / 1024:>15,.0f} | "
+              f"{slow:>12.0f} | {fast:>14.0f} | {np.median(appends) * 1e3:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
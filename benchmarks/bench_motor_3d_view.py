@@ -0,0 +1,58 @@
+"""3D motor view: figure build time and serialized payload, per live tick and per animated batch.
+
+"cold" rebuilds the static geometry as every rerun did before it was cached;
+"live" is a cached rebuild for one reading; "animated" builds one figure pair
+carrying ``--frames`` readings as Plotly frames, played client-side.
+
+Run from the repository root:
+    python -m benchmarks.bench_motor_3d_view --frames 30
+"""
+import argparse
+import time
+
+import plotly.io as pio
+import plotly.tools
+
+from benchmarks.run_suite import synthetic_frame
+from motor_3d_view import build_motor_animation, build_motor_figures, static_figures
+
+
+def streamlit_payload(figures):
+    """Bytes st.plotly_chart sends for ``figures`` (same conversion and serializer)."""
+    return sum(len(pio.to_json(plotly.tools.return_figure_from_figure_or_data(f, True), validate=False))
+               for f in figures)
+
+
+def timed(build, repeat, cold=False):
+    best = float("inf")
+    for _ in range(repeat):
+        if cold:
+            static_figures.cache_clear()
+        start = time.perf_counter()
+        figures = build()
+        best = min(best, time.perf_counter() - start)
+    return best, figures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    frame = synthetic_frame(600)
+    print(f"{'mode':>10} | {'build (ms)':>10} | {'payload (KB)':>12} | {'per reading':>22}")
+    for name, build, cold in [("cold", lambda: build_motor_figures(frame), True),
+                              ("live", lambda: build_motor_figures(frame), False)]:
+        seconds, figures = timed(build, args.repeat, cold)
+        payload = streamlit_payload(figures)
+        print(f"{name:>10} | {seconds * 1e3:>10.1f} | {payload / 1024:>12.1f} | "
+              f"{seconds * 1e3:>7.1f} ms, {payload / 1024:>6.1f} KB")
+    seconds, figures = timed(lambda: build_motor_animation(frame, args.frames), max(args.repeat // 4, 1))
+    payload = streamlit_payload(figures)
+    print(f"{'animated':>10} | {seconds * 1e3:>10.1f} | {payload / 1024:>12.1f} | "
+          f"{seconds * 1e3 / args.frames:>7.1f} ms, {payload / 1024 / args.frames:>6.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Out-of-core vs in-memory training: peak RSS, wall time and accuracy on the same generated data.
+
+The training data is a generated CSV, the input the in-memory path parses
+whole. Each trainer runs as its own process in a scratch directory (so the
+repo's model/ is untouched), its peak RSS taken from the kernel; the RSS of
+a process that only imports the trainers is shown as the baseline. Both
+fault models are then scored on a separately seeded hold-out set.
+
+Run from the repository root:
+    python -m benchmarks.bench_out_of_core --motors 50 --samples-per-motor 20000 --memory-budget 128
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+
+from dataset_generator import generate
+from telemetry_store import TelemetryStore
+from train_model import FEATURE_COLUMNS
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(script, args, workdir):
+    """Wall seconds and peak RSS (MiB) of ``python script args`` run in ``workdir``."""
+    env = {**os.environ, "PYTHONPATH": REPO + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    start = time.perf_counter()
+    command = [script] if script == "-c" else [os.path.join(REPO, script)]
+    proc = subprocess.Popen([sys.executable, *command, *args], cwd=workdir, env=env,
+                            stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(proc.pid, 0)
+    if status:
+        raise SystemExit(f"{script} {' '.join(args)} failed ({status})")
+    return time.perf_counter() - start, usage.ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--motors", type=int, default=50)
+    parser.add_argument("--samples-per-motor", type=int, default=20_000)
+    parser.add_argument("--memory-budget", type=float, default=128, help="MiB for the streaming runs")
+    parser.add_argument("--jobs", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        data = os.path.join(workdir, "train.csv")
+        generate(data, args.motors, args.samples_per_motor, seed=0)
+        holdout = generate(os.path.join(workdir, "holdout.dcts"), max(args.motors // 5, 3),
+                           args.samples_per_motor, seed=1)
+        print(f"{args.motors * args.samples_per_motor:,} training rows, {holdout['rows']:,} hold-out rows")
+        test = TelemetryStore(os.path.join(workdir, "holdout.dcts")).read(columns=[*FEATURE_COLUMNS, "Fault"])
+
+        print(f"{'run':>28} | {'wall (s)':>8} | {'peak RSS (MiB)':>14} | result")
+        wall, rss = run("-c", ["import train_model, anomaly_detection_isoforest"], workdir)
+        print(f"{'imports only':>28} | {wall:>8.1f} | {rss:>14.0f} |")
+        streaming = ["--streaming", "--memory-budget", str(args.memory_budget)]
+        for name, extra in [("fault model, in memory", []), ("fault model, streaming", streaming)]:
+            run_dir = os.path.join(workdir, name)
+            os.makedirs(run_dir, exist_ok=True)
+            wall, rss = run("train_model.py", ["--data", data, "--jobs", str(args.jobs), *extra], run_dir)
+            model = joblib.load(os.path.join(run_dir, "model", "dc_motor_fault_model.pkl"))
+            accuracy = float(np.mean(model.predict(test[FEATURE_COLUMNS]) == test["Fault"]))
+            with open(os.path.join(run_dir, "model", "metrics.json")) as f:
+                own = json.load(f)["accuracy"]
+            print(f"{name:>28} | {wall:>8.1f} | {rss:>14.0f} | hold-out accuracy {accuracy:.4f} "
+                  f"(own test split {own:.4f})")
+
+        for name, extra in [("anomaly model, in memory", []), ("anomaly model, streaming", streaming)]:
+            run_dir = os.path.join(workdir, name)
+            os.makedirs(run_dir, exist_ok=True)
+            wall, rss = run("anomaly_detection_isoforest.py", ["--data", data, *extra], run_dir)
+            model = joblib.load(os.path.join(run_dir, "model", "iso_forest_model.pkl"))
+            rate = float(np.mean(model.predict(test[FEATURE_COLUMNS]) == -1))
+            print(f"{name:>28} | {wall:>8.1f} | {rss:>14.0f} | hold-out anomaly rate {rate:.2%}")
+
+
+if __name__ == "__main__":
+    main()
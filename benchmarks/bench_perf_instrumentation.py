@@ -0,0 +1,44 @@
+"""Cost of a StageTimer span when instrumentation is off vs. on.
+
+Run from the repository root:
+    python -m benchmarks.bench_perf_instrumentation --spans 1000000
+"""
+import argparse
+import time
+
+from perf_instrumentation import StageTimer
+
+
+def time_spans(timer, n_spans):
+    start = time.perf_counter()
+    for _ in range(n_spans):
+        with timer.span("stage"):
+            pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spans", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    for _ in range(args.spans):
+        pass
+    baseline_s = time.perf_counter() - start
+
+    for label, timer in (("disabled", StageTimer(enabled=False)), ("enabled", StageTimer(enabled=True))):
+        seconds = time_spans(timer, args.spans) - baseline_s
+        print(f"{label:>9}: {seconds / args.spans * 1e9:>8.0f} ns per span")
+
+    timer = StageTimer(window=500)
+    for i in range(10_000):
+        timer.record("stage", i * 1e-6)
+    timer.summary()  # warm-up
+    start = time.perf_counter()
+    timer.summary()
+    print(f"  summary: {(time.perf_counter() - start) * 1e3:>8.2f} ms for a 500-sample window")
+
+
+if __name__ == "__main__":
+    main()
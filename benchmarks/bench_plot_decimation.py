@@ -0,0 +1,68 @@
+"""Render time of the dashboard sensor plots with and without decimation.
+
+Each render mirrors one sensor chart of realtime_app.py's ``render_charts``:
+the series min-max decimated to the pixel budget, plus at most one fault
+marker per pixel bucket. "decimate" is the time spent picking the indices.
+
+Run from the repository root:
+    python -m benchmarks.bench_plot_decimation
+"""
+import argparse
+import io
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+from plot_decimation import flagged_indices, minmax_indices, pixel_budget  # noqa: E402
+
+
+def synthetic_series(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_rows, dtype=np.float64)
+    current = 1.5 + 1e-6 * t + rng.normal(0, 0.05, n_rows)
+    faults = (rng.random(n_rows) < 0.02).astype(np.int64)
+    return t, current, faults
+
+
+def render(t, y, faults, decimate):
+    points = pixel_budget(6)
+    start = time.perf_counter()
+    fig, ax = plt.subplots(figsize=(6, 2))
+    if decimate:
+        idx = minmax_indices(y, points)
+        fault_idx = flagged_indices(faults, points)
+    else:
+        idx = np.arange(len(y))
+        fault_idx = np.flatnonzero(faults == 1)
+    ax.plot(t[idx], y[idx], color="orange")
+    ax.scatter(t[fault_idx], y[fault_idx], color="red", s=20)
+    fig.savefig(io.BytesIO(), format="png")  # what st.pyplot does server-side
+    plt.close(fig)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3_600, 86_400, 604_800])
+    parser.add_argument("--full-max", type=int, default=100_000,
+                        help="skip the undecimated render above this many rows")
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} | {'full (ms)':>10} | {'decimated (ms)':>14} | {'decimate (ms)':>13}")
+    for n in args.sizes:
+        t, y, faults = synthetic_series(n)
+        full = render(t, y, faults, False) * 1e3 if n <= args.full_max else float("nan")
+        decimated = render(t, y, faults, True) * 1e3
+        start = time.perf_counter()
+        minmax_indices(y, pixel_budget(6))
+        flagged_indices(faults, pixel_budget(6))
+        decimate = (time.perf_counter() - start) * 1e3
+        print(f"{n:>9} | {full:>10.0f} | {decimated:>14.0f} | {decimate:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
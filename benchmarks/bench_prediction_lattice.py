@@ -0,0 +1,80 @@
+"""Manual-simulation sliders: precomputed prediction lattice vs a live forest call per slider move.
+
+For the slider grids of app.py and realtime_app.py, the lattice is built in
+one batch (FlatForest, the same model the dashboards use), saved as the
+compressed npz the dashboards keep in model/ and loaded back. A slider move
+is timed as a ``lookup`` against ``predict_one`` plus ``heuristic_rul`` at
+random grid points; "match" checks labels and RUL are identical and
+probabilities agree to float16 precision at those points.
+
+Run from the repository root:
+    python -m benchmarks.bench_prediction_lattice --samples 2000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.run_suite import REFERENCE_ROWS, synthetic_frame
+from fast_forest import FlatForest
+from prediction_lattice import PredictionLattice, lattice_path
+from rul_estimator import heuristic_rul
+from train_model import FEATURE_COLUMNS, train_fault_model
+
+GRIDS = {
+    "app.py": ((11.0, 13.0, 0.05), (1.0, 3.0, 0.05), (1000, 1600, 10)),
+    "realtime_app.py": ((10.0, 14.0, 0.1), (0.0, 5.0, 0.1), (1000, 1600, 50)),
+}
+
+
+def per_call(fn, points):
+    start = time.perf_counter()
+    for point in points:
+        fn(point)
+    return (time.perf_counter() - start) / len(points)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=2000, help="random slider positions timed per grid")
+    args = parser.parse_args()
+
+    reference = synthetic_frame(REFERENCE_ROWS, seed=1)
+    model = FlatForest.from_sklearn(train_fault_model(reference[FEATURE_COLUMNS], reference["Fault"]))
+    rng = np.random.default_rng(0)
+
+    def live(point):
+        label, proba = model.predict_one(point)
+        return label, proba[1], heuristic_rul(proba[1])
+
+    print(f"{'grid':>15} | {'points':>7} | {'build (ms)':>10} | {'file (KiB)':>10} | {'load (ms)':>9} | "
+          f"{'live call (us)':>14} | {'lookup (us)':>11} | match")
+    for name, axes in GRIDS.items():
+        start = time.perf_counter()
+        lattice = PredictionLattice.build(model, axes, model_sha256="0" * 64)
+        build = time.perf_counter() - start
+        with tempfile.TemporaryDirectory() as directory:
+            path = lattice_path(axes, lattice.model_sha256, directory)
+            lattice.save(path)
+            size = os.path.getsize(path)
+            start = time.perf_counter()
+            PredictionLattice.load(path)
+            load = time.perf_counter() - start
+
+        values = PredictionLattice.points(axes)
+        points = [[float(v[rng.integers(len(v))]) for v in values] for _ in range(args.samples)]
+        slow = per_call(live, points)
+        fast = per_call(lattice.lookup, points)
+        match = True
+        for point in points:
+            label, proba, rul = lattice.lookup(point)
+            live_label, live_proba, live_rul = live(point)
+            match &= label == live_label and rul == live_rul and abs(proba - live_proba) <= 1e-3
+        print(f"{name:>15} | {lattice.labels.size:>7,} | {build * 1e3:>10.1f} | {size / 1024:>10.1f} | "
+              f"{load * 1e3:>9.2f} | {slow * 1e6:>14.1f} | {fast * 1e6:>11.2f} | {match}")
+
+
+if __name__ == "__main__":
+    main()
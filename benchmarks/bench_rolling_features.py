@@ -0,0 +1,54 @@
+"""Rolling feature engine throughput: per-sample updates, dashboard-sized blocks and whole-history batch.
+
+Run from the repository root:
+    python -m benchmarks.bench_rolling_features --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.run_suite import synthetic_frame
+from rolling_features import FEATURE_COLUMNS, RollingFeatureEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--stream-rows", type=int, default=50_000,
+                        help="rows fed one at a time through update()")
+    parser.add_argument("--blocks", type=int, nargs="+", default=[20, 1000])
+    args = parser.parse_args()
+
+    frame = synthetic_frame(args.rows)
+    X = frame[FEATURE_COLUMNS].to_numpy()
+    engine = RollingFeatureEngine()
+    print(f"{len(engine.feature_names)} features over windows {engine.windows} s")
+
+    start = time.perf_counter()
+    batch = engine.transform(frame).to_numpy()
+    elapsed = time.perf_counter() - start
+    print(f"{'transform (batch)':>22}: {args.rows / elapsed:>12,.0f} samples/s")
+
+    for block in args.blocks:
+        engine.reset()
+        n = min(args.rows, block * 500)
+        start = time.perf_counter()
+        for i in range(0, n, block):
+            engine.update_many(X[i:i + block])
+        elapsed = time.perf_counter() - start
+        print(f"{f'update_many({block})':>22}: {n / elapsed:>12,.0f} samples/s")
+
+    engine.reset()
+    n = min(args.rows, args.stream_rows)
+    start = time.perf_counter()
+    streamed = np.array([engine.update(x) for x in X[:n]])
+    elapsed = time.perf_counter() - start
+    print(f"{'update (per sample)':>22}: {n / elapsed:>12,.0f} samples/s ({elapsed / n * 1e6:.1f} us/sample)")
+
+    scale = np.abs(batch[:n]).max(axis=0) + 1e-12
+    print(f"max |stream - batch| / column scale: {(np.abs(streamed - batch[:n]) / scale).max():.1e}")
+
+
+if __name__ == "__main__":
+    main()
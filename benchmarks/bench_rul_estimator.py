@@ -0,0 +1,127 @@
+"""Trend RUL estimator: replay cost and convergence on recorded telemetry, plus fleet-wide update throughput.
+
+Convergence is the earliest time from which every estimate until the first
+recorded fault stays within ``--tolerance`` (relative) plus ``--floor``
+seconds of the true remaining time, with the truth inside the confidence band.
+
+Range queries are app.py's "RUL at the end of the selected range" over
+``--days`` of synthetic 1 Hz telemetry, ending at random rows: replaying the
+range through a fresh estimator (what app.py did per slider move) against a
+checkpointed SeriesRulTracker, which replays at most ``--checkpoint-every``
+rows. "match" checks the tracker against a full replay up to the same row.
+
+Run from the repository root:
+    python -m benchmarks.bench_rul_estimator --data realtime_dc_motor_data.csv --motors 10000 --days 30
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.run_suite import synthetic_frame
+from fleet_simulator import FleetSimulator
+from rul_estimator import SeriesRulTracker, TrendRulEstimator
+from telemetry_store import load_frame
+
+RANGES_S = [("1 h", 3_600), ("1 day", 86_400), ("1 week", 604_800), ("whole history", None)]
+
+
+def replay(data):
+    estimator = TrendRulEstimator()
+    times = data['Time (s)'].to_numpy(dtype=np.float64)
+    values = data[estimator.signal_names].to_numpy()
+    estimates = np.empty((len(data), 3))
+    update_s = 0.0
+    for i in range(len(data)):
+        start = time.perf_counter()
+        estimator.update(times[i:i + 1], values[i:i + 1])
+        update_s += time.perf_counter() - start
+        e = estimator.estimate()
+        estimates[i] = e["rul_s"][0], e["lower_s"][0], e["upper_s"][0]
+    return times, estimates, update_s / len(data)
+
+
+def convergence_time(times, estimates, fault_time, tolerance, floor):
+    before = times < fault_time
+    truth = fault_time - times
+    rul, lower, upper = estimates.T
+    good = (np.abs(rul - truth) <= tolerance * truth + floor) & (lower <= truth) & (truth <= upper)
+    bad = np.flatnonzero(before & ~good)
+    first_good = bad[-1] + 1 if len(bad) else 0
+    return times[first_good] if first_good < before.sum() else None
+
+
+def range_queries(days, checkpoint_every, queries, rng):
+    data = synthetic_frame(int(days * 86_400))
+    tracker = SeriesRulTracker(checkpoint_every=checkpoint_every)
+    start = time.perf_counter()
+    tracker.update(data)
+    build = time.perf_counter() - start
+    print(f"Range queries over {len(data):,} rows: checkpointed tracker built in {build:.1f} s "
+          f"({build / len(data) * 1e6:.2f} us per row, {len(data) // checkpoint_every:,} checkpoints)")
+    print(f"{'range':>14} | {'replay range (ms)':>17} | {'tracker (ms)':>12} | match")
+    for label, span in RANGES_S:
+        rows = span or len(data)
+        stops = rng.integers(rows, len(data) + 1, queries)
+        replay_s, tracker_s, match = 0.0, 0.0, True
+        for stop in stops:
+            start = time.perf_counter()
+            estimator = TrendRulEstimator()
+            window = data.iloc[stop - rows:stop]
+            estimator.update_many(window['Time (s)'].to_numpy(), window[estimator.signal_names].to_numpy())
+            estimator.estimate()
+            replay_s += time.perf_counter() - start
+            start = time.perf_counter()
+            result = tracker.estimate_at(data, int(stop))
+            tracker_s += time.perf_counter() - start
+            if stop == stops[0]:
+                match &= result == SeriesRulTracker().update(data.iloc[:stop])
+        print(f"{label:>14} | {replay_s / queries * 1e3:>17.1f} | {tracker_s / queries * 1e3:>12.2f} | {match}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="realtime_dc_motor_data.csv")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="relative error counted as converged")
+    parser.add_argument("--floor", type=float, default=10.0, help="absolute error (s) always counted as converged")
+    parser.add_argument("--motors", type=int, default=10_000)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--days", type=float, default=30, help="synthetic history for the range queries")
+    parser.add_argument("--checkpoint-every", type=int, default=600)
+    parser.add_argument("--queries", type=int, default=5, help="random range ends timed per range")
+    args = parser.parse_args()
+
+    data = load_frame(args.data)
+    times, estimates, update_s = replay(data)
+    faults = data.loc[data['Fault'] == 1, 'Time (s)']
+    print(f"Replay of {args.data}: {len(data):,} rows, {update_s * 1e6:.1f} us per update")
+    if len(faults):
+        fault_time = float(faults.iloc[0])
+        converged = convergence_time(times, estimates, fault_time, args.tolerance, args.floor)
+        if converged is None:
+            print(f"  first fault at {fault_time:.0f} s; estimate did not converge")
+        else:
+            print(f"  first fault at {fault_time:.0f} s; estimate within ±{args.tolerance:.0%} + {args.floor:g} s "
+                  f"from {converged:.0f} s on ({fault_time - converged:.0f} s of warning)")
+        window = (times >= fault_time - 60) & (times < fault_time)
+        print(f"  mean |error| over the last 60 s before the fault: "
+              f"{np.nanmean(np.abs(estimates[window, 0] - (fault_time - times[window]))):.1f} s")
+
+    simulator = FleetSimulator(args.motors, seed=0)
+    estimator = TrendRulEstimator(args.motors)
+    ticks = [(simulator.time, simulator.tick_arrays()) for _ in range(args.ticks)]
+    start = time.perf_counter()
+    for t, batch in ticks:
+        estimator.update(np.full(args.motors, t), np.column_stack([batch[s] for s in estimator.signal_names]))
+    elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    estimator.estimate()
+    estimate_s = time.perf_counter() - start
+    print(f"Fleet of {args.motors:,} motors: {args.motors * args.ticks / elapsed:,.0f} motor-updates/s "
+          f"({elapsed / args.ticks * 1e3:.2f} ms per tick, estimate {estimate_s * 1e3:.2f} ms)")
+
+    range_queries(args.days, args.checkpoint_every, args.queries, np.random.default_rng(0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Headless multi-session load test of realtime_app.py: CPU per data update vs number of viewers.
+
+Each viewer is a Streamlit AppTest session of the dashboard, all in this
+process and sharing its ``st.cache_resource`` objects, as browser sessions
+share one server. Sessions start logged in (the authenticator's session
+state is seeded), so ``streamlit_authenticator`` must be installed. For each
+``--sessions`` count, every update appends ``--rows`` rows to the CSV, waits
+``--settle`` seconds for the data watch (and the scoring worker) to pick them
+up, then reruns every session, as their poller fragments would. CPU is this
+process's CPU time over the whole update, worker thread included.
+
+``--app`` points at another revision of the script to compare, e.g. the one
+that scored in every session:
+    git show <rev>:realtime_app.py > realtime_app_inline.py
+
+Run from the repository root:
+    python -m benchmarks.bench_scoring_worker --sessions 1 5 10 25 50
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+from generate_realtime_data import COLUMNS, motor_sample
+from telemetry_writer import BufferedCsvWriter
+
+CSV_NAME = "realtime_dc_motor_data.csv"
+SHARED = ["model", "config", "dc_motor_fault_model.pkl", "iso_forest_model.pkl"]
+
+
+def append_rows(path, start, n, rng):
+    with BufferedCsvWriter(path, COLUMNS, append=True) as writer:
+        for t in range(start, start + n):
+            writer.write_row((t, *motor_sample(float(t), rng)))
+    return start + n
+
+
+def new_session(app, timeout):
+    session = AppTest.from_file(app, default_timeout=timeout)
+    session.session_state["authentication_status"] = True
+    session.session_state["name"] = "Load test"
+    session.session_state["username"] = "load-test"
+    return session
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="realtime_app.py")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+    parser.add_argument("--updates", type=int, default=3, help="measured data updates per session count")
+    parser.add_argument("--rows", type=int, default=5, help="rows appended per update")
+    parser.add_argument("--history", type=int, default=3600, help="rows in the CSV before the run")
+    parser.add_argument("--settle", type=float, default=1.5, help="seconds between an append and the reruns")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    root = os.getcwd()
+    app = os.path.abspath(args.app)
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in SHARED:
+            os.symlink(os.path.join(root, name), os.path.join(workdir, name))
+        os.chdir(workdir)
+        t = append_rows(CSV_NAME, 0, args.history, rng)
+
+        print(f"{os.path.basename(app)}: {args.history:,} rows of history, {args.rows} appended per update")
+        print(f"{'sessions':>8} | {'CPU per update (s)':>18} | {'CPU per session (ms)':>20} | "
+              f"{'reruns wall (s)':>15}")
+        for n_sessions in args.sessions:
+            sessions = [new_session(app, args.timeout) for _ in range(n_sessions)]
+            for session in sessions:
+                session.run()
+                if session.exception:
+                    raise RuntimeError(session.exception[0].message)
+            cpu_total, wall_total = 0.0, 0.0
+            for _ in range(args.updates):
+                cpu = time.process_time()
+                t = append_rows(CSV_NAME, t, args.rows, rng)
+                time.sleep(args.settle)
+                wall = time.monotonic()
+                for session in sessions:
+                    session.run()
+                wall_total += time.monotonic() - wall
+                cpu_total += time.process_time() - cpu
+            cpu_update = cpu_total / args.updates
+            print(f"{n_sessions:>8} | {cpu_update:>18.2f} | {cpu_update / n_sessions * 1e3:>20.0f} | "
+                  f"{wall_total / args.updates:>15.2f}")
+        os.chdir(root)
+
+
+if __name__ == "__main__":
+    main()
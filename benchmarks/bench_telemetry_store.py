@@ -0,0 +1,85 @@
+"""Load time and resident memory: pd.read_csv vs. the memory-mapped telemetry store.
+
+Run from the repository root:
+    python -m benchmarks.bench_telemetry_store --rows 5000000
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from telemetry_store import TelemetryStore
+
+
+def _current_rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def _measure(kind, csv_path, store_path, result):
+    before = _current_rss_mb()
+    start = time.perf_counter()
+    if kind == "read_csv":
+        frame = pd.read_csv(csv_path)
+        total = float(frame["RPM"].sum())
+    elif kind == "store (full frame)":
+        frame = TelemetryStore(store_path).read()
+        total = float(frame["RPM"].sum())
+    else:  # one-hour slice of one column, as the dashboards request
+        store = TelemetryStore(store_path)
+        total = float(store.column("RPM", store.n_rows - 3600).sum())
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    result.update(seconds=elapsed, rss_mb=_current_rss_mb() - before, peak_mb=peak, checksum=total)
+
+
+def measure(kind, csv_path, store_path):
+    # Each loader runs in a fresh process so RSS is not shared between measurements
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Manager() as manager:
+        result = manager.dict()
+        proc = ctx.Process(target=_measure, args=(kind, csv_path, store_path, result))
+        proc.start()
+        proc.join()
+        return dict(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="dcts-bench-")
+    try:
+        rng = np.random.default_rng(0)
+        n = args.rows
+        csv_path = os.path.join(workdir, "telemetry.csv")
+        pd.DataFrame({
+            "Time (s)": np.arange(n),
+            "Voltage (V)": rng.normal(12.0, 0.2, n),
+            "Current (A)": rng.normal(1.8, 0.3, n),
+            "RPM": rng.normal(1400, 80, n),
+            "Fault": rng.integers(0, 2, n),
+        }).to_csv(csv_path, index=False)
+
+        start = time.perf_counter()
+        store = TelemetryStore.from_csv(csv_path, os.path.join(workdir, "telemetry.dcts"))
+        print(f"{n:,} rows | CSV {os.path.getsize(csv_path) / 2**20:.0f} MB | "
+              f"import {time.perf_counter() - start:.1f} s")
+
+        print(f"{'loader':>22} | {'load (ms)':>10} | {'RSS delta (MB)':>14} | {'peak RSS (MB)':>13}")
+        for kind in ("read_csv", "store (full frame)", "store (1h RPM slice)"):
+            r = measure(kind, csv_path, store.path)
+            print(f"{kind:>22} | {r['seconds'] * 1e3:>10.1f} | {r['rss_mb']:>14.1f} | {r['peak_mb']:>13.1f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Time-range queries over a month of 1 Hz telemetry: pre-aggregated time index vs slicing and rescoring rows.
+
+The baseline is what app.py did per slider move: slice the range, predict
+every row in it, count faults and min/max-decimate the plotted columns. The
+index answers the same range from its tiers (``query`` for the pixel-wide
+buckets, ``totals`` for the counts); both use the flattened fault model.
+
+Run from the repository root:
+    python -m benchmarks.bench_time_index --days 30
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.run_suite import REFERENCE_ROWS, synthetic_frame
+from fast_forest import FlatForest
+from plot_decimation import minmax_indices, pixel_budget
+from time_index import TimeIndex
+from train_model import FEATURE_COLUMNS, train_fault_model
+
+RANGES_S = [("1 h", 3_600), ("1 day", 86_400), ("1 week", 604_800), ("whole month", None)]
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--append-rows", type=int, default=60, help="rows per incremental update")
+    args = parser.parse_args()
+
+    reference = synthetic_frame(REFERENCE_ROWS, seed=1)
+    model = FlatForest.from_sklearn(train_fault_model(reference[FEATURE_COLUMNS], reference["Fault"]))
+    data = synthetic_frame(int(args.days * 86_400))
+    n_points = pixel_budget(10)
+
+    index = TimeIndex(fault_model=model)
+    n_appends = 20
+    first = len(data) - n_appends * args.append_rows
+    start = time.perf_counter()
+    index.update(data.iloc[:first])
+    build = time.perf_counter() - start
+    appends = []
+    for stop in range(first + args.append_rows, len(data) + 1, args.append_rows):
+        start = time.perf_counter()
+        index.update(data.iloc[:stop])
+        appends.append(time.perf_counter() - start)
+    print(f"{len(data):,} rows: index built in {build:.1f} s; {args.append_rows} appended rows folded in "
+          f"{np.median(appends) * 1e3:.1f} ms (median of {n_appends})")
+
+    times = data["Time (s)"].to_numpy()
+    print(f"{'range':>12} | {'rows':>9} | {'slice + rescore (ms)':>20} | {'index (ms)':>10} | {'buckets':>7} | "
+          f"{'resolution (s)':>14} | counts match")
+    for label, span in RANGES_S:
+        t1 = float(times[-1])
+        t0 = t1 - span + 1 if span else float(times[0])
+
+        def baseline():
+            lo, hi = np.searchsorted(times, [t0, t1 + 1])
+            window = data.iloc[lo:hi]
+            predicted = model.predict(window[FEATURE_COLUMNS])
+            for col in FEATURE_COLUMNS:
+                minmax_indices(window[col].to_numpy(), n_points)
+            return int(predicted.sum()), int(window["Fault"].sum())
+
+        def indexed():
+            totals = index.totals(t0, t1)
+            index.query(t0, t1, n_points)
+            return totals["Predicted Fault"], totals["Fault"]
+
+        slow = timed(baseline, args.repeat)
+        fast = timed(indexed, args.repeat)
+        resolution, buckets = index.query(t0, t1, n_points)
+        rows = int(buckets["Samples"].sum())
+        print(f"{label:>12} | {rows:>9,} | {slow * 1e3:>20.1f} | {fast * 1e3:>10.2f} | {len(buckets):>7} | "
+              f"{resolution:>14} | {baseline() == indexed()}")
+
+
+if __name__ == "__main__":
+    main()
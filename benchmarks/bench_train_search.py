@@ -0,0 +1,41 @@
+"""Wall-clock scaling of the cross-validated forest search at 1, 2, 4 and N worker processes.
+
+Run from the repository root:
+    python -m benchmarks.bench_train_search --rows 200000
+"""
+import argparse
+import os
+
+from benchmarks.run_suite import synthetic_frame
+from hyperparameter_search import run_search
+from train_model import FEATURE_COLUMNS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--cv", type=int, default=3)
+    parser.add_argument("--jobs", type=int, nargs="+", default=None,
+                        help="worker counts to compare (default: 1 2 4 and all cores)")
+    args = parser.parse_args()
+
+    n_cores = os.cpu_count()
+    jobs = args.jobs or sorted({1, 2, 4, n_cores})
+    frame = synthetic_frame(args.rows)
+    grid = {"n_estimators": [25, 50], "max_depth": [8, None], "max_features": ["sqrt", None]}
+    print(f"{args.rows:,} rows, {args.cv}-fold CV, {2 * 2 * 2} parameter sets, {n_cores} cores available")
+
+    print(f"{'workers':>7} | {'wall (s)':>9} | {'speedup':>7} | {'efficiency':>10} | best")
+    baseline = None
+    for n_jobs in jobs:
+        leaderboard = run_search(frame[FEATURE_COLUMNS], frame["Fault"], grid, cv=args.cv, n_jobs=n_jobs)
+        wall = leaderboard.attrs["wall_seconds"]
+        baseline = baseline or wall
+        best = leaderboard.iloc[0]
+        print(f"{n_jobs:>7} | {wall:>9.2f} | {baseline / wall:>6.2f}x | {baseline / wall / n_jobs:>10.0%} | "
+              f"{best['n_estimators']} trees, depth {best['max_depth']}, {best['max_features']} "
+              f"({best['mean_accuracy']:.4f})")
+
+
+if __name__ == "__main__":
+    main()
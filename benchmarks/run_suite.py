@@ -0,0 +1,291 @@
+"""Headless pipeline benchmark: generate, load, train, score, RUL, rules and 3D figures at scaled sizes.
+
+Every stage runs without Streamlit on synthetic telemetry of 1e3..1e7 rows and
+the best-of-``--repeat`` wall time is written to JSON. Two result files can be
+compared to flag stages that got slower.
+
+Run from the repository root:
+    python -m benchmarks.run_suite --output bench.json
+    python -m benchmarks.run_suite --sizes 1e3 1e4 1e5 --stages score_rf rules --output quick.json
+    python -m benchmarks.run_suite --compare baseline.json bench.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import IsolationForest
+
+from fast_forest import FlatForest
+from fleet_simulator import fleet_phase_model
+from generate_realtime_data import COLUMNS, motor_sample
+from motor_3d_view import build_motor_figures
+from rule_engine import load_rules
+from rul_estimator import SeriesRulTracker
+from telemetry_writer import BufferedCsvWriter
+from train_model import FEATURE_COLUMNS, train_fault_model
+
+DEFAULT_SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+
+# Largest size each stage runs at by default; the scalar generator loop, the
+# per-row RUL filter and forest fitting would take minutes at 1e7 rows.
+# Override with --limit.
+DEFAULT_LIMITS = {"generate": 10**6, "train": 10**5, "rul": 10**6}
+
+# Model fitted once on this many rows and reused by the scoring stages
+REFERENCE_ROWS = 20_000
+
+# Stop repeating a measurement once one run has taken this long
+REPEAT_BUDGET_S = 5.0
+
+
+def synthetic_frame(n_rows, seed=0):
+    """Telemetry in the generator's schema, cycling through the healthy/degrading/faulty phases every 10 min."""
+    rng = np.random.default_rng(seed)
+    t = (np.arange(n_rows) % 600).astype(np.float64)
+    ones = np.ones(n_rows)
+    voltage, current, rpm, fault = fleet_phase_model(t, np.full(n_rows, 60.0), ones, ones, rng)
+    return pd.DataFrame({"Time (s)": np.arange(n_rows), "Voltage (V)": voltage,
+                         "Current (A)": current, "RPM": rpm, "Fault": fault.astype(np.int64)})
+
+
+class Workload:
+    """Lazily built inputs shared by the stages at one size; setup is never timed."""
+
+    def __init__(self, n_rows, workdir, reference):
+        self.n_rows = n_rows
+        self.workdir = workdir
+        self.reference = reference
+        self._frame = None
+        self._csv_path = None
+        self._probabilities = None
+
+    @property
+    def frame(self):
+        if self._frame is None:
+            self._frame = synthetic_frame(self.n_rows)
+        return self._frame
+
+    @property
+    def csv_path(self):
+        if self._csv_path is None:
+            self._csv_path = os.path.join(self.workdir, f"telemetry_{self.n_rows}.csv")
+            self.frame.to_csv(self._csv_path, index=False)
+        return self._csv_path
+
+    @property
+    def probabilities(self):
+        if self._probabilities is None:
+            self._probabilities = self.reference["flat"].predict_proba(self.frame[FEATURE_COLUMNS].to_numpy())[:, 1]
+        return self._probabilities
+
+
+class Reference:
+    """Models fitted once per suite run, so scoring cost does not depend on the training size."""
+
+    def __init__(self):
+        frame = synthetic_frame(REFERENCE_ROWS, seed=1)
+        X = frame[FEATURE_COLUMNS]
+        self.models = {"rf": train_fault_model(X, frame["Fault"])}
+        self.models["flat"] = FlatForest.from_sklearn(self.models["rf"])
+        self.models["iso"] = IsolationForest(n_estimators=100, contamination=0.05, random_state=42).fit(X)
+        self.models["rules"] = load_rules()["suggestions"]
+
+    def __getitem__(self, name):
+        return self.models[name]
+
+
+# --- Stages: each returns a zero-argument callable timed by the runner ---
+
+def stage_generate(w):
+    path = os.path.join(w.workdir, "generated.csv")
+
+    def run():
+        rng = np.random.default_rng(0)
+        with BufferedCsvWriter(path, COLUMNS) as writer:
+            for i in range(w.n_rows):
+                voltage, current, rpm, fault = motor_sample(float(i % 600), rng)
+                writer.write_row((i, voltage, current, rpm, fault))
+    return run
+
+
+def stage_csv_load(w):
+    path = w.csv_path
+    return lambda: pd.read_csv(path)
+
+
+def stage_train(w):
+    X, y = w.frame[FEATURE_COLUMNS], w.frame["Fault"]
+    return lambda: train_fault_model(X, y)
+
+
+def stage_score_rf(w):
+    X = w.frame[FEATURE_COLUMNS]
+    return lambda: w.reference["rf"].predict_proba(X)
+
+
+def stage_score_rf_flat(w):
+    X = w.frame[FEATURE_COLUMNS].to_numpy()
+    return lambda: w.reference["flat"].predict_proba(X)
+
+
+def stage_score_isoforest(w):
+    X = w.frame[FEATURE_COLUMNS]
+    return lambda: w.reference["iso"].decision_function(X)
+
+
+def stage_rul(w):
+    # The dashboards' degradation-trend RUL: every row fed once through the Kalman trend filter
+    frame = w.frame
+    return lambda: SeriesRulTracker().update(frame)
+
+
+def stage_rules(w):
+    frame = w.frame.assign(**{"Anomaly": (w.probabilities > 0.5).astype(np.int64)})
+    rules = w.reference["rules"]
+
+    def run():
+        codes = rules.evaluate(frame)
+        return rules.unique_texts(codes)
+    return run
+
+
+def stage_render(w):
+    frame = w.frame
+    return lambda: build_motor_figures(frame)
+
+
+STAGES = {
+    "generate": stage_generate,
+    "csv_load": stage_csv_load,
+    "train": stage_train,
+    "score_rf": stage_score_rf,
+    "score_rf_flat": stage_score_rf_flat,
+    "score_isoforest": stage_score_isoforest,
+    "rul": stage_rul,
+    "rules": stage_rules,
+    "render": stage_render,
+}
+
+
+def time_best(run, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        if elapsed > REPEAT_BUDGET_S:
+            break
+    return best
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run_suite(sizes, stages, limits, repeat):
+    results = []
+    workdir = tempfile.mkdtemp(prefix="dcmotor-bench-")
+    try:
+        reference = Reference()
+        for n_rows in sizes:
+            workload = Workload(n_rows, workdir, reference)
+            for name in stages:
+                if n_rows > limits.get(name, float("inf")):
+                    continue
+                seconds = time_best(STAGES[name](workload), repeat)
+                results.append({"stage": name, "rows": n_rows, "seconds": seconds,
+                                "rows_per_s": n_rows / seconds if seconds > 0 else None})
+                print(f"{name:>16} | {n_rows:>12,} rows | {seconds * 1e3:>11.2f} ms | "
+                      f"{n_rows / seconds:>14,.0f} rows/s", flush=True)
+            # Drop this size's CSV before moving to the next, larger one
+            for filename in os.listdir(workdir):
+                os.remove(os.path.join(workdir, filename))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare(baseline_path, current_path, tolerance, min_delta_ms):
+    """Print a side-by-side table; returns the number of regressions."""
+    with open(baseline_path) as f:
+        baseline = {(r["stage"], r["rows"]): r for r in json.load(f)["results"]}
+    with open(current_path) as f:
+        current = json.load(f)["results"]
+
+    regressions = 0
+    print(f"{'stage':>16} | {'rows':>12} | {'base (ms)':>11} | {'new (ms)':>11} | {'ratio':>6} |")
+    for r in current:
+        base = baseline.get((r["stage"], r["rows"]))
+        if base is None:
+            continue
+        base_ms, new_ms = base["seconds"] * 1e3, r["seconds"] * 1e3
+        ratio = new_ms / base_ms if base_ms > 0 else float("inf")
+        regressed = ratio > 1 + tolerance and new_ms - base_ms > min_delta_ms
+        regressions += regressed
+        flag = "REGRESSION" if regressed else ("faster" if ratio < 1 / (1 + tolerance) else "")
+        print(f"{r['stage']:>16} | {r['rows']:>12,} | {base_ms:>11.2f} | {new_ms:>11.2f} | {ratio:>6.2f} | {flag}")
+    print(f"{regressions} regression(s) beyond {tolerance:.0%}")
+    return regressions
+
+
+def parse_limits(values):
+    limits = dict(DEFAULT_LIMITS)
+    for value in values:
+        stage, _, rows = value.partition("=")
+        if stage not in STAGES or not rows:
+            raise SystemExit(f"--limit expects STAGE=ROWS with a stage from {sorted(STAGES)}, got {value!r}")
+        limits[stage] = int(float(rows))
+    return limits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=lambda s: int(float(s)), nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--stages", nargs="+", choices=sorted(STAGES), default=list(STAGES))
+    parser.add_argument("--limit", action="append", default=[], metavar="STAGE=ROWS",
+                        help=f"largest size for a stage (defaults: {DEFAULT_LIMITS})")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the best is kept")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="compare two result files instead of running")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="relative slowdown reported as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="ignore slowdowns smaller than this, which are timer noise")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.tolerance, args.min_delta_ms) else 0)
+
+    results = run_suite(sorted(args.sizes), args.stages, parse_limits(args.limit), args.repeat)
+    with open(args.output, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+    print(f"📄 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+class CsvTailReader:
+    """Incrementally reads an append-only CSV file.
+
+    The reader remembers the byte offset of the last complete line it parsed and
+    keeps the parsed rows in growable column buffers, so each call to ``read()``
+    only parses the bytes appended since the previous call. A trailing line
+    without a newline (written mid-append) is left for the next call. If the file
+    shrinks or is replaced (new inode), the reader starts over from the header.
+    A file deleted and recreated on the same inode, or truncated and regrown past
+    the offset, keeps neither signal, so the reader also remembers the header and
+    the last bytes it parsed and starts over when the file no longer holds them.
+
+    With ``keep_rows`` only the most recent rows stay buffered (at least
+    ``keep_rows``, at most about twice that), so memory stays flat however long
+    the file grows; ``first_row`` is then the file row the frame starts at.
+    Every ``read`` still returns all rows appended since the previous one.
+    """
+
+    # Bytes just before the offset compared on each poll; more than one telemetry line.
+    TAIL_BYTES = 256
+
+    def __init__(self, path, initial_capacity=1024, keep_rows=None):
+        self.path = path
+        self.initial_capacity = initial_capacity
+        self.keep_rows = keep_rows
+        self._lock = threading.Lock()
+        self.generation = -1
+        self._reset()
+
+    def _reset(self):
+        self._offset = 0
+        self._inode = None
+        self._mtime_ns = None
+        self._header = b""
+        self._tail = b""
+        self._columns = None
+        self._buffers = {}
+        self._n_rows = 0  # rows buffered, file rows first_row onwards
+        self._first_row = 0
+        # Bumped whenever the file is truncated/replaced so callers can drop derived state.
+        self.generation += 1
+
+    @property
+    def n_rows(self):
+        return self._first_row + self._n_rows
+
+    @property
+    def first_row(self):
+        return self._first_row
+
+    @property
+    def columns(self):
+        return list(self._columns) if self._columns else []
+
+    def read(self):
+        """Parse newly appended rows and return the full frame.
+
+        The returned DataFrame shares memory with the reader's buffers and must
+        be treated as read-only (adding new columns is fine).
+        """
+        with self._lock:
+            self._poll()
+            return self._frame()
+
+    def _poll(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if self._inode is not None:
+                self._reset()
+            return
+
+        # --- Truncation / rotation ---
+        if self._inode is not None and (stat.st_ino != self._inode or stat.st_size < self._offset):
+            self._reset()
+        if stat.st_size == self._offset and stat.st_mtime_ns == self._mtime_ns:
+            return
+
+        with open(self.path, "rb") as f:
+            if self._offset and not self._unchanged(f):
+                self._reset()
+            self._inode = stat.st_ino
+            self._mtime_ns = stat.st_mtime_ns
+            f.seek(self._offset)
+            chunk = f.read(stat.st_size - self._offset)
+
+        # Only consume complete lines; a partial last line is picked up next time.
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return
+        chunk = chunk[:end + 1]
+
+        if self._columns is None:
+            header_end = chunk.find(b"\n")
+            header = chunk[:header_end].decode("utf-8").strip()
+            self._columns = [c.strip() for c in header.split(",")]
+            self._header = chunk[:header_end + 1]
+            self._tail = self._header[-self.TAIL_BYTES:]
+            self._offset += header_end + 1
+            chunk = chunk[header_end + 1:]
+
+        if chunk.strip():
+            new_rows = pd.read_csv(io.BytesIO(chunk), header=None, names=self._columns)
+            self._append(new_rows)
+        self._offset += len(chunk)
+        self._tail = (self._tail + chunk)[-self.TAIL_BYTES:]
+
+    def _unchanged(self, f):
+        """Whether the open file still starts with the parsed header and holds the parsed tail at the offset."""
+        if f.read(len(self._header)) != self._header:
+            return False
+        f.seek(self._offset - len(self._tail))
+        return f.read(len(self._tail)) == self._tail
+
+    def _trim(self, keep):
+        """Drop all but the last ``keep`` buffered rows, into new buffers: frames already returned stay intact."""
+        drop = self._n_rows - keep
+        for col, buf in self._buffers.items():
+            kept = np.empty(max(self.initial_capacity, 2 * self.keep_rows), dtype=buf.dtype)
+            kept[:keep] = buf[drop:self._n_rows]
+            self._buffers[col] = kept
+        self._first_row += drop
+        self._n_rows = keep
+
+    def _append(self, new_rows):
+        n_new = len(new_rows)
+        if self.keep_rows and self._n_rows + n_new > 2 * self.keep_rows:
+            self._trim(max(self.keep_rows - n_new, 0))
+        needed = self._n_rows + n_new
+        for col in self._columns:
+            values = new_rows[col].to_numpy()
+            buf = self._buffers.get(col)
+            if buf is None:
+                buf = np.empty(max(self.initial_capacity, needed), dtype=values.dtype)
+            else:
+                dtype = np.result_type(buf.dtype, values.dtype)
+                if len(buf) < needed or dtype != buf.dtype:
+                    # Grow geometrically so appends stay amortized O(1) per row.
+                    grown = np.empty(max(len(buf) * 2, needed), dtype=dtype)
+                    grown[:self._n_rows] = buf[:self._n_rows]
+                    buf = grown
+            buf[self._n_rows:needed] = values
+            self._buffers[col] = buf
+        self._n_rows = needed
+
+    def _frame(self):
+        if self._columns is None:
+            return pd.DataFrame()
+        return pd.DataFrame(
+            {col: self._buffers[col][:self._n_rows] if col in self._buffers else np.empty(0)
+             for col in self._columns},
+            copy=False,
+        )
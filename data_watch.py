@@ -0,0 +1,118 @@
+"""Change notifications for a telemetry file or store that other processes append to.
+
+A background thread polls a cheap signature of the data: inode, size and
+mtime of a CSV, or the schema inode plus the last chunk's row count of a
+``.dcts`` store (whose rows are written through a memory map, so its mtime
+is not reliable). Changes are debounced: a burst of appends publishes one new
+``version`` once the data has been quiet for ``debounce`` seconds, and at
+least every ``max_delay`` seconds while appends keep coming. Readers compare
+``version`` with the one they last rendered, or block in ``wait``; in-process
+writers can call ``notify`` to publish immediately.
+"""
+import collections
+import os
+import struct
+import threading
+import time
+import traceback
+
+from telemetry_store import HEADER, SCHEMA_FILE
+
+
+def file_signature(path):
+    """Cheap tuple that changes whenever rows are appended to ``path``; None if it does not exist."""
+    try:
+        if not os.path.isdir(path):
+            stat = os.stat(path)
+            return stat.st_ino, stat.st_size, stat.st_mtime_ns
+        schema_inode = os.stat(os.path.join(path, SCHEMA_FILE)).st_ino
+        chunks = sorted(name for name in os.listdir(path) if name.startswith("chunk-") and name.endswith(".bin"))
+        if not chunks:
+            return schema_inode, 0, 0
+        with open(os.path.join(path, chunks[-1]), "rb") as f:
+            _, n_rows, _ = HEADER.unpack(f.read(HEADER.size))
+        return schema_inode, len(chunks), n_rows
+    except (OSError, ValueError, struct.error):  # missing, or a chunk caught mid-write
+        return None
+
+
+class DataWatch:
+    """Debounced, versioned change notifications for ``path`` from a polling thread."""
+
+    def __init__(self, path, poll_interval=0.25, debounce=0.5, max_delay=2.0, history=600):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.version = 0
+        self.polls = 0
+        self.changes_seen = 0
+        self.last_error = None
+        self.published_at = collections.deque(maxlen=history)
+        self._signature = file_signature(path)
+        self._pending_since = None
+        self._last_change = None
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"data-watch:{self.path}", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+                self.last_error = None
+            except Exception:  # one bad poll must not end the watch; the next one retries
+                self.last_error = traceback.format_exc()
+
+    def poll(self, now=None):
+        """Check the signature once; returns True if a new version was published."""
+        now = time.monotonic() if now is None else now
+        signature = file_signature(self.path)
+        with self._condition:
+            self.polls += 1
+            if signature != self._signature:
+                self._signature = signature
+                self.changes_seen += 1
+                self._last_change = now
+                if self._pending_since is None:
+                    self._pending_since = now
+            if self._pending_since is None:
+                return False
+            if now - self._last_change >= self.debounce or now - self._pending_since >= self.max_delay:
+                self._publish(now)
+                return True
+            return False
+
+    def notify(self):
+        """Publish a new version right away (for writers in this process)."""
+        with self._condition:
+            self._publish(time.monotonic())
+
+    def _publish(self, now):
+        self._pending_since = self._last_change = None
+        self.version += 1
+        self.published_at.append(now)
+        self._condition.notify_all()
+
+    def wait(self, version, timeout=None):
+        """Block until ``self.version`` differs from ``version`` (or ``timeout``); returns the current version."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    def per_minute(self, now=None):
+        """Versions published over the last minute."""
+        now = time.monotonic() if now is None else now
+        return sum(1 for t in self.published_at if now - t <= 60.0)
@@ -0,0 +1,269 @@
+"""Headless, chunked, multi-process generator for training-scale DC motor datasets.
+
+Every motor gets one fault scenario (round-robin over ``--scenarios``) and
+its own aging rate, noise level, starting age and voltage offset. The output
+is cut into chunks of ``--chunk-rows`` samples of one motor; worker processes
+generate and write chunks independently, so memory stays at a few chunks per
+worker whatever the output size. Each chunk draws from its own seed, derived
+from ``--seed``, the motor and the chunk position. Output is therefore
+identical for any worker count.
+
+Output is a CSV file (parts written in parallel, then joined in order) or,
+for a path ending in ``.dcts``, a telemetry store whose chunk files the
+workers write directly.
+
+    python dataset_generator.py --motors 1000 --samples-per-motor 86400 --output fleet.dcts
+    python dataset_generator.py --output simulated_dc_motor_data.csv --motors 1 --spread 0 --plot
+"""
+import argparse
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from fleet_simulator import fleet_phase_model
+from telemetry_store import DEFAULT_DTYPES, STORE_SUFFIX, TelemetryStore
+
+SCENARIOS = ("aging", "phased", "overload")  # "Scenario" column codes, in this order
+COLUMNS = ["Time (s)", "Voltage (V)", "Current (A)", "RPM", "Fault"]
+FLEET_COLUMNS = ["motor_id", "Scenario", *COLUMNS]
+
+# Overload scenario: each slot of this many seconds may hold one load event
+OVERLOAD_SLOT = 600.0
+OVERLOAD_PROBABILITY = 0.25
+
+
+def fault_label(voltage, current, rpm):
+    """Fault labels of the original simulation: overcurrent, underspeed or combined stress."""
+    return ((current > 2.5) | (rpm < 1200) | ((current > 2.2) & (rpm < 1300)) |
+            ((voltage > 12.2) & (current > 2.0))).astype(np.int8)
+
+
+def motor_parameters(seed, motor, samples_per_motor, sampling_rate, spread=1.0):
+    """Per-motor aging rate, noise, starting age (s), voltage offset and degradation start (s).
+
+    ``spread`` scales the variation between motors; 0 gives every motor the
+    nominal parameters of the original one-motor simulation.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(motor,)))
+    rate, noise, age, offset, start = rng.lognormal(0.0, 0.3), rng.uniform(0.8, 1.5), \
+        rng.uniform(0.0, 1800.0), rng.normal(0.0, 0.05), rng.uniform(0.1, 0.7)
+    duration = samples_per_motor / sampling_rate
+    return {"rate": rate ** spread, "noise": 1.0 + spread * (noise - 1.0), "age": spread * age,
+            "voltage_offset": spread * offset,
+            "degradation_start": duration * ((1 - spread) / 3 + spread * start)}
+
+
+def _hash_uniform(key, values, stream):
+    """Uniform [0, 1) numbers that depend only on (key, value, stream): splitmix64 over uint64."""
+    x = np.asarray(values).astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    x ^= np.uint64(key)
+    x += np.uint64(stream * 0xBF58476D1CE4E5B9 % 2 ** 64)
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+
+def overload_mask(key, t):
+    """Samples inside a load event; events are fixed per motor, so chunk boundaries do not matter."""
+    slot = np.floor(t / OVERLOAD_SLOT)
+    occurs = _hash_uniform(key, slot, 1) < OVERLOAD_PROBABILITY
+    length = 60.0 + 120.0 * _hash_uniform(key, slot, 2)
+    begin = slot * OVERLOAD_SLOT + (OVERLOAD_SLOT - length) * _hash_uniform(key, slot, 3)
+    return occurs & (t >= begin) & (t < begin + length)
+
+
+def generate_samples(scenario, params, t, rng, key=0):
+    """Voltage, current, RPM and fault arrays for one motor at times ``t`` (s)."""
+    n = len(t)
+    noise = params["noise"]
+    if scenario == "phased":
+        ones = np.ones(n)
+        voltage, current, rpm, _ = fleet_phase_model(t, params["degradation_start"] * ones,
+                                                     params["rate"] * ones, noise * ones, rng)
+        voltage = voltage + params["voltage_offset"]
+    else:
+        # Linear aging of the original simulation: RPM drops and current rises with age
+        age = params["age"] + t
+        voltage = 12.0 + params["voltage_offset"] + 0.2 * noise * rng.standard_normal(n)
+        rpm = 1500 - 0.2 * params["rate"] * age + 20 * noise * rng.standard_normal(n)
+        current = 1.5 + 0.0005 * params["rate"] * age + 0.05 * noise * rng.standard_normal(n)
+        if scenario == "overload":
+            loaded = overload_mask(key, t)
+            current = current + 0.8 * loaded
+            rpm = rpm - 250 * loaded
+    return voltage, current, rpm, fault_label(voltage, current, rpm)
+
+
+def chunk_frame(config, motor, start, rows):
+    """Samples ``start:start + rows`` of ``motor`` as a DataFrame in the output schema."""
+    seed = config["seed"]
+    scenario_code = motor % len(config["scenarios"])
+    scenario = config["scenarios"][scenario_code]
+    params = motor_parameters(seed, motor, config["samples_per_motor"], config["sampling_rate"],
+                              config["spread"])
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(motor, start // config["chunk_rows"] + 1)))
+    key = np.random.SeedSequence(seed, spawn_key=(motor, 0)).generate_state(1, np.uint64)[0]
+    t = (start + np.arange(rows)) / config["sampling_rate"]
+    voltage, current, rpm, fault = generate_samples(scenario, params, t, rng, key)
+    columns = {"Time (s)": t, "Voltage (V)": voltage, "Current (A)": current, "RPM": rpm, "Fault": fault}
+    if config["fleet"]:
+        columns = {"motor_id": np.full(rows, motor, dtype=np.int32),
+                   "Scenario": np.full(rows, SCENARIOS.index(scenario), dtype=np.int8), **columns}
+    return pd.DataFrame(columns)
+
+
+_config = None
+_store = None
+
+
+def _init_worker(config):
+    global _config, _store
+    _config = config
+    _store = TelemetryStore(config["output"], writable=True) if config["store"] else None
+
+
+def _write_chunk(task):
+    index, motor, start, rows = task
+    began = time.perf_counter()
+    frame = chunk_frame(_config, motor, start, rows)
+    if _store is not None:
+        _store.write_chunk(index, frame)
+    else:
+        frame.to_csv(_part_path(_config["output"], index), index=False, header=index == 0)
+    return rows, int(frame["Fault"].sum()), time.perf_counter() - began
+
+
+def _part_path(output, index):
+    return os.path.join(output + ".parts", f"part-{index:06d}.csv")
+
+
+def _tasks(motors, samples_per_motor, chunk_rows):
+    index = 0
+    for motor in range(motors):
+        for start in range(0, samples_per_motor, chunk_rows):
+            yield index, motor, start, min(chunk_rows, samples_per_motor - start)
+            index += 1
+
+
+def generate(output, motors=1, samples_per_motor=3600, scenarios=SCENARIOS, seed=0, spread=1.0,
+             sampling_rate=1.0, chunk_rows=65536, workers=None):
+    """Write the dataset to ``output`` and return counts and timings.
+
+    At most two chunks per worker are in flight, so memory does not grow with
+    the number of chunks.
+    """
+    workers = workers or os.cpu_count()
+    config = {"output": output, "seed": seed, "scenarios": tuple(scenarios), "spread": spread,
+              "sampling_rate": sampling_rate, "samples_per_motor": samples_per_motor,
+              "chunk_rows": chunk_rows, "fleet": motors > 1, "store": output.endswith(STORE_SUFFIX)}
+    columns = FLEET_COLUMNS if config["fleet"] else COLUMNS
+    if config["store"]:
+        TelemetryStore.create(output, {col: DEFAULT_DTYPES[col] for col in columns}, chunk_rows=chunk_rows)
+    else:
+        os.makedirs(output + ".parts", exist_ok=True)
+
+    tasks = _tasks(motors, samples_per_motor, chunk_rows)
+    rows = faults = 0
+    busy = 0.0
+    began = time.perf_counter()
+    try:
+        if workers == 1:
+            _init_worker(config)
+            results = map(_write_chunk, tasks)
+        else:
+            results = _run_pool(config, tasks, workers)
+        for n, n_faults, seconds in results:
+            rows += n
+            faults += n_faults
+            busy += seconds
+        if not config["store"]:
+            _join_parts(output, motors * -(-samples_per_motor // chunk_rows))
+    finally:
+        if not config["store"]:
+            shutil.rmtree(output + ".parts", ignore_errors=True)
+    wall = time.perf_counter() - began
+    return {"rows": rows, "faults": faults, "wall_seconds": wall, "worker_seconds": busy,
+            "workers": workers, "samples_per_second": rows / wall if wall else float("inf"),
+            "samples_per_second_per_core": rows / busy if busy else float("inf")}
+
+
+def _run_pool(config, tasks, workers):
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config,)) as pool:
+        pending = set()
+        for task in tasks:
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+            pending.add(pool.submit(_write_chunk, task))
+        for future in pending:
+            yield future.result()
+
+
+def _join_parts(output, n_parts):
+    """Concatenate the CSV parts in chunk order (only part 0 carries the header)."""
+    tmp = output + ".tmp"
+    with open(tmp, "wb") as out:
+        for index in range(n_parts):
+            with open(_part_path(output, index), "rb") as part:
+                shutil.copyfileobj(part, out, 1 << 20)
+    os.replace(tmp, output)
+
+
+def plot_first_motor(output, n_rows=3600):
+    import matplotlib.pyplot as plt
+
+    if output.endswith(STORE_SUFFIX):
+        data = TelemetryStore(output).read(0, n_rows)
+    else:
+        data = pd.read_csv(output, nrows=n_rows)
+    time_s = data['Time (s)']
+    plt.figure(figsize=(12, 6))
+    for i, (column, color) in enumerate([("Voltage (V)", None), ("Current (A)", "orange"), ("RPM", "green")]):
+        plt.subplot(3, 1, i + 1)
+        plt.plot(time_s, data[column], label=column.split(" ")[0], color=color)
+        plt.ylabel(column)
+    plt.xlabel("Time (seconds)")
+    plt.tight_layout()
+    plt.show()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate simulated DC motor telemetry at any scale.")
+    parser.add_argument("--output", default="simulated_dc_motor_data.csv",
+                        help=f"CSV file, or a telemetry store directory ending in {STORE_SUFFIX}")
+    parser.add_argument("--motors", type=int, default=1)
+    parser.add_argument("--samples-per-motor", type=int, default=3600)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS),
+                        help="fault scenarios, assigned to motors round-robin")
+    parser.add_argument("--sampling-rate", type=float, default=1.0, help="samples per second")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spread", type=float, default=1.0,
+                        help="variation between motors (0: every motor has the nominal parameters)")
+    parser.add_argument("--chunk-rows", type=int, default=65536, help="samples per chunk (multiple of 8)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--plot", action="store_true", help="plot the first motor's first hour when done")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    stats = generate(args.output, args.motors, args.samples_per_motor, args.scenarios, args.seed,
+                     args.spread, args.sampling_rate, args.chunk_rows, args.workers)
+    print(f"✅ Wrote {stats['rows']:,} samples ({args.motors:,} motor{'s' if args.motors > 1 else ''}) to {args.output} "
+          f"in {stats['wall_seconds']:.1f} s")
+    print(f"   {stats['samples_per_second']:,.0f} samples/s with {stats['workers']} workers, "
+          f"{stats['samples_per_second_per_core']:,.0f} samples/s per core")
+    print(f"Fault Label Counts: {stats['rows'] - stats['faults']:,} healthy, {stats['faults']:,} faulty")
+    if args.plot:
+        plot_first_motor(args.output, int(3600 * args.sampling_rate))
+
+
+if __name__ == "__main__":
+    main()
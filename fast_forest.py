@@ -0,0 +1,208 @@
+import numpy as np
+
+
+class FlatForest:
+    """A fitted RandomForestClassifier flattened into contiguous node arrays.
+
+    All trees share one set of arrays (feature, threshold, children, leaf class
+    probabilities) with leaves pointing at themselves, so a batch is scored by
+    stepping every (tree, sample) pair down one level at a time for
+    ``max_depth`` steps. Inputs are cast to float32 and compared against the
+    float64 thresholds exactly as sklearn's tree code does, and per-tree
+    probabilities are summed in tree order before dividing by the number of
+    trees, so labels and probabilities match ``predict`` / ``predict_proba``
+    bit for bit.
+
+    For large batches each tree is also compiled into a leaf lookup grid: the
+    tree's thresholds split every feature into bins, so a sample's leaf is
+    ``grid[bin_0, ..., bin_n]``. Samples are binned once per feature against the
+    union of all trees' thresholds with ``np.searchsorted``; small per-tree
+    tables then map those global bins to the tree's flattened cell offset.
+    Grids are only built when they stay under ``max_grid_cells`` in total
+    (low-dimensional forests such as the 3-feature motor model); otherwise
+    large batches use the traversal too.
+    """
+
+    max_grid_cells = 1 << 23
+    grid_min_batch = 512
+    grid_chunk_size = 1 << 16
+
+    def __init__(self, feature, threshold, left, right, missing_go_to_left, leaf_proba,
+                 roots, max_depth, classes, n_features, feature_names=None, chunk_size=4096):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_go_to_left = missing_go_to_left
+        # children[2 * node] is the left child, children[2 * node + 1] the right one
+        self.children = np.ascontiguousarray(np.stack([left, right], axis=1).ravel())
+        # For float32 x: x <= threshold  <=>  x <= threshold32, the largest float32 <= threshold
+        threshold32 = threshold.astype(np.float32)
+        too_big = threshold32.astype(np.float64) > threshold
+        threshold32[too_big] = np.nextafter(threshold32[too_big], np.float32(-np.inf))
+        self.threshold32 = threshold32
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes_ = classes
+        self.n_features_in_ = n_features
+        self.feature_names_in_ = feature_names
+        self.chunk_size = chunk_size
+        self._grids = None
+
+    @classmethod
+    def from_sklearn(cls, model):
+        if model.n_outputs_ != 1:
+            raise ValueError("FlatForest only supports single-output classifiers.")
+
+        features, thresholds, lefts, rights, missing, probas, roots = [], [], [], [], [], [], []
+        offset = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            node_ids = np.arange(offset, offset + n, dtype=np.intp)
+            is_leaf = tree.children_left == -1
+
+            # Leaves point at themselves so extra traversal steps are no-ops
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            missing.append(getattr(tree, "missing_go_to_left", np.zeros(n, dtype=np.uint8)).astype(bool))
+
+            # Same normalisation as DecisionTreeClassifier.predict_proba
+            proba = tree.value[:, 0, :model.n_classes_].astype(np.float64)
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            probas.append(proba / normalizer)
+
+            roots.append(offset)
+            offset += n
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features), dtype=np.intp),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+            left=np.ascontiguousarray(np.concatenate(lefts), dtype=np.intp),
+            right=np.ascontiguousarray(np.concatenate(rights), dtype=np.intp),
+            missing_go_to_left=np.concatenate(missing),
+            leaf_proba=np.ascontiguousarray(np.concatenate(probas)),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max(e.tree_.max_depth for e in model.estimators_),
+            classes=model.classes_,
+            n_features=model.n_features_in_,
+            feature_names=getattr(model, "feature_names_in_", None),
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def _as_matrix(self, X):
+        if hasattr(X, "columns") and self.feature_names_in_ is not None:
+            X = X[list(self.feature_names_in_)]
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has {X.shape[1]} features, but the forest expects {self.n_features_in_}.")
+        return np.ascontiguousarray(X)
+
+    def _proba_chunk(self, X):
+        n_samples, n_features = X.shape
+        flat_X = X.ravel()
+        base = (np.arange(n_samples, dtype=np.intp) * n_features)[np.newaxis, :]
+        node = np.repeat(self.roots[:, np.newaxis], n_samples, axis=1)
+        has_missing = bool(np.isnan(flat_X).any())
+
+        for _ in range(self.max_depth):
+            value = flat_X[base + self.feature[node]]
+            go_right = value > self.threshold32[node]
+            if has_missing:
+                go_right |= np.isnan(value) & ~self.missing_go_to_left[node]
+            node = self.children[2 * node + go_right]
+
+        # Sum trees in order, then divide, like RandomForestClassifier.predict_proba
+        proba = np.zeros((n_samples, self.leaf_proba.shape[1]), dtype=np.float64)
+        for tree_leaves in node:
+            proba += self.leaf_proba[tree_leaves]
+        proba /= self.n_trees
+        return proba
+
+    def _build_grids(self):
+        internal = self.children[2 * np.arange(len(self.feature))] != np.arange(len(self.feature))
+        bounds = np.append(self.roots, len(self.feature))
+        grids, total_cells = [], 0
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            nodes = np.arange(start, stop)[internal[start:stop]]
+            edges = [np.unique(self.threshold32[nodes[self.feature[nodes] == f]])
+                     for f in range(self.n_features_in_)]
+            shape = tuple(len(e) + 1 for e in edges)
+            total_cells += int(np.prod(shape))
+            if total_cells > self.max_grid_cells:
+                return False
+            grids.append((edges, shape))
+
+        # Representative point of bin b is edges[b] (or +inf past the last edge);
+        # route one point per cell through the tree to fill the grid with leaf ids.
+        self._global_edges = [np.unique(np.concatenate([e[f] for e, _ in grids]))
+                              for f in range(self.n_features_in_)]
+        global_reps = [np.append(e, np.float32(np.inf)) for e in self._global_edges]
+        self._grids = []
+        for root, (edges, shape) in zip(self.roots, grids):
+            axes = [np.append(e, np.float32(np.inf)) for e in edges]
+            cells = np.stack([a.ravel() for a in np.meshgrid(*axes, indexing="ij")], axis=1)
+            node = np.full(len(cells), root, dtype=np.intp)
+            rows = np.arange(len(cells))
+            for _ in range(self.max_depth):
+                go_right = cells[rows, self.feature[node]] > self.threshold32[node]
+                node = self.children[2 * node + go_right]
+            strides = np.cumprod((1,) + shape[:0:-1])[::-1]
+            # Global bin -> this tree's bin, pre-multiplied by the grid stride
+            offsets = [(np.searchsorted(e, reps, side="left") * stride).astype(np.intp)
+                       for e, reps, stride in zip(edges, global_reps, strides)]
+            # Store each class's leaf probability per cell so lookups are 1-D gathers
+            cell_proba = [np.ascontiguousarray(self.leaf_proba[node, c])
+                          for c in range(self.leaf_proba.shape[1])]
+            self._grids.append((offsets, cell_proba))
+        return True
+
+    def _proba_grid(self, X):
+        bins = [np.searchsorted(e, np.ascontiguousarray(X[:, f]), side="left")
+                for f, e in enumerate(self._global_edges)]
+        proba = [np.zeros(len(X), dtype=np.float64) for _ in range(self.leaf_proba.shape[1])]
+        cell = np.empty(len(X), dtype=np.intp)
+        for offsets, cell_proba in self._grids:
+            np.take(offsets[0], bins[0], out=cell)
+            for offset, b in zip(offsets[1:], bins[1:]):
+                cell += offset[b]
+            for total, values in zip(proba, cell_proba):
+                total += values[cell]
+        proba = np.stack(proba, axis=1)
+        proba /= self.n_trees
+        return proba
+
+    def predict_proba(self, X):
+        X = self._as_matrix(X)
+        if len(X) >= self.grid_min_batch and not np.isnan(X).any():
+            if self._grids is None and not self._build_grids():
+                self.grid_min_batch = np.inf  # too many cells, always traverse
+            if self._grids is not None:
+                return np.concatenate([self._proba_grid(X[i:i + self.grid_chunk_size])
+                                       for i in range(0, len(X), self.grid_chunk_size)])
+        if len(X) <= self.chunk_size:
+            return self._proba_chunk(X)
+        return np.concatenate([self._proba_chunk(X[i:i + self.chunk_size])
+                               for i in range(0, len(X), self.chunk_size)])
+
+    def predict_with_proba(self, X):
+        """Labels and class probabilities from a single traversal."""
+        proba = self.predict_proba(X)
+        return self.classes_.take(np.argmax(proba, axis=1)), proba
+
+    def predict(self, X):
+        return self.predict_with_proba(X)[0]
+
+    def predict_one(self, values):
+        """Label and class-probability row for one sample given as a flat sequence."""
+        labels, proba = self.predict_with_proba(values)
+        return labels[0], proba[0]
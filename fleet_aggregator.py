@@ -0,0 +1,197 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from inference_cache import FEATURE_COLUMNS
+from rul_estimator import DEFAULT_SIGNALS, TrendRulEstimator
+
+SUMMARY_COLUMNS = ["motor_id", "Last seen (s)", "Samples", "Fault rate", "Recent fault rate", "Anomalies",
+                   "RUL (s)", "RUL lower (s)", "RUL upper (s)", "Limiting signal", *FEATURE_COLUMNS]
+
+
+class FleetAggregator:
+    """Per-motor health aggregates of a fleet telemetry stream, updated from new rows only.
+
+    ``update`` takes the append-only fleet frame (a ``motor_id`` column, one
+    row per motor per tick) and folds in the rows after the ones already
+    consumed: one batched call per model, ``np.bincount`` for the counters and
+    a TrendRulEstimator vectorized over motors for the RUL. State is one slot
+    per motor, so a rerun costs O(new rows) however long the history is.
+
+    Faults are the fault model's predictions (the ``Fault`` column without a
+    model); anomalies come from a stateless detector (``decision_function``).
+    The recent fault rate is an EWMA over ``recent_window`` readings.
+
+    The last ``detail_rows`` readings of every motor are kept in a ring buffer
+    for ``detail``, so a motor's history is served without scanning the fleet
+    frame, and callers may hand ``update`` a bounded tail of the stream
+    (``first_row`` is the stream row it starts at). Rows that left that tail
+    before this aggregator saw them are counted in ``skipped_rows``.
+    """
+
+    def __init__(self, fault_model=None, anomaly_model=None, recent_window=60, signals=DEFAULT_SIGNALS,
+                 initial_capacity=256, detail_rows=600):
+        self.fault_model = fault_model
+        self.anomaly_model = anomaly_model
+        self.alpha = 2.0 / (recent_window + 1)
+        self.signals = signals
+        self.initial_capacity = initial_capacity
+        self.detail_rows = detail_rows
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, source_version):
+        self.source_version = source_version
+        self.n_rows = 0
+        self.skipped_rows = 0
+        self.n_motors = 0
+        self._slots = {}
+        self._capacity = self.initial_capacity
+        self.motor_ids = np.empty(self._capacity, dtype=np.int64)
+        self.samples = np.zeros(self._capacity, dtype=np.int64)
+        self.faults = np.zeros(self._capacity, dtype=np.int64)
+        self.anomalies = np.zeros(self._capacity, dtype=np.int64)
+        self.recent_fault_rate = np.zeros(self._capacity)
+        self.last_seen = np.full(self._capacity, np.nan)
+        self.latest = np.full((self._capacity, len(FEATURE_COLUMNS)), np.nan)
+        self.rul = TrendRulEstimator(self._capacity, self.signals)
+        # Ring buffers of each motor's last readings; a motor's k-th reading goes to slot k % detail_rows
+        self.detail_times = np.full((self._capacity, self.detail_rows), np.nan)
+        self.detail_values = np.full((self._capacity, self.detail_rows, len(FEATURE_COLUMNS)), np.nan)
+
+    def update(self, data, source_version=None, first_row=0):
+        """Consume the rows of ``data`` after the ones already seen; returns how many were new.
+
+        ``data`` holds stream rows ``first_row`` onwards (all of them by default).
+        """
+        with self._lock:
+            end = first_row + len(data)
+            if source_version != self.source_version or end < self.n_rows:
+                self._reset(source_version)
+            if first_row > self.n_rows:
+                self.skipped_rows += first_row - self.n_rows
+            new = data.iloc[max(self.n_rows - first_row, 0):]
+            if len(new):
+                self._consume(new)
+            self.n_rows = max(self.n_rows, end)
+            return len(new)
+
+    def _slot_indices(self, motor_ids):
+        unique, inverse = np.unique(motor_ids, return_inverse=True)
+        slots = np.empty(len(unique), dtype=np.int64)
+        for i, motor in enumerate(unique.tolist()):
+            slot = self._slots.get(motor)
+            if slot is None:
+                slot = self._slots[motor] = self.n_motors
+                self.n_motors += 1
+            slots[i] = slot
+        if self.n_motors > self._capacity:
+            self._grow(max(self._capacity * 2, self.n_motors))
+        self.motor_ids[slots] = unique
+        return slots[inverse]
+
+    def _grow(self, capacity):
+        extra = capacity - self._capacity
+        self.motor_ids = np.concatenate([self.motor_ids, np.empty(extra, dtype=np.int64)])
+        for name in ("samples", "faults", "anomalies"):
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(extra, dtype=np.int64)]))
+        self.recent_fault_rate = np.concatenate([self.recent_fault_rate, np.zeros(extra)])
+        self.last_seen = np.concatenate([self.last_seen, np.full(extra, np.nan)])
+        self.latest = np.vstack([self.latest, np.full((extra, len(FEATURE_COLUMNS)), np.nan)])
+        self.detail_times = np.vstack([self.detail_times, np.full((extra, self.detail_rows), np.nan)])
+        self.detail_values = np.concatenate(
+            [self.detail_values, np.full((extra, self.detail_rows, len(FEATURE_COLUMNS)), np.nan)])
+        self.rul.grow(capacity)
+        self._capacity = capacity
+
+    def _consume(self, new):
+        features = new[FEATURE_COLUMNS]
+        times = new['Time (s)'].to_numpy(dtype=np.float64)
+        if self.fault_model is not None:
+            fault = np.argmax(self.fault_model.predict_proba(features), axis=1)
+            fault = self.fault_model.classes_.take(fault).astype(np.int64)
+        else:
+            fault = new['Fault'].to_numpy(dtype=np.int64)
+        if self.anomaly_model is not None:
+            anomaly = (self.anomaly_model.decision_function(features) < 0).astype(np.int64)
+        else:
+            anomaly = np.zeros(len(new), dtype=np.int64)
+        slots = self._slot_indices(new['motor_id'].to_numpy())
+        seen_before = self.samples[slots]
+
+        # --- Counters: one bincount each ---
+        n = self._capacity
+        self.samples += np.bincount(slots, minlength=n)
+        self.faults += np.bincount(slots, weights=fault, minlength=n).astype(np.int64)
+        self.anomalies += np.bincount(slots, weights=anomaly, minlength=n).astype(np.int64)
+
+        # --- Order by motor then time; a motor's k-th new reading goes to round k ---
+        order = np.lexsort((times, slots))
+        sorted_slots = slots[order]
+        starts = np.flatnonzero(np.r_[True, sorted_slots[1:] != sorted_slots[:-1]])
+        lengths = np.diff(np.r_[starts, len(order)])
+        rank = np.arange(len(order)) - np.repeat(starts, lengths)
+        last = order[starts + lengths - 1]
+        feature_values = features.to_numpy(dtype=np.float64)
+        self.last_seen[slots[last]] = times[last]
+        self.latest[slots[last]] = feature_values[last]
+
+        # --- Detail ring buffers: only each motor's last detail_rows new readings, so no slot is written twice ---
+        row_rank, row_count = np.empty_like(rank), np.empty_like(rank)
+        row_rank[order] = rank
+        row_count[order] = np.repeat(lengths, lengths)
+        kept = np.flatnonzero(row_rank >= row_count - self.detail_rows)
+        position = (seen_before[kept] + row_rank[kept]) % self.detail_rows
+        self.detail_times[slots[kept], position] = times[kept]
+        self.detail_values[slots[kept], position] = feature_values[kept]
+
+        # Each round holds at most one reading per motor, so the recursive updates stay vectorized
+        rounds = order[np.argsort(rank, kind="stable")]
+        values = new[self.rul.signal_names].to_numpy(dtype=np.float64)
+        first_seen = self.samples[slots] == np.bincount(slots, minlength=n)[slots]  # no reading before this batch
+        offset = 0
+        for size in np.bincount(rank):
+            rows = rounds[offset:offset + size]
+            offset += size
+            motors = slots[rows]
+            self.rul.update(times[rows], values[rows], motors)
+            rate = self.recent_fault_rate[motors]
+            start = first_seen[rows] & (rank[rows] == 0)
+            self.recent_fault_rate[motors] = np.where(start, fault[rows], rate + self.alpha * (fault[rows] - rate))
+
+    def summary(self):
+        """One row per motor (in first-seen order) with its aggregates and RUL estimate."""
+        with self._lock:
+            n = self.n_motors
+            estimate = self.rul.estimate()
+            signal_names = np.array(self.rul.signal_names, dtype=object)
+            samples = self.samples[:n]
+            frame = pd.DataFrame({
+                "motor_id": self.motor_ids[:n].copy(),
+                "Last seen (s)": self.last_seen[:n].copy(),
+                "Samples": samples.copy(),
+                "Fault rate": self.faults[:n] / np.maximum(samples, 1),
+                "Recent fault rate": self.recent_fault_rate[:n].copy(),
+                "Anomalies": self.anomalies[:n].copy(),
+                "RUL (s)": estimate["rul_s"][:n],
+                "RUL lower (s)": estimate["lower_s"][:n],
+                "RUL upper (s)": estimate["upper_s"][:n],
+                "Limiting signal": signal_names[estimate["signal"][:n]],
+            })
+            for i, col in enumerate(FEATURE_COLUMNS):
+                frame[col] = self.latest[:n, i]
+        return frame[SUMMARY_COLUMNS]
+
+    def detail(self, motor_id):
+        """The motor's last ``detail_rows`` readings (time and feature columns), oldest first."""
+        with self._lock:
+            slot = self._slots.get(motor_id)
+            if slot is None:
+                return pd.DataFrame(columns=["Time (s)", *FEATURE_COLUMNS])
+            count = min(int(self.samples[slot]), self.detail_rows)
+            positions = (int(self.samples[slot]) - count + np.arange(count)) % self.detail_rows
+            frame = {"Time (s)": self.detail_times[slot, positions]}
+            for i, col in enumerate(FEATURE_COLUMNS):
+                frame[col] = self.detail_values[slot, positions, i]
+        return pd.DataFrame(frame)
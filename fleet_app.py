@@ -0,0 +1,109 @@
+import streamlit as st
+
+from csv_tail_reader import CsvTailReader
+from fast_forest import FlatForest
+from fleet_aggregator import FleetAggregator
+from model_registry import get_registry
+from rul_estimator import format_seconds
+from telemetry_store import StoreTailReader, store_path_for, telemetry_exists
+
+st.set_page_config(layout="wide")
+
+FLEET_PATH = "fleet_dc_motor_data.csv"  # written by generate_realtime_data.py --motors N
+SORT_COLUMNS = ["RUL (s)", "Recent fault rate", "Fault rate", "Anomalies", "Last seen (s)", "motor_id"]
+DETAIL_ROWS = 600  # readings shown for the selected motor, kept per motor by the aggregator
+# Rows the reader keeps between reruns; every read still returns all new rows, so this only bounds memory
+READER_KEEP_ROWS = 200_000
+
+st.title("🏭 DC Motor Fleet Overview")
+
+# Models come from the process-wide registry; the fault model is scored through its flattened copy
+registry = get_registry()
+fault_model = registry.derived("fault_model", "flat_forest", FlatForest.from_sklearn)
+use_anomaly = st.sidebar.checkbox("Count anomalies (Isolation Forest)", value=True)
+anomaly_model = registry.get("anomaly_model") if use_anomaly else None
+
+path = st.sidebar.text_input("Fleet telemetry", FLEET_PATH)
+refresh_seconds = st.sidebar.select_slider("Refresh every (s)", [1, 2, 5, 10, 30], value=5)
+if not telemetry_exists(path):
+    st.warning(f"⏳ Waiting for {path}; start `python generate_realtime_data.py --motors 1000`.")
+    st.stop()
+
+
+# One reader per process: reruns only parse rows appended since the last read, and only a bounded
+# tail of the stream stays in memory
+@st.cache_resource
+def get_fleet_reader(path):
+    store_path = store_path_for(path)
+    if store_path:
+        return StoreTailReader(store_path, keep_rows=READER_KEEP_ROWS)
+    return CsvTailReader(path, keep_rows=READER_KEEP_ROWS)
+
+
+# One aggregator per data source and model pair; every session shares it and it sees each row once
+@st.cache_resource(max_entries=4)
+def get_aggregator(path, generation, fault_sha256, anomaly_sha256):
+    return FleetAggregator(fault_model, anomaly_model, detail_rows=DETAIL_ROWS)
+
+
+def model_sha(name, model_obj):
+    entry = registry.entry(name)
+    return entry.sha256 if model_obj is not None and entry is not None else None
+
+
+@st.fragment(run_every=refresh_seconds)
+def fleet_view():
+    reader = get_fleet_reader(path)
+    data = reader.read()
+    if data.empty or 'motor_id' not in data.columns:
+        st.warning("⏳ Waiting for fleet rows (a `motor_id` column is required)...")
+        return
+    aggregator = get_aggregator(path, reader.generation, model_sha("fault_model", fault_model),
+                                model_sha("anomaly_model", anomaly_model))
+    aggregator.update(data, source_version=reader.generation, first_row=reader.first_row)
+    summary = aggregator.summary()
+
+    # --- Fleet KPIs ---
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Motors", f"{len(summary):,}")
+    col2.metric("Faulty now (recent rate > 50%)", int((summary["Recent fault rate"] > 0.5).sum()))
+    col3.metric("Median RUL", format_seconds(summary["RUL (s)"].median()))
+    col4.metric("Latest reading", f"{summary['Last seen (s)'].max():.0f} s")
+
+    # --- Sortable, paginated table (sorting and slicing happen on the server) ---
+    c1, c2, c3, c4 = st.columns([2, 1, 1, 1])
+    sort_by = c1.selectbox("Sort by", SORT_COLUMNS, key="fleet_sort")
+    ascending = c2.toggle("Ascending", value=sort_by in ("RUL (s)", "motor_id"), key="fleet_ascending")
+    page_size = c3.selectbox("Rows per page", [25, 50, 100, 200], index=1, key="fleet_page_size")
+    n_pages = max(1, -(-len(summary) // page_size))
+    page = c4.number_input("Page", 1, n_pages, 1, key="fleet_page")
+    ordered = summary.sort_values(sort_by, ascending=ascending, kind="stable", na_position="last")
+    shown = ordered.iloc[(page - 1) * page_size:page * page_size].copy()
+    for col in ("RUL (s)", "RUL lower (s)", "RUL upper (s)"):
+        shown[col] = [format_seconds(v) for v in shown[col]]
+    shown = shown.rename(columns=lambda c: c.replace(" (s)", "") if c.startswith("RUL") else c)
+    st.dataframe(shown, hide_index=True, use_container_width=True, column_config={
+        "Fault rate": st.column_config.ProgressColumn(format="%.2f", min_value=0, max_value=1),
+        "Recent fault rate": st.column_config.ProgressColumn(format="%.2f", min_value=0, max_value=1),
+        "Last seen (s)": st.column_config.NumberColumn(format="%.0f"),
+    })
+    st.caption(f"Page {page} of {n_pages} · {aggregator.n_rows - aggregator.skipped_rows:,} rows aggregated "
+               f"incrementally" + (f" ({aggregator.skipped_rows:,} earlier rows were no longer in memory)"
+                                   if aggregator.skipped_rows else ""))
+
+    # --- Per-motor detail, loaded only when asked for ---
+    motor = st.selectbox("Motor detail", [None, *shown["motor_id"].tolist()], key="fleet_detail",
+                         format_func=lambda m: "—" if m is None else f"Motor {m}")
+    if motor is not None:
+        history = aggregator.detail(motor).set_index('Time (s)')
+        row = summary.loc[summary["motor_id"] == motor].iloc[0]
+        st.markdown(f"**Motor {motor}**: RUL {format_seconds(row['RUL (s)'])} "
+                    f"({format_seconds(row['RUL lower (s)'])} – {format_seconds(row['RUL upper (s)'])}, "
+                    f"limited by {row['Limiting signal']}), {row['Anomalies']} anomalies, "
+                    f"fault rate {row['Fault rate']:.1%}")
+        chart_cols = st.columns(3)
+        for chart_col, col in zip(chart_cols, ['Voltage (V)', 'Current (A)', 'RPM']):
+            chart_col.line_chart(history[col], height=200)
+
+
+fleet_view()
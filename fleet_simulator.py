@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+FLEET_COLUMNS = ["motor_id", "Time (s)", "Voltage (V)", "Current (A)", "RPM", "Fault"]
+
+# Length of the degradation phase before faulty behaviour sets in (as in generate_realtime_data.py)
+DEGRADATION_DURATION = 60.0
+
+
+def fleet_phase_model(t, degradation_start, slope, noise, rng):
+    """Vectorized healthy / degradation / fault phase model.
+
+    Same shape as ``generate_realtime_data.motor_sample`` but evaluated for many
+    motors at once: each motor has its own degradation start time (s), slope
+    multiplier and noise multiplier. ``t`` is a scalar or an array broadcastable
+    against the per-motor arrays. Returns voltage, current, rpm and fault arrays.
+    """
+    t = np.broadcast_to(np.asarray(t, dtype=np.float64), degradation_start.shape)
+    n = degradation_start.shape
+    since_degradation = t - degradation_start
+    since_fault = since_degradation - DEGRADATION_DURATION
+
+    healthy = since_degradation < 0
+    degrading = ~healthy & (since_fault < 0)
+
+    # Draw all noise up front, in a fixed order, so a seed fully determines the batch
+    rpm_noise = rng.standard_normal(n)
+    current_noise = rng.standard_normal(n)
+    voltage = 12.0 + 0.2 * noise * rng.standard_normal(n)
+
+    # PHASE 1: Healthy / PHASE 2: Degradation begins / PHASE 3: Faulty behavior increases
+    rpm = np.where(
+        healthy, 1500 + 10 * noise * rpm_noise,
+        np.where(degrading,
+                 1450 - 0.5 * slope * since_degradation + 20 * noise * rpm_noise,
+                 1300 - 0.3 * slope * since_fault + 25 * noise * rpm_noise))
+    current = np.where(
+        healthy, 1.5 + 0.05 * noise * current_noise,
+        np.where(degrading,
+                 1.6 + 0.01 * slope * since_degradation + 0.05 * noise * current_noise,
+                 2.2 + 0.015 * slope * since_fault + 0.07 * noise * current_noise))
+
+    # Fault rule: Current > 2.5 A or RPM < 1150
+    fault = ((current > 2.5) | (rpm < 1150)).astype(np.int8)
+    return voltage, current, rpm, fault
+
+
+class FleetSimulator:
+    """Simulates ``n_motors`` motors in lockstep, one batch per tick.
+
+    Per-motor parameters are drawn once from ``seed``; every tick then draws its
+    noise from the same generator, so two simulators built with the same seed
+    produce identical batches.
+    """
+
+    def __init__(self, n_motors, seed=None, sampling_interval=1.0,
+                 degradation_start_range=(60.0, 3600.0), slope_sigma=0.3, noise_range=(0.8, 1.5)):
+        self.n_motors = n_motors
+        self.sampling_interval = sampling_interval
+        self.rng = np.random.default_rng(seed)
+        self.motor_id = np.arange(n_motors, dtype=np.int32)
+        self.degradation_start = self.rng.uniform(*degradation_start_range, n_motors)
+        self.slope = self.rng.lognormal(0.0, slope_sigma, n_motors)
+        self.noise = self.rng.uniform(*noise_range, n_motors)
+        self.tick_index = 0
+
+    @property
+    def time(self):
+        return self.tick_index * self.sampling_interval
+
+    def tick_arrays(self):
+        """Advance one tick and return the batch as a dict of column arrays."""
+        t = self.time
+        voltage, current, rpm, fault = fleet_phase_model(
+            t, self.degradation_start, self.slope, self.noise, self.rng)
+        self.tick_index += 1
+        return {
+            "motor_id": self.motor_id,
+            "Time (s)": np.full(self.n_motors, t),
+            "Voltage (V)": voltage,
+            "Current (A)": current,
+            "RPM": rpm,
+            "Fault": fault,
+        }
+
+    def tick(self):
+        """Advance one tick and return the batch as a DataFrame with a motor_id column."""
+        return pd.DataFrame(self.tick_arrays(), columns=FLEET_COLUMNS)
@@ -1,62 +1,150 @@
-import pandas as pd
+import argparse
+import itertools
 import numpy as np
 import time
 import os
 
+from fleet_simulator import FLEET_COLUMNS, FleetSimulator
+from telemetry_writer import open_writer
+
 # --- Configuration ---
 csv_file = "realtime_dc_motor_data.csv"
+fleet_csv_file = "fleet_dc_motor_data.csv"
 duration_minutes = 5
-sampling_interval = 1  # seconds
-total_samples = duration_minutes * 60
-
-# --- Remove previous file ---
-if os.path.exists(csv_file):
-    os.remove(csv_file)
+sampling_rate = 1  # samples per second
+batch_size = 1000  # rows per write
+flush_interval = 1.0  # seconds; flush at least this often so the dashboard sees fresh rows
 
-print("🟢 Generating realistic real-time motor data with early fault chain...")
+COLUMNS = ["Time (s)", "Voltage (V)", "Current (A)", "RPM", "Fault"]
 
-# --- Generate live data ---
-for i in range(total_samples):
-    timestamp = i  # in seconds
 
+def motor_sample(t, rng):
+    """Healthy / degradation / fault phase model for one reading at time ``t`` (seconds)."""
     # PHASE 1: Healthy (0–60s)
-    if i < 60:
-        rpm = 1500 + np.random.normal(0, 10)
-        current = 1.5 + np.random.normal(0, 0.05)
+    if t < 60:
+        rpm = 1500 + rng.normal(0, 10)
+        current = 1.5 + rng.normal(0, 0.05)
 
     # PHASE 2: Degradation begins (60–120s)
-    elif 60 <= i < 120:
-        rpm = 1450 - 0.5 * (i - 60) + np.random.normal(0, 20)
-        current = 1.6 + 0.01 * (i - 60) + np.random.normal(0, 0.05)
+    elif 60 <= t < 120:
+        rpm = 1450 - 0.5 * (t - 60) + rng.normal(0, 20)
+        current = 1.6 + 0.01 * (t - 60) + rng.normal(0, 0.05)
 
     # PHASE 3: Faulty behavior increases (120s+)
     else:
-        rpm = 1300 - 0.3 * (i - 120) + np.random.normal(0, 25)
-        current = 2.2 + 0.015 * (i - 120) + np.random.normal(0, 0.07)
+        rpm = 1300 - 0.3 * (t - 120) + rng.normal(0, 25)
+        current = 2.2 + 0.015 * (t - 120) + rng.normal(0, 0.07)
 
-    voltage = np.random.normal(loc=12.0, scale=0.2)
+    voltage = rng.normal(loc=12.0, scale=0.2)
 
     # Fault rule: Current > 2.5 A or RPM < 1150
     fault = int((current > 2.5) or (rpm < 1150))
+    return voltage, current, rpm, fault
 
-    row = {
-        "Time (s)": timestamp,
-        "Voltage (V)": voltage,
-        "Current (A)": current,
-        "RPM": rpm,
-        "Fault": fault
-    }
-
-    # Save to file
-    df = pd.DataFrame([row])
-    if not os.path.exists(csv_file):
-        df.to_csv(csv_file, index=False)
-    else:
-        df.to_csv(csv_file, mode='a', index=False, header=False)
 
-    print(f"[{timestamp}s] V: {voltage:.2f}, I: {current:.2f}, RPM: {rpm:.0f}, Fault: {fault}")
-    time.sleep(sampling_interval)
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate real-time DC motor telemetry.")
+    parser.add_argument("--output", default=None,
+                        help=f"CSV path or .dcts binary store (default: {csv_file}, "
+                             f"or {fleet_csv_file} with --motors)")
+    parser.add_argument("--motors", type=int, default=None,
+                        help="fleet mode: simulate N motors per tick with a motor_id column")
+    parser.add_argument("--duration-minutes", type=float, default=duration_minutes)
+    parser.add_argument("--rate", type=float, default=sampling_rate,
+                        help="samples per second, e.g. 1000 for 1 kHz")
+    parser.add_argument("--batch-size", type=int, default=batch_size)
+    parser.add_argument("--flush-interval", type=float, default=flush_interval)
+    parser.add_argument("--no-sleep", action="store_true",
+                        help="generate as fast as possible instead of pacing to --rate")
+    parser.add_argument("--log-every", type=int, default=None,
+                        help="print every Nth sample (default: once per simulated second)")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args()
+
+
+def format_timestamp(t):
+    return int(t) if float(t).is_integer() else round(t, 9)
+
+
+def run_fleet(args, sampling_interval, total_ticks, log_every):
+    simulator = FleetSimulator(args.motors, seed=args.seed, sampling_interval=sampling_interval)
+    print(f"🟢 Generating fleet telemetry for {args.motors} motors...")
+
+    start = time.perf_counter()
+    next_deadline = start
+    with open_writer(args.output, FLEET_COLUMNS, batch_size=args.batch_size,
+                     flush_interval=args.flush_interval) as writer:
+        for i in range(total_ticks):
+            timestamp = format_timestamp(simulator.time)
+            batch = simulator.tick_arrays()
+            writer.write_rows(zip(batch["motor_id"].tolist(), itertools.repeat(timestamp),
+                                  batch["Voltage (V)"].tolist(), batch["Current (A)"].tolist(),
+                                  batch["RPM"].tolist(), batch["Fault"].tolist()))
+
+            if i % log_every == 0:
+                print(f"[{timestamp}s] motors: {args.motors}, faulty: {int(batch['Fault'].sum())}")
+
+            if not args.no_sleep:
+                next_deadline += sampling_interval
+                delay = next_deadline - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+    elapsed = time.perf_counter() - start
+    rate = writer.rows_written / elapsed if elapsed > 0 else float("inf")
+    print(f"📈 Wrote {writer.rows_written} samples ({total_ticks} ticks) in {elapsed:.2f} s "
+          f"({rate:,.0f} samples/s sustained, {writer.flushes} flushes)")
+    print("✅ Fleet data generation finished.")
+
+
+def main():
+    args = parse_args()
+    sampling_interval = 1.0 / args.rate
+    total_samples = int(args.duration_minutes * 60 * args.rate)
+    log_every = args.log_every or max(1, int(args.rate))
+    rng = np.random.default_rng(args.seed)
+
+    if args.output is None:
+        args.output = fleet_csv_file if args.motors else csv_file
+
+    # --- Remove previous file (a previous .dcts store is cleared by its writer) ---
+    if os.path.isfile(args.output):
+        os.remove(args.output)
+
+    if args.motors:
+        run_fleet(args, sampling_interval, total_samples, log_every)
+        return
+
+    print("🟢 Generating realistic real-time motor data with early fault chain...")
+
+    # --- Generate live data ---
+    start = time.perf_counter()
+    next_deadline = start
+    with open_writer(args.output, COLUMNS, batch_size=args.batch_size,
+                     flush_interval=args.flush_interval) as writer:
+        for i in range(total_samples):
+            t = i * sampling_interval
+            timestamp = format_timestamp(t)
+
+            voltage, current, rpm, fault = motor_sample(t, rng)
+            writer.write_row((timestamp, voltage, current, rpm, fault))
+
+            if i % log_every == 0:
+                print(f"[{timestamp}s] V: {voltage:.2f}, I: {current:.2f}, RPM: {rpm:.0f}, Fault: {fault}")
+
+            if not args.no_sleep:
+                # Pace against an absolute schedule so sleep jitter does not accumulate.
+                next_deadline += sampling_interval
+                delay = next_deadline - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
 
+    elapsed = time.perf_counter() - start
+    rate = total_samples / elapsed if elapsed > 0 else float("inf")
+    print(f"📈 Wrote {writer.rows_written} samples in {elapsed:.2f} s "
+          f"({rate:,.0f} samples/s sustained, {writer.flushes} flushes)")
+    print("✅ Real-time data generation finished.")
 
-print("✅ Real-time data generation finished.")
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import itertools
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import StratifiedKFold
+
+# Forest size, depth and features considered per split (1 of 3 for "sqrt", 2, or all)
+DEFAULT_GRID = {
+    "n_estimators": [50, 100, 200],
+    "max_depth": [None, 8, 16],
+    "max_features": ["sqrt", 2, None],
+}
+
+
+class SharedArray:
+    """A NumPy array copied once into POSIX shared memory; workers attach to it by ``spec``."""
+
+    def __init__(self, array):
+        array = np.ascontiguousarray(array)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.spec = (self._shm.name, array.shape, array.dtype.str)
+        np.ndarray(array.shape, array.dtype, buffer=self._shm.buf)[...] = array
+
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+
+
+def attach(spec):
+    """Read-only view of a SharedArray in another process; keep the returned handle alive."""
+    name, shape, dtype = spec
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+    array = np.ndarray(shape, dtype, buffer=shm.buf)
+    array.flags.writeable = False
+    return shm, array
+
+
+_worker = {}
+
+
+def _init_worker(specs, random_state):
+    for key, spec in specs.items():
+        _worker[key] = attach(spec)
+    _worker["random_state"] = random_state
+
+
+def _evaluate(params, fold):
+    """Fit on every fold but ``fold`` and return (weighted accuracy on ``fold``, fit seconds)."""
+    X, y, w, folds = _worker["X"][1], _worker["y"][1], _worker["w"][1], _worker["folds"][1]
+    train = folds != fold
+    model = RandomForestClassifier(n_jobs=1, random_state=_worker["random_state"], **params)
+    start = time.perf_counter()
+    # The tree builder skips zero-weight rows, so the held-out fold is masked out
+    # without materializing a training copy of the shared matrix.
+    model.fit(X, y, sample_weight=np.where(train, w, 0.0))
+    fit_s = time.perf_counter() - start
+    test = ~train
+    accuracy = float(np.average(model.predict(X[test]) == y[test], weights=w[test]))
+    return accuracy, fit_s
+
+
+def param_grid(grid):
+    """All combinations of ``grid``, cheapest (fewest trees, shallowest) first."""
+    keys = list(grid)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+    return sorted(combos, key=lambda p: p.get("n_estimators", 100) * (p.get("max_depth") or 64))
+
+
+def run_search(X, y, grid=DEFAULT_GRID, cv=5, n_jobs=None, time_budget=None, random_state=42, sample_weight=None):
+    """Cross-validated grid search over random forest parameters on a process pool.
+
+    ``X`` (as float32, the dtype the trees split on) and ``y`` are placed in
+    shared memory once; each task fits one parameter set on one fold. When
+    ``time_budget`` seconds pass, queued fits are cancelled and only parameter
+    sets with every fold finished are ranked. Returns the leaderboard, best first.
+
+    ``sample_weight`` (e.g. the class-mix weights of a stratified sample)
+    weights both the fits and the fold accuracies.
+    """
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    w = np.ones(len(y)) if sample_weight is None else np.asarray(sample_weight, dtype=np.float64)
+    folds = np.empty(len(y), dtype=np.int8)
+    for fold, (_, test) in enumerate(StratifiedKFold(cv, shuffle=True, random_state=random_state).split(X, y)):
+        folds[test] = fold
+
+    combos = param_grid(grid)
+    shared = {"X": SharedArray(X), "y": SharedArray(y), "w": SharedArray(w), "folds": SharedArray(folds)}
+    scores = {i: [] for i in range(len(combos))}
+    fit_seconds = {i: 0.0 for i in range(len(combos))}
+    deadline = time.monotonic() + time_budget if time_budget else None
+    timed_out = False
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=n_jobs or os.cpu_count(), initializer=_init_worker,
+                                 initargs=({k: a.spec for k, a in shared.items()}, random_state)) as pool:
+            pending = {pool.submit(_evaluate, params, fold): i
+                       for i, params in enumerate(combos) for fold in range(cv)}
+            while pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    timed_out = True
+                    for future in pending:
+                        future.cancel()  # fits already running still finish
+                    break
+                done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = pending.pop(future)
+                    accuracy, fit_s = future.result()
+                    scores[i].append(accuracy)
+                    fit_seconds[i] += fit_s
+    finally:
+        for array in shared.values():
+            array.close()
+
+    rows = []
+    for i, params in enumerate(combos):
+        if len(scores[i]) == cv:
+            rows.append({**{k: "None" if v is None else v for k, v in params.items()},
+                         "mean_accuracy": float(np.mean(scores[i])),
+                         "std_accuracy": float(np.std(scores[i])),
+                         "fit_seconds": fit_seconds[i]})
+    leaderboard = pd.DataFrame(rows)
+    if not leaderboard.empty:
+        leaderboard = leaderboard.sort_values(["mean_accuracy", "fit_seconds"], ascending=[False, True],
+                                              ignore_index=True)
+        leaderboard.insert(0, "rank", np.arange(1, len(leaderboard) + 1))
+    leaderboard.attrs.update(wall_seconds=time.perf_counter() - start, timed_out=timed_out,
+                             evaluated=len(rows), candidates=len(combos))
+    return leaderboard
+
+
+def best_params(leaderboard, grid=DEFAULT_GRID):
+    """Parameters of the top leaderboard row with their original types restored."""
+    row = leaderboard.iloc[0]
+    params = {}
+    for key, values in grid.items():
+        params[key] = next(v for v in values if str(v) == str(row[key]))
+    return params
@@ -0,0 +1,121 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+FEATURE_COLUMNS = ['Voltage (V)', 'Current (A)', 'RPM']
+SCORE_COLUMNS = ['Predicted Fault', 'Fault Probability', 'Anomaly', 'Anomaly Score']
+
+
+class ScoreStore:
+    """Keeps model outputs for rows already scored, keyed by ``Time (s)``.
+
+    ``update()`` expects an append-only telemetry frame: the first ``n`` rows are
+    the ones already scored (checked by their first and last ``Time (s)``), and
+    only the rows after them are scored, with one batched call per model. The
+    store resets itself when either model object changes, when the data source
+    is replaced, or when the stored rows no longer line up with the frame.
+    """
+
+    def __init__(self, initial_capacity=1024):
+        self.initial_capacity = initial_capacity
+        self._lock = threading.Lock()
+        self._reset(None, None, None)
+
+    def _reset(self, model, anomaly_model, source_version):
+        self._model = model
+        self._anomaly_model = anomaly_model
+        self._source_version = source_version
+        self._n_rows = 0
+        self._times = np.empty(self.initial_capacity, dtype=np.float64)
+        self._scores = {
+            'Predicted Fault': np.empty(self.initial_capacity, dtype=np.int64),
+            'Fault Probability': np.empty(self.initial_capacity, dtype=np.float64),
+            'Anomaly': np.empty(self.initial_capacity, dtype=np.int64),
+            'Anomaly Score': np.empty(self.initial_capacity, dtype=np.float64),
+        }
+
+    @property
+    def n_rows(self):
+        return self._n_rows
+
+    def update(self, data, model, anomaly_model=None, source_version=None):
+        """Score rows of ``data`` not seen before and return scores for all rows.
+
+        The result is a DataFrame aligned with ``data.index`` holding
+        ``SCORE_COLUMNS``. Without an anomaly model, ``Anomaly`` is 0 and
+        ``Anomaly Score`` is NaN. Like ``CsvTailReader.read``, it shares memory
+        with the store's buffers and must be treated as read-only (adding new
+        columns is fine); stored rows are never rewritten, so earlier results
+        stay valid.
+        """
+        with self._lock:
+            if (model is not self._model or anomaly_model is not self._anomaly_model
+                    or source_version != self._source_version):
+                self._reset(model, anomaly_model, source_version)
+
+            times = data['Time (s)'].to_numpy()
+            start = self._first_unscored(times)
+            if start < len(data):
+                self._score(data.iloc[start:], times[start:])
+            return self._frame(data.index)
+
+    def _first_unscored(self, times):
+        n = self._n_rows
+        if n == 0:
+            return 0
+        # The frame must still start with the rows already stored.
+        if len(times) < n or times[0] != self._times[0] or times[n - 1] != self._times[n - 1]:
+            self._reset(self._model, self._anomaly_model, self._source_version)
+            return 0
+        return n
+
+    def _score(self, new_rows, new_times):
+        features = new_rows[FEATURE_COLUMNS]
+
+        # --- Fault model: one predict_proba call gives both label and probability ---
+        proba = self._model.predict_proba(features)
+        predicted = self._model.classes_.take(np.argmax(proba, axis=1))
+        fault_proba = proba[:, 1]
+
+        # --- Anomaly model: IsolationForest.predict is decision_function < 0 ---
+        if self._anomaly_model is not None:
+            if hasattr(self._anomaly_model, "score_partial_fit"):
+                # Online detectors (HalfSpaceTrees) learn each row once, as it is scored
+                anomaly_score = self._anomaly_model.score_partial_fit(features.to_numpy())
+            else:
+                anomaly_score = self._anomaly_model.decision_function(features)
+            anomaly = (anomaly_score < 0).astype(np.int64)  # NaN (online warm-up) is not an anomaly
+        else:
+            anomaly_score = np.full(len(new_rows), np.nan)
+            anomaly = np.zeros(len(new_rows), dtype=np.int64)
+
+        self._append(new_times, {
+            'Predicted Fault': predicted,
+            'Fault Probability': fault_proba,
+            'Anomaly': anomaly,
+            'Anomaly Score': anomaly_score,
+        })
+
+    def _append(self, new_times, new_scores):
+        n = self._n_rows
+        needed = n + len(new_times)
+        if needed > len(self._times):
+            capacity = max(len(self._times) * 2, needed)
+            self._times = _grow(self._times, n, capacity)
+            self._scores = {col: _grow(buf, n, capacity) for col, buf in self._scores.items()}
+        self._times[n:needed] = new_times
+        for col, values in new_scores.items():
+            self._scores[col][n:needed] = values
+        self._n_rows = needed
+
+    def _frame(self, index):
+        n = self._n_rows
+        return pd.DataFrame({col: self._scores[col][:n] for col in SCORE_COLUMNS},
+                            index=index, copy=False)
+
+
+def _grow(buf, n, capacity):
+    grown = np.empty(capacity, dtype=buf.dtype)
+    grown[:n] = buf[:n]
+    return grown
@@ -0,0 +1,377 @@
+"""Local asyncio ingest service for DC motor sensor frames.
+
+Producers connect over TCP or a Unix socket and send newline-delimited JSON
+frames such as ``{"Time (s)": 12, "Voltage (V)": 12.1, "Current (A)": 1.6, "RPM": 1480}``.
+Frames are validated, queued in a bounded queue (a full queue stops the server
+reading from producers, which pushes back through the socket), grouped into
+micro-batches, appended to the telemetry CSV (or ``.dcts`` store) and pushed to subscribers.
+
+Rows are written in ``Time (s)`` order, which everything reading the file
+relies on. Each producer must send its frames in time order; the server
+merges producers by holding rows until every active producer has sent a
+frame at least as new (a producer silent for ``--producer-idle-timeout``
+seconds stops holding the others back). A frame older than the last row
+written is counted as late and dropped.
+
+A client that sends ``{"subscribe": true}`` as its first line becomes a
+subscriber and receives ``{"columns": [...]}`` followed by ``{"rows": [...]}``
+for every batch.
+
+    python ingest_server.py serve --port 8765
+    python ingest_server.py replay --port 8765 --producers 8 --repeat 50
+    python ingest_server.py subscribe --port 8765
+"""
+import argparse
+import asyncio
+import bisect
+import collections
+import itertools
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from generate_realtime_data import COLUMNS
+from telemetry_store import STORE_SUFFIX, TelemetryStore
+from telemetry_writer import open_writer
+
+SENSOR_FIELDS = ["Time (s)", "Voltage (V)", "Current (A)", "RPM"]
+
+
+class FrameError(ValueError):
+    pass
+
+
+def validate_frame(frame, columns):
+    """Return the frame as a row tuple in ``columns`` order, or raise FrameError."""
+    if not isinstance(frame, dict):
+        raise FrameError("frame must be a JSON object")
+    row = []
+    for col in columns:
+        value = frame.get(col)
+        if value is None and col == "Fault":
+            # Same labelling rule as the simulator: Current > 2.5 A or RPM < 1150
+            value = int(frame["Current (A)"] > 2.5 or frame["RPM"] < 1150)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise FrameError(f"{col!r} must be a number")
+        if not math.isfinite(value):
+            raise FrameError(f"{col!r} must be finite")
+        row.append(value)
+    return tuple(row)
+
+
+class IngestStats:
+    def __init__(self, latency_window=100_000):
+        self.accepted = 0
+        self.rejected = 0
+        self.late = 0
+        self.batches = 0
+        self.dropped_for_subscribers = 0
+        self.latencies = collections.deque(maxlen=latency_window)
+        self._last_report = (time.perf_counter(), 0)
+
+    def report(self, queue_depth, subscribers):
+        now = time.perf_counter()
+        last_time, last_accepted = self._last_report
+        throughput = (self.accepted - last_accepted) / max(now - last_time, 1e-9)
+        self._last_report = (now, self.accepted)
+        p99 = np.percentile(self.latencies, 99) * 1e3 if self.latencies else float("nan")
+        return (f"📥 {throughput:,.0f} frames/s | p99 ingest latency {p99:.2f} ms | "
+                f"accepted {self.accepted} | rejected {self.rejected} | late {self.late} | "
+                f"batches {self.batches} | queue {queue_depth} | subscribers {subscribers} "
+                f"(dropped batches {self.dropped_for_subscribers})")
+
+
+class IngestServer:
+    def __init__(self, output, columns=COLUMNS, queue_size=10_000, batch_size=500,
+                 batch_timeout=0.05, subscriber_queue_size=100, append=False, producer_idle_timeout=5.0):
+        self.output = output
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.subscriber_queue_size = subscriber_queue_size
+        self.append = append
+        self.producer_idle_timeout = producer_idle_timeout
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.subscribers = set()
+        self.stats = IngestStats()
+        self._writer = None
+        self._time_column = self.columns.index("Time (s)")
+        self._producer_ids = itertools.count()
+        self._producers = {}  # producer id -> [newest frame time, perf_counter() when it was batched]
+        self._pending = []  # (time, received, row) held for slower producers, in time order
+        self._last_time = -math.inf
+
+    # --- Connections ---
+    async def handle_connection(self, reader, writer):
+        # Every connection may be a producer: it holds rows back from the moment it connects until it sends
+        producer = next(self._producer_ids)
+        self._producers[producer] = [-math.inf, time.perf_counter()]
+        first = await reader.readline()
+        try:
+            hello = json.loads(first) if first.strip() else None
+        except json.JSONDecodeError:
+            hello = None
+        if isinstance(hello, dict) and hello.get("subscribe"):
+            await self.queue.put((time.perf_counter(), producer, None))
+            await self._serve_subscriber(writer)
+            return
+
+        line = first
+        try:
+            while line:
+                await self._accept_line(line, producer)
+                line = await reader.readline()
+        except (ConnectionResetError, ValueError):
+            pass  # dropped connection or a line over the stream limit
+        finally:
+            writer.close()
+            # Queued behind the producer's last frame: the batcher stops waiting for it once that is in
+            await self.queue.put((time.perf_counter(), producer, None))
+
+    async def _accept_line(self, line, producer):
+        received = time.perf_counter()
+        try:
+            row = validate_frame(json.loads(line), self.columns)
+        except (json.JSONDecodeError, KeyError, TypeError, FrameError):
+            self.stats.rejected += 1
+            return
+        # Blocks when the queue is full, so we stop reading this producer's socket
+        await self.queue.put((received, producer, row))
+
+    async def _serve_subscriber(self, writer):
+        queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
+        self.subscribers.add(queue)
+        try:
+            writer.write((json.dumps({"columns": self.columns}) + "\n").encode())
+            while True:
+                rows = await queue.get()
+                writer.write((json.dumps({"rows": rows}) + "\n").encode())
+                await writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            self.subscribers.discard(queue)
+            writer.close()
+
+    # --- Micro-batching ---
+    async def _next_batch(self, timeout=None):
+        try:
+            batch = [await asyncio.wait_for(self.queue.get(), timeout)]
+        except asyncio.TimeoutError:
+            return []
+        deadline = time.perf_counter() + self.batch_timeout
+        while len(batch) < self.batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _written_until(self):
+        """Time of the last row already in the output when appending to it, else -inf."""
+        try:
+            if self.output.endswith(STORE_SUFFIX):
+                store = TelemetryStore(self.output)
+                times = store.column("Time (s)", store.n_rows - 1)
+                return float(times[-1]) if len(times) else -math.inf
+            with open(self.output, "rb") as f:
+                f.seek(max(os.path.getsize(self.output) - 4096, 0))
+                lines = f.read().splitlines()
+            return float(lines[-1].split(b",")[self._time_column]) if len(lines) > 1 else -math.inf
+        except (OSError, ValueError, IndexError):
+            return -math.inf  # no earlier rows (or only a header)
+
+    def _release(self, batch):
+        """Merge ``batch`` into the held rows and return the ones every active producer has passed, in time order."""
+        for received, producer, row in batch:
+            if row is None:
+                self._producers.pop(producer, None)
+                continue
+            t = row[self._time_column]
+            newest = self._producers.setdefault(producer, [t, received])
+            newest[0] = max(newest[0], t)
+            newest[1] = time.perf_counter()
+            if t < self._last_time:
+                self.stats.late += 1
+                continue
+            self._pending.append((t, received, row))
+        self._pending.sort(key=lambda item: item[0])  # stable: equal times keep their arrival order
+
+        now = time.perf_counter()
+        active = [t for t, seen in self._producers.values() if now - seen < self.producer_idle_timeout]
+        watermark = min(active, default=math.inf)
+        n = bisect.bisect_right(self._pending, watermark, key=lambda item: item[0])
+        released, self._pending = self._pending[:n], self._pending[n:]
+        if released:
+            self._last_time = released[-1][0]
+        return released
+
+    def _write(self, rows):
+        self._writer.write_rows(rows)
+        self._writer.flush()
+
+    async def run_batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # While rows are held, wake up to release them once a silent producer counts as idle
+            batch = await self._next_batch(self.producer_idle_timeout if self._pending else None)
+            released = self._release(batch)
+            # Rows held for a slow producer come out together; write and publish them in batch-sized parts
+            for i in range(0, len(released), self.batch_size):
+                part = released[i:i + self.batch_size]
+                rows = [row for _, _, row in part]
+                await loop.run_in_executor(None, self._write, rows)
+
+                done = time.perf_counter()
+                self.stats.latencies.extend(done - received for _, received, _ in part)
+                self.stats.accepted += len(part)
+                self.stats.batches += 1
+
+                for queue in self.subscribers:
+                    if queue.full():
+                        # A slow subscriber loses its oldest batch instead of stalling ingest
+                        queue.get_nowait()
+                        self.stats.dropped_for_subscribers += 1
+                    queue.put_nowait(rows)
+
+    async def run_reporter(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            print(self.stats.report(self.queue.qsize(), len(self.subscribers)), flush=True)
+
+    async def serve(self, host=None, port=None, unix_path=None, stats_interval=5.0):
+        if self.append:
+            self._last_time = self._written_until()
+        self._writer = open_writer(self.output, self.columns, batch_size=self.batch_size,
+                                   append=self.append)
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.remove(unix_path)
+            server = await asyncio.start_unix_server(self.handle_connection, path=unix_path)
+            print(f"🟢 Ingest server listening on unix:{unix_path}, writing {self.output}")
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+            print(f"🟢 Ingest server listening on {host}:{port}, writing {self.output}")
+
+        # The batcher and reporter run next to the server: if either fails (e.g. the store cannot be
+        # written), stop serving instead of letting producers block on a queue nobody drains
+        tasks = [asyncio.create_task(self.run_batcher()),
+                 asyncio.create_task(self.run_reporter(stats_interval))]
+        try:
+            async with server:
+                tasks.append(asyncio.create_task(server.serve_forever()))
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        print(f"🔴 Ingest server stopping: {task.exception()!r}", flush=True)
+                        raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._writer.close()
+
+
+# --- Client stand-ins ---
+async def _connect(args):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+
+async def replay_producer(args, frames, producer_id, writer):
+    # Every producer sends its share of the frames in time order; the server merges them by time
+    sent = 0
+    span = frames[-1]["Time (s)"] + 1 if frames else 0
+    for r in range(args.repeat):
+        for frame in frames[producer_id::args.producers]:
+            frame = dict(frame, **{"Time (s)": frame["Time (s)"] + r * span})
+            writer.write((json.dumps(frame) + "\n").encode())
+            sent += 1
+            if sent % 256 == 0:
+                await writer.drain()  # honour server backpressure
+                if args.rate:
+                    await asyncio.sleep(256 / args.rate)
+    await writer.drain()
+    writer.close()
+    await writer.wait_closed()
+    return sent
+
+
+async def replay(args):
+    import pandas as pd
+
+    frames = pd.read_csv(args.csv)[SENSOR_FIELDS].to_dict("records")
+    # All producers connect before any sends, so none of their first frames arrives after newer ones were written
+    connections = await asyncio.gather(*(_connect(args) for _ in range(args.producers)))
+    start = time.perf_counter()
+    sent = await asyncio.gather(*(replay_producer(args, frames, p, writer)
+                                  for p, (_, writer) in enumerate(connections)))
+    elapsed = time.perf_counter() - start
+    print(f"📤 Sent {sum(sent)} frames from {args.producers} producers in {elapsed:.2f} s "
+          f"({sum(sent) / elapsed:,.0f} frames/s)")
+
+
+async def subscribe(args):
+    reader, writer = await _connect(args)
+    writer.write(b'{"subscribe": true}\n')
+    await writer.drain()
+    print(json.loads(await reader.readline()))
+    received = 0
+    while line := await reader.readline():
+        rows = json.loads(line)["rows"]
+        received += len(rows)
+        print(f"📨 batch of {len(rows)} rows (total {received})")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="DC motor sensor ingest service.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("serve", "replay", "subscribe"):
+        p = sub.add_parser(name)
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--port", type=int, default=8765)
+        p.add_argument("--unix", default=None, help="Unix socket path instead of TCP")
+        if name == "serve":
+            p.add_argument("--output", default="realtime_dc_motor_data.csv")
+            p.add_argument("--append", action="store_true")
+            p.add_argument("--queue-size", type=int, default=10_000)
+            p.add_argument("--batch-size", type=int, default=500)
+            p.add_argument("--batch-timeout", type=float, default=0.05)
+            p.add_argument("--stats-interval", type=float, default=5.0)
+            p.add_argument("--producer-idle-timeout", type=float, default=5.0,
+                           help="seconds a silent producer holds back the time-ordered merge")
+        elif name == "replay":
+            p.add_argument("--csv", default="realtime_dc_motor_data.csv")
+            p.add_argument("--producers", type=int, default=4)
+            p.add_argument("--repeat", type=int, default=1)
+            p.add_argument("--rate", type=float, default=0, help="frames/s per producer, 0 = unthrottled")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        if args.command == "serve":
+            server = IngestServer(args.output, queue_size=args.queue_size, batch_size=args.batch_size,
+                                  batch_timeout=args.batch_timeout, append=args.append,
+                                  producer_idle_timeout=args.producer_idle_timeout)
+            asyncio.run(server.serve(args.host, args.port, args.unix, args.stats_interval))
+        elif args.command == "replay":
+            asyncio.run(replay(args))
+        else:
+            asyncio.run(subscribe(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
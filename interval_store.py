@@ -0,0 +1,169 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Interval types: the 0/1 flag column that opens and closes an interval, the score whose peak it
+# keeps and whether the peak is the max or the min (anomaly scores are lowest for the worst rows)
+KINDS = {
+    "Fault": ("Predicted Fault", "Fault Probability", "max"),
+    "Anomaly": ("Anomaly", "Anomaly Score", "min"),
+}
+INTERVAL_COLUMNS = ["Type", "Start (s)", "End (s)", "Samples", "Peak"]
+
+
+class _Intervals:
+    """Closed-or-open runs of one flag, in time order, stored in growable arrays."""
+
+    def __init__(self, flag_column, score_column, peak, capacity):
+        self.flag_column = flag_column
+        self.score_column = score_column
+        self.sign = 1.0 if peak == "max" else -1.0
+        self.n = 0
+        self.open = False  # the last row seen was flagged, so the last interval may continue
+        self.start = np.empty(capacity)
+        self.end = np.empty(capacity)
+        self.samples = np.zeros(capacity, dtype=np.int64)
+        self.peak = np.empty(capacity)  # stored as sign * score, so the peak is always a max
+
+    @property
+    def nbytes(self):
+        return self.start.nbytes + self.end.nbytes + self.samples.nbytes + self.peak.nbytes
+
+    def _reserve(self, n):
+        capacity = len(self.start)
+        if n <= capacity:
+            return
+        capacity = max(capacity * 2, n)
+        for name in ("start", "end", "samples", "peak"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    def append(self, times, flags, scores):
+        rows = np.flatnonzero(np.asarray(flags) == 1)
+        if len(rows) == 0:
+            self.open = False
+            return
+        scores = (self.sign * np.asarray(scores, dtype=np.float64)[rows] if scores is not None
+                  else np.full(len(rows), np.nan))
+        # Flagged rows that do not follow another flagged row start a new run
+        firsts = np.flatnonzero(np.r_[True, np.diff(rows) > 1])
+        lasts = np.r_[firsts[1:], len(rows)] - 1
+        samples = np.diff(np.r_[firsts, len(rows)])
+        peaks = np.fmax.reduceat(scores, firsts)
+        starts, ends = times[rows[firsts]], times[rows[lasts]]
+
+        if self.open and rows[0] == 0:
+            last = self.n - 1
+            self.end[last] = ends[0]
+            self.samples[last] += samples[0]
+            self.peak[last] = np.fmax(self.peak[last], peaks[0])
+            starts, ends, samples, peaks = starts[1:], ends[1:], samples[1:], peaks[1:]
+        n_new = len(starts)
+        self._reserve(self.n + n_new)
+        new = slice(self.n, self.n + n_new)
+        self.start[new], self.end[new], self.samples[new], self.peak[new] = starts, ends, samples, peaks
+        self.n += n_new
+        self.open = rows[-1] == len(times) - 1
+
+    def span(self, t0, t1):
+        """Positions of the intervals overlapping ``t0 <= time <= t1`` (ends are sorted too)."""
+        lo = 0 if t0 is None else int(np.searchsorted(self.end[:self.n], t0, side="left"))
+        hi = self.n if t1 is None else int(np.searchsorted(self.start[:self.n], t1, side="right"))
+        return slice(lo, max(lo, hi))
+
+
+class IntervalStore:
+    """Fault and anomaly flags of a telemetry stream kept as run-length intervals.
+
+    Each run of consecutive flagged rows is one interval: its first and last
+    ``Time (s)``, its number of rows and the peak score inside it (highest
+    fault probability, lowest anomaly score). ``update`` takes the times and
+    score columns of the whole append-only stream and folds in only the rows
+    after the ones already seen; a run still going on at the last row is
+    extended by the next update rather than split.
+
+    Memory and rendering follow the number of episodes, not the number of rows.
+    """
+
+    def __init__(self, kinds=KINDS, initial_capacity=64):
+        self.kinds = dict(kinds)
+        self.initial_capacity = initial_capacity
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, source_version):
+        self.source_version = source_version
+        self.n_rows = 0
+        self._intervals = {kind: _Intervals(*spec, self.initial_capacity) for kind, spec in self.kinds.items()}
+
+    @property
+    def nbytes(self):
+        return sum(intervals.nbytes for intervals in self._intervals.values())
+
+    def update(self, times, columns, source_version=None):
+        """Fold in the rows of ``times``/``columns`` after the ones already seen; returns how many were new.
+
+        ``columns`` maps column names (each kind's flag and score columns) to
+        arrays aligned with ``times``; a DataFrame works. Missing score
+        columns give NaN peaks.
+        """
+        with self._lock:
+            if source_version != self.source_version or len(times) < self.n_rows:
+                self._reset(source_version)
+            start = self.n_rows
+            if len(times) > start:
+                self._append(np.asarray(times, dtype=np.float64)[start:],
+                             {col: np.asarray(columns[col])[start:len(times)]
+                              for col in self._columns(columns)})
+                self.n_rows = len(times)
+            return len(times) - start
+
+    def append(self, times, columns):
+        """Fold in rows that directly follow the ones already seen."""
+        with self._lock:
+            self._append(np.asarray(times, dtype=np.float64),
+                         {col: np.asarray(columns[col]) for col in self._columns(columns)})
+            self.n_rows += len(times)
+
+    def _columns(self, columns):
+        names = {name for spec in self.kinds.values() for name in spec[:2]}
+        return [name for name in names if name in columns]
+
+    def _append(self, times, columns):
+        for intervals in self._intervals.values():
+            if intervals.flag_column in columns:
+                intervals.append(times, columns[intervals.flag_column], columns.get(intervals.score_column))
+
+    def count(self, kind):
+        """Number of intervals of ``kind`` so far."""
+        return self._intervals[kind].n
+
+    def xranges(self, kind, step, t0=None, t1=None):
+        """``(left, width)`` pairs for ``ax.broken_barh``; each interval covers its rows plus one ``step``."""
+        with self._lock:
+            intervals = self._intervals[kind]
+            rows = intervals.span(t0, t1)
+            starts = intervals.start[rows]
+            return list(zip(starts.tolist(), (intervals.end[rows] - starts + step).tolist()))
+
+    def frame(self, kind=None, t0=None, t1=None):
+        """Intervals overlapping ``t0 <= time <= t1`` (all by default) as a DataFrame of ``INTERVAL_COLUMNS``."""
+        with self._lock:
+            parts = []
+            for name, intervals in self._intervals.items():
+                if kind is not None and name != kind:
+                    continue
+                rows = intervals.span(t0, t1)
+                parts.append(pd.DataFrame({
+                    "Type": name,
+                    "Start (s)": intervals.start[rows].copy(),
+                    "End (s)": intervals.end[rows].copy(),
+                    "Samples": intervals.samples[rows].copy(),
+                    "Peak": intervals.sign * intervals.peak[rows],
+                }, columns=INTERVAL_COLUMNS))
+        if len(parts) <= 1:
+            return parts[0] if parts else pd.DataFrame(columns=INTERVAL_COLUMNS)
+        return pd.concat(parts).sort_values("Start (s)", kind="stable", ignore_index=True)
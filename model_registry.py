@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import joblib
+
+MODEL_DIR = "model"
+METRICS_PATH = os.path.join(MODEL_DIR, "metrics.json")
+
+# Candidate paths per artifact, first existing wins. Both models are written to
+# model/ by train_model.py and anomaly_detection_isoforest.py; the root copies are only a fallback.
+ARTIFACTS = {
+    "fault_model": [os.path.join(MODEL_DIR, "dc_motor_fault_model.pkl"), "dc_motor_fault_model.pkl"],
+    "anomaly_model": [os.path.join(MODEL_DIR, "iso_forest_model.pkl"), "iso_forest_model.pkl"],
+    # {"model", "feature_engine"} bundle from train_model.py --features rolling
+    "rolling_fault_model": [os.path.join(MODEL_DIR, "dc_motor_fault_model_rolling.pkl")],
+}
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dump_model(obj, path):
+    """``joblib.dump`` to a temporary file renamed over ``path``, so readers never load a partial pickle."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(obj, tmp)
+    os.replace(tmp, path)
+
+
+def _stat_key(path):
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class ModelEntry:
+    def __init__(self, name, path, stat_key, sha256, model, load_seconds):
+        self.name = name
+        self.path = path
+        self.stat_key = stat_key
+        self.sha256 = sha256
+        self.model = model
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+        self.derived = {}
+
+
+class ModelRegistry:
+    """Loads each model artifact once per process and hot-swaps it when the file changes.
+
+    Every ``get`` stats the artifact; only a changed stat triggers hashing, and
+    only a changed content hash triggers a reload. A file that fails to load
+    leaves the previous model in place until the file changes again. Objects derived from a model
+    (e.g. a FlatForest) are cached alongside it and dropped on swap.
+    """
+
+    def __init__(self, artifacts=ARTIFACTS, metrics_path=METRICS_PATH, mmap_mode=None):
+        self.artifacts = artifacts
+        self.metrics_path = metrics_path
+        self.mmap_mode = mmap_mode
+        self._entries = {}
+        self._failed = {}  # name -> stat key of a file that would not load, so it is not retried until it changes
+        self._metrics = (None, {})
+        self._lock = threading.RLock()
+
+    def resolve(self, name):
+        for path in self.artifacts[name]:
+            if os.path.exists(path):
+                return path
+        return None
+
+    def entry(self, name):
+        """Current ModelEntry for ``name`` (reloaded if the file changed), or None if missing."""
+        with self._lock:
+            path = self.resolve(name)
+            current = self._entries.get(name)
+            if path is None:
+                self._entries.pop(name, None)
+                return None
+            stat_key = _stat_key(path)
+            if current is not None and current.path == path and current.stat_key == stat_key:
+                return current
+            if current is not None and self._failed.get(name) == (path, stat_key):
+                return current
+
+            sha256 = file_sha256(path)
+            if current is not None and current.sha256 == sha256:
+                current.path, current.stat_key = path, stat_key  # touched or copied, same content
+                return current
+
+            start = time.perf_counter()
+            try:
+                model = joblib.load(path, mmap_mode=self.mmap_mode)
+            except Exception:
+                if current is None:
+                    raise
+                # Half-written or otherwise unreadable: keep serving the previous model
+                self._failed[name] = (path, stat_key)
+                return current
+            self._failed.pop(name, None)
+            entry = ModelEntry(name, path, stat_key, sha256, model, time.perf_counter() - start)
+            self._entries[name] = entry
+            return entry
+
+    def get(self, name):
+        entry = self.entry(name)
+        return entry.model if entry is not None else None
+
+    def derived(self, name, key, builder, pass_entry=False):
+        """``builder(model)`` cached per model version, e.g. ``derived('fault_model', 'flat', FlatForest.from_sklearn)``.
+
+        With ``pass_entry`` the builder gets the whole ModelEntry, for results
+        that must be tied to the exact file version (``entry.sha256``) they came from.
+        """
+        with self._lock:
+            entry = self.entry(name)
+            if entry is None:
+                return None
+            if key not in entry.derived:
+                entry.derived[key] = builder(entry if pass_entry else entry.model)
+            return entry.derived[key]
+
+    def metadata(self):
+        """Contents of model/metrics.json, reloaded when the file changes.
+
+        ``matches_model`` is False when the metrics were written for a different
+        fault model file than the one currently loaded.
+        """
+        with self._lock:
+            if not os.path.exists(self.metrics_path):
+                return {}
+            stat_key = _stat_key(self.metrics_path)
+            if self._metrics[0] != stat_key:
+                with open(self.metrics_path) as f:
+                    self._metrics = (stat_key, json.load(f))
+            metrics = dict(self._metrics[1])
+            entry = self.entry("fault_model")
+            if "model_sha256" in metrics and entry is not None:
+                metrics["matches_model"] = metrics["model_sha256"] == entry.sha256
+            return metrics
+
+    def status(self):
+        rows = []
+        for name in self.artifacts:
+            entry = self.entry(name)
+            if entry is not None:
+                rows.append({"model": name, "path": entry.path, "sha256": entry.sha256[:12],
+                             "load_ms": round(entry.load_seconds * 1e3, 1),
+                             "loaded_at": time.strftime("%H:%M:%S", time.localtime(entry.loaded_at))})
+        return rows
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """The process-wide registry; set DCMOTOR_MODEL_MMAP=r to memory-map large forests."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry(mmap_mode=os.environ.get("DCMOTOR_MODEL_MMAP") or None)
+        return _registry
@@ -1,85 +1,101 @@
-def render_motor_3d_view(df):
-    import plotly.graph_objects as go
-    import numpy as np
-    import streamlit as st
+import functools
 
-    latest = df.iloc[-1]
-    rpm = latest['RPM']
-    time_s = latest['Time (s)']
-    fault = latest['Fault'] if 'Fault' in latest else 0
+import numpy as np
 
-    # Shaft calculation
-    angle = (rpm * time_s / 60.0) % 360
-    angle_rad = np.radians(angle)
-    shaft_length = 2.5
-    x1 = shaft_length * 0.5 * np.cos(angle_rad)
-    y1 = shaft_length * 0.5 * np.sin(angle_rad)
-    z1 = 1.5
-    shaft_color = 'red' if fault else 'black'
-    glow_color = 'rgba(255,0,0,0.3)' if fault else 'rgba(0,255,0,0.1)'
-
-    # --- Extract latest reading ---
-    latest = df.iloc[-1]
-    rpm = latest['RPM']
-    time_s = latest['Time (s)']
-    fault = latest['Fault'] if 'Fault' in latest else 0
-
-    # --- Shaft math ---
-    angle = (rpm * time_s / 60.0) % 360
-    angle_rad = np.radians(angle)
+# Traces whose content depends on the reading, by position in each figure; everything else is static
+TWIN_DYNAMIC = (1, 2)  # shaft, rotation arc
+MOTOR_DYNAMIC = (1, 10, 11, 15, 18, 19, 20)  # rotor, glow, shaft, glow label, RPM / time / fault labels
+
+# Plotly's default template is most of the spec; the dashboards render with the Streamlit theme instead
+LAYOUT_TEMPLATE = "none"
+DECIMALS = 4  # coordinates are rounded to keep the serialized figures small
+
+
+def motor_state(row):
+    """Shaft angle, tip position and fault flag for one telemetry row."""
+    rpm = float(row['RPM'])
+    time_s = float(row['Time (s)'])
+    fault = bool(row['Fault']) if 'Fault' in row else False
+    angle_rad = np.radians((rpm * time_s / 60.0) % 360)
     shaft_length = 2.5
-    x1 = shaft_length * 0.5 * np.cos(angle_rad)
-    y1 = shaft_length * 0.5 * np.sin(angle_rad)
-    z1 = 1.5
+    return {"rpm": rpm, "time_s": time_s, "fault": fault, "angle_rad": angle_rad,
+            "x1": round(shaft_length * 0.5 * np.cos(angle_rad), DECIMALS),
+            "y1": round(shaft_length * 0.5 * np.sin(angle_rad), DECIMALS), "z1": 1.5}
 
-    # --- Colors ---
-    shaft_color = 'red' if fault else 'black'
-    glow_color = 'rgba(255,0,0,0.3)' if fault else 'rgba(0,255,0,0.1)'
 
-    # --- View 1: Digital Twin ---
-    fig1 = go.Figure()
-
-    # Transparent glass-like casing
-    fig1.add_trace(go.Mesh3d(
-        x=[1, -1, -1, 1, 1, -1, -1, 1],
-        y=[1, 1, -1, -1, 1, 1, -1, -1],
-        z=[0, 0, 0, 0, 3, 3, 3, 3],
-        opacity=0.2,
-        color='lightblue',
-        name="Glass Casing",
-        alphahull=0
-    ))
-
-    # Main rotating shaft
-    fig1.add_trace(go.Scatter3d(
-        x=[0, x1],
-        y=[0, y1],
-        z=[1.5, z1],
-        mode='lines+markers',
-        line=dict(color=shaft_color, width=8),
-        marker=dict(size=5, color='orange'),
-        name='Shaft'
-    ))
+def _shaft(state, marker_size):
+    return dict(type="scatter3d", x=[0, state["x1"]], y=[0, state["y1"]], z=[1.5, state["z1"]],
+                mode='lines+markers', line=dict(color='red' if state["fault"] else 'black', width=8),
+                marker=dict(size=marker_size, color='orange'), name='Shaft')
+
+
+def _text(x, y, z, text, color, **kwargs):
+    return dict(type="scatter3d", x=[x], y=[y], z=[z], mode='text', text=[text],
+                textfont=dict(color=color, size=14), showlegend=False, **kwargs)
 
+
+def twin_dynamic_traces(state):
+    """Digital-twin traces that follow the reading: the shaft and its dashed rotation arc."""
     # Rotation arc (dashed trail showing shaft rotation path)
-    arc_angles = np.linspace(0, angle_rad, 50)
+    arc_angles = np.linspace(0, state["angle_rad"], 50)
     arc_radius = 1.25
-    arc_x = arc_radius * np.cos(arc_angles)
-    arc_y = arc_radius * np.sin(arc_angles)
-    arc_z = np.full_like(arc_x, 1.5)
-
-    fig1.add_trace(go.Scatter3d(
-        x=arc_x,
-        y=arc_y,
-        z=arc_z,
-        mode='lines',
-        line=dict(color='orange', width=3, dash='dash'),
-        name="Shaft Rotation Path"
-    ))
-
-    # Layout settings
+    arc = dict(type="scatter3d",
+               x=np.round(arc_radius * np.cos(arc_angles), DECIMALS).tolist(),
+               y=np.round(arc_radius * np.sin(arc_angles), DECIMALS).tolist(),
+               z=[1.5] * len(arc_angles), mode='lines',
+               line=dict(color='orange', width=3, dash='dash'), name="Shaft Rotation Path")
+    return {1: _shaft(state, 5), 2: arc}
+
+
+def motor_dynamic_traces(state):
+    """Realistic-motor traces that follow the reading: colors, shaft and live labels."""
+    fault = state["fault"]
+    traces = {
+        1: dict(type="scatter3d", x=[0, 0], y=[0, 0], z=[0.3, 2.7], mode='lines',
+                line=dict(color='red' if fault else 'black', width=20), name='Rotor Core'),
+        10: dict(type="scatter3d", x=[0], y=[0], z=[1.5], mode='markers',
+                 marker=dict(size=50, color='rgba(255,0,0,0.3)' if fault else 'rgba(0,255,0,0.1)', opacity=0.4),
+                 name='Glow'),
+        11: _shaft(state, 4),
+        15: _text(0, 0, 1.5, "Glow / Fault", "red" if fault else "green"),
+    }
+    # --- Live Text Labels (RPM, Time, Fault Status), offset left of the motor ---
+    info = [(f"RPM: {state['rpm']:.0f}", 3.6, 'blue'), (f"Time: {int(state['time_s'])} s", 3.4, 'black'),
+            (f"Fault: {'Yes' if fault else 'No'}", 3.2, 'red' if fault else 'green')]
+    for index, (text, z_pos, color) in zip((18, 19, 20), info):
+        traces[index] = _text(-2, 0, z_pos, text, color)
+    return traces
+
+
+def twin_title(state):
+    return f"Enhanced Digital Twin View (RPM: {state['rpm']:.0f})"
+
+
+@functools.lru_cache(maxsize=1)
+def static_figures():
+    """Both figures as validated spec dicts, built once per process.
+
+    Dynamic traces hold placeholders; ``build_motor_figures`` swaps in the
+    current ones without touching (or re-validating) the static geometry.
+    """
+    import plotly.graph_objects as go
+
+    placeholder = motor_state({'RPM': 0.0, 'Time (s)': 0.0, 'Fault': 0})
+    twin_dynamic = twin_dynamic_traces(placeholder)
+    motor_dynamic = motor_dynamic_traces(placeholder)
+
+    # --- View 1: Digital Twin ---
+    twin = [
+        # Transparent glass-like casing
+        dict(type="mesh3d", x=[1, -1, -1, 1, 1, -1, -1, 1], y=[1, 1, -1, -1, 1, 1, -1, -1],
+             z=[0, 0, 0, 0, 3, 3, 3, 3], opacity=0.2, color='lightblue', name="Glass Casing", alphahull=0),
+        twin_dynamic[1],
+        twin_dynamic[2],
+    ]
+    fig1 = go.Figure(data=twin)
     fig1.update_layout(
-        title=f"Enhanced Digital Twin View (RPM: {rpm:.0f})",
+        title=twin_title(placeholder),
+        template=LAYOUT_TEMPLATE,
         scene=dict(
             xaxis=dict(title='X', backgroundcolor="rgb(230, 230,230)", gridcolor="white", showbackground=True),
             yaxis=dict(title='Y', backgroundcolor="rgb(230, 230,230)", gridcolor="white", showbackground=True),
@@ -90,153 +106,45 @@ def render_motor_3d_view(df):
     )
 
     # --- View 2: Realistic Motor ---
-    fig2 = go.Figure()
-
-    # --- Motor body (outer casing) ---
-    fig2.add_trace(go.Mesh3d(
-        x=[1.5, -1.5, -1.5, 1.5, 1.5, -1.5, -1.5, 1.5],
-        y=[1.2, 1.2, -1.2, -1.2, 1.2, 1.2, -1.2, -1.2],
-        z=[0, 0, 0, 0, 3, 3, 3, 3],
-        color='gray',
-        opacity=0.4,
-        name="Motor Body"
-    ))
-
-    # --- Rotor (cylinder-like shape) ---
-    fig2.add_trace(go.Scatter3d(
-        x=[0, 0],
-        y=[0, 0],
-        z=[0.3, 2.7],
-        mode='lines',
-        line=dict(color=shaft_color, width=20),
-        name='Rotor Core'
-    ))
-
-    # --- Coils (symbolic winding coils around motor) ---
-    coil_positions = [(-1, 0), (1, 0), (0, 1), (0, -1)]
-    for (x, y) in coil_positions:
-        fig2.add_trace(go.Scatter3d(
-            x=[x],
-            y=[y],
-            z=[1.5],
-            mode='markers',
-            marker=dict(size=20, color='gold'),
-            name='Coil'
-        ))
-
-    # --- Fan Blades (at back) ---
+    motor = [
+        # Motor body (outer casing)
+        dict(type="mesh3d", x=[1.5, -1.5, -1.5, 1.5, 1.5, -1.5, -1.5, 1.5], y=[1.2, 1.2, -1.2, -1.2, 1.2, 1.2, -1.2, -1.2],
+             z=[0, 0, 0, 0, 3, 3, 3, 3], color='gray', opacity=0.4, name="Motor Body"),
+        motor_dynamic[1],
+    ]
+    # Coils (symbolic winding coils around motor)
+    for x, y in [(-1, 0), (1, 0), (0, 1), (0, -1)]:
+        motor.append(dict(type="scatter3d", x=[x], y=[y], z=[1.5], mode='markers',
+                          marker=dict(size=20, color='gold'), name='Coil'))
+    # Fan blades (at back)
     blade_radius = 1.2
     for angle_deg in range(0, 360, 90):
         angle_rad = np.radians(angle_deg)
-        x_end = blade_radius * np.cos(angle_rad)
-        y_end = blade_radius * np.sin(angle_rad)
-        fig2.add_trace(go.Scatter3d(
-            x=[0, x_end],
-            y=[0, y_end],
-            z=[3.2, 3.2],
-            mode='lines',
-            line=dict(color='blue', width=4),
-            name='Fan Blade'
-        ))
-
-    # --- Glow / Fault Indicator ---
-    fig2.add_trace(go.Scatter3d(
-        x=[0],
-        y=[0],
-        z=[1.5],
-        mode='markers',
-        marker=dict(size=50, color=glow_color, opacity=0.4),
-        name='Glow'
-    ))
-
-    # --- Shaft ---
-    fig2.add_trace(go.Scatter3d(
-        x=[0, x1],
-        y=[0, y1],
-        z=[1.5, z1],
-        mode='lines+markers',
-        line=dict(color=shaft_color, width=8),
-        marker=dict(size=4, color='orange'),
-        name='Shaft'
-    ))
-
-    # --- Labels for major components ---
-    fig2.add_trace(go.Scatter3d(
-        x=[0], y=[0], z=[3.4],
-        mode='text',
-        text=["Fan Blades"],
-        textposition="top center",
-        textfont=dict(color="blue", size=14),
-        showlegend=False
-    ))
-
-    fig2.add_trace(go.Scatter3d(
-        x=[0], y=[0], z=[0.2],
-        mode='text',
-        text=["Rotor"],
-        textposition="bottom center",
-        textfont=dict(color="black", size=14),
-        showlegend=False
-    ))
-
-    fig2.add_trace(go.Scatter3d(
-        x=[1.2], y=[0], z=[1.5],
-        mode='text',
-        text=["Coils"],
-        textfont=dict(color="goldenrod", size=14),
-        showlegend=False
-    ))
-
-    fig2.add_trace(go.Scatter3d(
-        x=[0], y=[0], z=[1.5],
-        mode='text',
-        text=["Glow / Fault"],
-        textfont=dict(color="red" if fault else "green", size=14),
-        showlegend=False
-    ))
-
-    # --- Static Bearings (front and back)
-    bearing_radius = 0.4
-    bearing_zs = [0.1, 2.9]
-    bearing_segments = 30
-    angles = np.linspace(0, 2 * np.pi, bearing_segments)
-
-    for z in bearing_zs:
-        x_circle = bearing_radius * np.cos(angles)
-        y_circle = bearing_radius * np.sin(angles)
-        z_circle = [z] * bearing_segments
-        fig2.add_trace(go.Scatter3d(
-            x=x_circle,
-            y=y_circle,
-            z=z_circle,
-            mode='lines',
-            line=dict(color='darkgray', width=3),
-            name='Bearing'
-        ))
-
-    # --- Live Text Labels (RPM, Time, Fault Status) ---
-    info_labels = [
-        f"RPM: {rpm:.0f}",
-        f"Time: {int(time_s)} s",
-        f"Fault: {'Yes' if fault else 'No'}"
+        motor.append(dict(type="scatter3d", x=[0, round(blade_radius * np.cos(angle_rad), DECIMALS)],
+                          y=[0, round(blade_radius * np.sin(angle_rad), DECIMALS)], z=[3.2, 3.2], mode='lines',
+                          line=dict(color='blue', width=4), name='Fan Blade'))
+    motor += [
+        motor_dynamic[10],
+        motor_dynamic[11],
+        # Labels for major components
+        _text(0, 0, 3.4, "Fan Blades", "blue", textposition="top center"),
+        _text(0, 0, 0.2, "Rotor", "black", textposition="bottom center"),
+        _text(1.2, 0, 1.5, "Coils", "goldenrod"),
+        motor_dynamic[15],
     ]
-
-    info_positions_z = [3.6, 3.4, 3.2]
-    info_colors = ['blue', 'black', 'red' if fault else 'green']
-
-    for text, z_pos, color in zip(info_labels, info_positions_z, info_colors):
-        fig2.add_trace(go.Scatter3d(
-            x=[-2],  # offset left of motor
-            y=[0],
-            z=[z_pos],
-            mode='text',
-            text=[text],
-            textfont=dict(size=14, color=color),
-            showlegend=False
-        ))
-
+    # Static bearings (front and back)
+    bearing_radius = 0.4
+    angles = np.linspace(0, 2 * np.pi, 30)
+    for z in (0.1, 2.9):
+        motor.append(dict(type="scatter3d", x=np.round(bearing_radius * np.cos(angles), DECIMALS).tolist(),
+                          y=np.round(bearing_radius * np.sin(angles), DECIMALS).tolist(), z=[z] * len(angles),
+                          mode='lines', line=dict(color='darkgray', width=3), name='Bearing'))
+    motor += [motor_dynamic[i] for i in (18, 19, 20)]
+
+    fig2 = go.Figure(data=motor)
     fig2.update_layout(
         title="🧿 Realistic Motor View",
+        template=LAYOUT_TEMPLATE,
         scene=dict(
             xaxis=dict(visible=False),
             yaxis=dict(visible=False),
@@ -246,13 +154,96 @@ def render_motor_3d_view(df):
         margin=dict(l=0, r=0, t=30, b=0),
         showlegend=False
     )
+    return fig1.to_dict(), fig2.to_dict()
+
 
+def _figure(spec, dynamic, title=None, frames=None, layout=None):
+    """A Figure sharing ``spec``'s static traces, with ``dynamic`` traces swapped in (no re-validation)."""
+    import plotly.graph_objects as go
+
+    data = list(spec["data"])
+    for index, trace in dynamic.items():
+        data[index] = trace
+    layout = {**spec["layout"], **(layout or {})}
+    if title is not None:
+        layout["title"] = {"text": title}
+    figure = {"data": data, "layout": layout}
+    if frames is not None:
+        figure["frames"] = frames
+    return go.Figure(figure, _validate=False)
+
+
+def build_motor_figures(df):
+    """Digital-twin and realistic-motor figures for the latest row of ``df`` (no Streamlit needed)."""
+    twin, motor = static_figures()
+    state = motor_state(df.iloc[-1])
+    return (_figure(twin, twin_dynamic_traces(state), twin_title(state)),
+            _figure(motor, motor_dynamic_traces(state)))
+
+
+def _frame_trace(trace):
+    """Only what changes between readings; frame data is merged into the existing trace."""
+    return {k: v for k, v in trace.items() if k not in ("mode", "name", "showlegend", "textposition")}
+
+
+def _animation_layout(frame_ms, names):
+    """Play/pause buttons and a time slider driving the frames client-side."""
+    step = dict(frame=dict(duration=frame_ms, redraw=True), transition=dict(duration=0), mode="immediate")
+    return {
+        "updatemenus": [dict(type="buttons", direction="left", x=0.02, y=0.02, xanchor="left", yanchor="bottom",
+                             buttons=[dict(label="▶", method="animate", args=[None, {**step, "fromcurrent": True}]),
+                                      dict(label="⏸", method="animate", args=[[None], step])])],
+        "sliders": [dict(active=len(names) - 1, x=0.15, y=0.02, len=0.8, pad=dict(t=0), currentvalue=dict(visible=False),
+                         steps=[dict(label=name, method="animate", args=[[name], step]) for name in names])],
+    }
+
+
+def build_motor_animation(df, n_frames=30, playback_speed=1.0):
+    """Both figures with one Plotly frame per row of the last ``n_frames`` rows of ``df``.
+
+    The browser plays the frames at the data's own pace (divided by
+    ``playback_speed``), so the shaft turns without a server round trip per
+    reading. Frames only carry the dynamic traces; the figures open on the
+    latest row.
+    """
+    twin, motor = static_figures()
+    rows = df.iloc[-n_frames:]
+    states = [motor_state(row) for _, row in rows.iterrows()]
+    names = [f"{int(state['time_s'])} s" for state in states]
+    times = rows['Time (s)'].to_numpy(dtype=np.float64)
+    interval = float(np.median(np.diff(times))) if len(times) > 1 else 1.0
+    frame_ms = max(int(1000 * interval / playback_speed), 20)
+    layout = _animation_layout(frame_ms, names)
+
+    twin_frames, motor_frames = [], []
+    for name, state in zip(names, states):
+        dynamic = twin_dynamic_traces(state)
+        twin_frames.append(dict(name=name, data=[_frame_trace(dynamic[i]) for i in TWIN_DYNAMIC],
+                                traces=list(TWIN_DYNAMIC),
+                                layout={"title": {"text": twin_title(state)}}))
+        dynamic = motor_dynamic_traces(state)
+        motor_frames.append(dict(name=name, data=[_frame_trace(dynamic[i]) for i in MOTOR_DYNAMIC],
+                                 traces=list(MOTOR_DYNAMIC)))
+    latest = states[-1]
+    return (_figure(twin, twin_dynamic_traces(latest), twin_title(latest), twin_frames, layout),
+            _figure(motor, motor_dynamic_traces(latest), frames=motor_frames, layout=layout))
+
+
+def render_motor_3d_view(df, animate=False, n_frames=30, figures=None):
+    """Both figures side by side; ``figures`` may hold prebuilt ``build_motor_figures(df)`` output."""
+    import streamlit as st
 
+    if animate:
+        fig1, fig2 = build_motor_animation(df, n_frames)
+    else:
+        fig1, fig2 = figures if figures is not None else build_motor_figures(df)
     col1, col2 = st.columns(2)
     with col1:
         st.plotly_chart(fig1, use_container_width=True)
     with col2:
         st.plotly_chart(fig2, use_container_width=True)
 
-    st.caption("🔁 This motor updates live every second based on real-time sensor data.")
-
+    if animate:
+        st.caption(f"▶ Plays the last {min(n_frames, len(df))} readings in the browser.")
+    else:
+        st.caption("🔁 This motor updates live every second based on real-time sensor data.")
@@ -0,0 +1,175 @@
+"""Bounded-memory training samples from telemetry too large to load at once.
+
+The data is read in chunks (slices of a telemetry store, or ``pd.read_csv``
+with ``chunksize``) and folded into fixed-size reservoirs, so peak memory
+follows the ``memory_mb`` budget instead of the length of the history. The
+fault model trains on a class-stratified sample that keeps rare ``Fault``
+rows, weighted back to the stream's class mix; the anomaly model on a
+uniform sample.
+"""
+import numpy as np
+import pandas as pd
+
+from telemetry_store import TelemetryStore, store_path_for
+
+# Bytes per kept row on top of its float32 features: label, sample weight and
+# the per-row arrays the forest builder allocates while fitting.
+ROW_OVERHEAD_BYTES = 64
+# Share of the budget for the chunk being read; the rest holds the samples
+READ_SHARE = 0.25
+MIN_ROWS = 1000
+
+
+def iter_chunks(path, columns=None, chunk_rows=100_000):
+    """DataFrames of up to ``chunk_rows`` rows, preferring a converted binary store over the CSV."""
+    store_path = store_path_for(path)
+    if store_path is not None:
+        store = TelemetryStore(store_path)
+        for start in range(0, store.n_rows, chunk_rows):
+            yield store.read(start, start + chunk_rows, columns)
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_rows)
+
+
+def count_rows(path):
+    """Data rows in ``path``: the store's row count, or the CSV's lines after the header counted in blocks."""
+    store_path = store_path_for(path)
+    if store_path is not None:
+        return TelemetryStore(store_path).n_rows
+    lines, last = 0, b"\n"
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(2 ** 20), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    return max(lines + (last != b"\n") - 1, 0)  # an unterminated last line still counts; the header does not
+
+
+def budget_rows(memory_mb, n_features):
+    """Rows to read per chunk and rows to keep in total for a budget of ``memory_mb`` MiB."""
+    budget = memory_mb * 2 ** 20
+    read_rows = int(budget * READ_SHARE / (8 * (n_features + 2)))  # float64 chunk plus index and label
+    keep_rows = int(budget * (1 - READ_SHARE) / (4 * n_features + ROW_OVERHEAD_BYTES))
+    return max(read_rows, MIN_ROWS), max(keep_rows, MIN_ROWS)
+
+
+class Reservoir:
+    """Uniform sample of up to ``capacity`` rows of a stream (Algorithm R, vectorized per chunk)."""
+
+    def __init__(self, capacity, n_columns, dtype=np.float32, rng=None):
+        self.capacity = capacity
+        self.values = np.empty((capacity, n_columns), dtype=dtype)
+        self.n_seen = 0
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    @property
+    def n_kept(self):
+        return min(self.n_seen, self.capacity)
+
+    def add(self, rows):
+        rows = np.asarray(rows).reshape(-1, self.values.shape[1])
+        fill = max(0, min(self.capacity - self.n_seen, len(rows)))
+        self.values[self.n_seen:self.n_seen + fill] = rows[:fill]
+        if fill < len(rows):
+            # Row number i of the stream replaces a random slot with probability capacity / (i + 1);
+            # when two rows of a chunk pick the same slot the later one wins, as in the sequential loop
+            position = self.n_seen + np.arange(fill, len(rows))
+            slots = (self.rng.random(len(position)) * (position + 1)).astype(np.int64)
+            keep = slots < self.capacity
+            self.values[slots[keep]] = rows[fill:][keep]
+        self.n_seen += len(rows)
+
+    def sample(self):
+        return self.values[:self.n_kept]
+
+
+class StratifiedReservoir:
+    """One reservoir per class, so rare classes are kept in full up to their share of ``capacity``.
+
+    ``sample`` returns weights ``seen / kept`` per class: weighted, the sample
+    has the class mix of the whole stream.
+    """
+
+    def __init__(self, capacity, n_columns, classes=(0, 1), rng=None):
+        rng = rng if rng is not None else np.random.default_rng()
+        self.reservoirs = {c: Reservoir(capacity // len(classes), n_columns, rng=rng) for c in classes}
+
+    def add(self, X, y):
+        unknown = ~np.isin(y, list(self.reservoirs))
+        if unknown.any():
+            raise ValueError(f"labels {sorted(set(np.asarray(y)[unknown]))} are not in {list(self.reservoirs)}")
+        for label, reservoir in self.reservoirs.items():
+            reservoir.add(X[y == label])
+
+    def sample(self):
+        parts = [(r.sample(), label, r.n_seen / r.n_kept) for label, r in self.reservoirs.items() if r.n_kept]
+        X = np.concatenate([p[0] for p in parts])
+        y = np.concatenate([np.full(len(p[0]), p[1]) for p in parts])
+        weights = np.concatenate([np.full(len(p[0]), p[2]) for p in parts])
+        return X, y, weights
+
+    @property
+    def n_seen(self):
+        return {label: r.n_seen for label, r in self.reservoirs.items()}
+
+
+def sample_training_data(path, feature_columns, label_column='Fault', memory_mb=512, chunk_rows=None,
+                         test_size=0.2, feature_engine=None, random_state=42):
+    """One pass over ``path``: a stratified, weighted training sample and a uniform test sample.
+
+    Each row is held out for testing with probability ``test_size``. With a
+    ``feature_engine`` its rolling features are computed across chunks in file
+    order, so the file must already be time-ordered, and the test rows are the
+    last ``test_size`` of the stream instead: overlapping windows would
+    otherwise put near-copies of every test row in the training sample (as
+    ``split_data`` does with ``shuffle=False``). That needs the row count up
+    front, an extra counting pass over a CSV. Returns ``X_train, X_test,
+    y_train, y_test, w_train, info``.
+    """
+    names = list(feature_columns) + (feature_engine.feature_names if feature_engine is not None else [])
+    read_rows, keep_rows = budget_rows(memory_mb, len(names))
+    chunk_rows = chunk_rows or read_rows
+    rng = np.random.default_rng(random_state)
+    train_capacity = int(keep_rows * (1 - test_size))
+    train = StratifiedReservoir(train_capacity, len(names), rng=rng)
+    test = Reservoir(keep_rows - train_capacity, len(names) + 1, rng=rng)  # features and label
+
+    columns = list(dict.fromkeys([*feature_columns, *(feature_engine.columns if feature_engine else []),
+                                  label_column]))
+    test_start = None
+    if feature_engine is not None:
+        n_rows = count_rows(path)
+        test_start = n_rows - int(np.ceil(n_rows * test_size))
+    position = 0
+    for chunk in iter_chunks(path, columns, chunk_rows):
+        X = chunk[list(feature_columns)].to_numpy(dtype=np.float32)
+        if feature_engine is not None:
+            rolling = feature_engine.update_many(chunk[feature_engine.columns].to_numpy())
+            X = np.hstack([X, rolling.astype(np.float32)])
+        y = chunk[label_column].to_numpy()
+        if test_start is None:
+            held_out = rng.random(len(y)) < test_size
+        else:
+            held_out = position + np.arange(len(y)) >= test_start
+        position += len(y)
+        train.add(X[~held_out], y[~held_out])
+        test.add(np.column_stack([X[held_out], y[held_out]]))
+
+    X_train, y_train, w_train = train.sample()
+    held = test.sample()
+    info = {"rows_seen": int(sum(train.n_seen.values()) + test.n_seen),
+            "rows_per_class_seen": {str(k): int(v) for k, v in train.n_seen.items()},
+            "train_rows": len(y_train), "test_rows": len(held), "chunk_rows": chunk_rows,
+            "holdout": "random" if test_start is None else "tail",
+            "memory_budget_mb": memory_mb}
+    return (pd.DataFrame(X_train, columns=names), pd.DataFrame(held[:, :-1], columns=names),
+            pd.Series(y_train, name=label_column), pd.Series(held[:, -1].astype(y_train.dtype), name=label_column),
+            w_train, info)
+
+
+def sample_rows(path, columns, memory_mb=512, chunk_rows=None, random_state=42):
+    """A uniform sample of ``columns`` from one pass over ``path``, sized to ``memory_mb``."""
+    read_rows, keep_rows = budget_rows(memory_mb, len(columns))
+    reservoir = Reservoir(keep_rows, len(columns), rng=np.random.default_rng(random_state))
+    for chunk in iter_chunks(path, list(columns), chunk_rows or read_rows):
+        reservoir.add(chunk[list(columns)].to_numpy(dtype=np.float32))
+    return pd.DataFrame(reservoir.sample(), columns=list(columns)), reservoir.n_seen
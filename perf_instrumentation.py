@@ -0,0 +1,135 @@
+import collections
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+# Shared no-op span handed out while instrumentation is off
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class _Span:
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timer.record(self.name, time.perf_counter() - self.start)
+
+
+class StageTimer:
+    """Rolling wall-time statistics per named stage of a dashboard rerun.
+
+    ``span(name)`` times a block and ``timed(name)`` a function; each stage
+    keeps its last ``window`` durations for p50/p95/p99. When ``enabled`` is
+    False, spans are a shared ``nullcontext`` and ``record`` returns at once.
+    ``export`` writes the stats as Prometheus text (``*.prom``) or JSON.
+    """
+
+    def __init__(self, enabled=True, window=500, export_path=None, export_interval=5.0):
+        self.enabled = enabled
+        self.window = window
+        self.export_path = export_path
+        self.export_interval = export_interval
+        self._samples = {}
+        self._counts = collections.Counter()
+        self._totals = collections.Counter()
+        self._last_export = 0.0
+        self._lock = threading.Lock()
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def timed(self, name=None):
+        def decorator(func):
+            stage = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = collections.deque(maxlen=self.window)
+            samples.append(seconds)
+            self._counts[name] += 1
+            self._totals[name] += seconds
+
+    def summary(self):
+        """One row per stage: count, last and rolling percentiles in milliseconds."""
+        with self._lock:
+            snapshot = {name: (np.array(samples), self._counts[name], self._totals[name])
+                        for name, samples in self._samples.items()}
+        rows = []
+        for name, (samples, count, total) in snapshot.items():
+            row = {"stage": name, "count": count, "last_ms": samples[-1] * 1e3}
+            for q, value in zip(PERCENTILES, np.percentile(samples, PERCENTILES)):
+                row[f"p{q}_ms"] = value * 1e3
+            row["total_s"] = total
+            rows.append(row)
+        return rows
+
+    def to_prometheus(self, prefix="dcmotor_stage"):
+        lines = [f"# HELP {prefix}_seconds Rolling wall time per dashboard stage.",
+                 f"# TYPE {prefix}_seconds summary"]
+        for row in self.summary():
+            for q in PERCENTILES:
+                lines.append(f'{prefix}_seconds{{stage="{row["stage"]}",quantile="{q / 100}"}} '
+                             f'{row[f"p{q}_ms"] / 1e3:.6f}')
+            lines.append(f'{prefix}_seconds_sum{{stage="{row["stage"]}"}} {row["total_s"]:.6f}')
+            lines.append(f'{prefix}_seconds_count{{stage="{row["stage"]}"}} {row["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path=None, force=False):
+        """Write the stats to ``path`` atomically, at most once per ``export_interval`` unless forced."""
+        path = path or self.export_path
+        if not self.enabled or path is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_export < self.export_interval:
+            return
+        self._last_export = now
+        if path.endswith(".json"):
+            text = json.dumps({"updated": time.time(), "stages": self.summary()}, indent=2)
+        else:
+            text = self.to_prometheus()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)  # scrapers never see a half-written file
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._totals.clear()
+
+
+def timer_from_env():
+    """StageTimer configured by DCMOTOR_PERF=1 and DCMOTOR_PERF_EXPORT (``.prom`` or ``.json`` path)."""
+    enabled = os.environ.get("DCMOTOR_PERF", "").lower() in ("1", "true", "yes", "on")
+    return StageTimer(enabled=enabled,
+                      export_path=os.environ.get("DCMOTOR_PERF_EXPORT", "perf_metrics.prom"))
@@ -0,0 +1,44 @@
+import numpy as np
+
+DEFAULT_DPI = 100
+
+
+def pixel_budget(width_inches, dpi=DEFAULT_DPI):
+    """Number of horizontal pixels a matplotlib axis of this width is rasterized to."""
+    return int(width_inches * dpi)
+
+
+def _bucket_layout(n, n_buckets):
+    size = int(np.ceil(n / n_buckets))
+    return size, int(np.ceil(n / size))
+
+
+def minmax_indices(y, n_points):
+    """Indices of the min and max sample in each of ``n_points // 2`` equal buckets.
+
+    Keeps every spike visible at the cost of two points per bucket; the result
+    is sorted so the decimated series still plots left to right.
+    """
+    n = len(y)
+    if n <= n_points:
+        return np.arange(n)
+    size, n_buckets = _bucket_layout(n, max(n_points // 2, 1))
+    padded = np.empty(size * n_buckets, dtype=np.float64)
+    padded[:n] = y
+    padded[n:] = np.inf
+    lo = np.argmin(padded.reshape(n_buckets, size), axis=1)
+    padded[n:] = -np.inf
+    hi = np.argmax(padded.reshape(n_buckets, size), axis=1)
+    offsets = np.arange(n_buckets) * size
+    return np.unique(np.concatenate([offsets + lo, offsets + hi]))
+
+
+def flagged_indices(flags, n_points):
+    """At most one flagged sample per pixel bucket, so fault markers stay visible but bounded."""
+    flagged = np.flatnonzero(np.asarray(flags) == 1)
+    n = len(flags)
+    if len(flagged) <= n_points or n == 0:
+        return flagged
+    size, _ = _bucket_layout(n, n_points)
+    _, first = np.unique(flagged // size, return_index=True)
+    return flagged[first]
@@ -0,0 +1,116 @@
+"""Fault label, probability and RUL precomputed over the manual-simulation slider grids.
+
+The simulation sliders only take values on a grid (start, stop, step per
+input), so every answer the fault model can give them is scored in one batch
+when the model loads and kept as a 3-D lattice: uint8 labels, float16 fault
+probabilities and uint8 heuristic RUL percentages. A slider move is then an
+array lookup instead of a forest traversal.
+
+Lattices are saved next to the models as ``model/prediction_lattice-<grid>-<model>.npz``,
+keyed by a hash of the grid and the fault model's sha256, so a retrained
+model is never served from a stale file; saving one removes the files left
+by earlier models for the same grid.
+"""
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from model_registry import MODEL_DIR
+from rul_estimator import heuristic_rul
+
+
+def _axes(axes):
+    return tuple(tuple(float(v) for v in axis) for axis in axes)
+
+
+def grid_key(axes):
+    """Short stable hash of ``((start, stop, step), ...)``."""
+    text = json.dumps(_axes(axes))
+    return hashlib.sha256(text.encode()).hexdigest()[:12]
+
+
+def lattice_path(axes, model_sha256, directory=MODEL_DIR):
+    return os.path.join(directory, f"prediction_lattice-{grid_key(axes)}-{model_sha256[:12]}.npz")
+
+
+class PredictionLattice:
+    """Model outputs at every point of a regular grid over the model's input features.
+
+    ``axes`` holds one ``(start, stop, step)`` per feature, in the model's
+    feature order; ``lookup`` rounds each value to its nearest grid index.
+    """
+
+    def __init__(self, axes, labels, probability, rul, model_sha256=None):
+        self.axes = _axes(axes)
+        self.labels = labels
+        self.probability = probability
+        self.rul = rul
+        self.model_sha256 = model_sha256
+
+    @staticmethod
+    def points(axes):
+        """Grid values per axis; ``linspace`` so the end points are exact."""
+        return [np.linspace(start, stop, int(round((stop - start) / step)) + 1) for start, stop, step in axes]
+
+    @classmethod
+    def build(cls, model, axes, model_sha256=None):
+        """Score every grid point with ``model`` (anything with ``predict_with_proba``) in one batch."""
+        values = cls.points(axes)
+        shape = tuple(len(v) for v in values)
+        grid = np.stack([g.ravel() for g in np.meshgrid(*values, indexing="ij")], axis=1)
+        labels, proba = model.predict_with_proba(grid)
+        fault_proba = proba[:, 1]
+        return cls(axes, labels.astype(np.uint8).reshape(shape), fault_proba.astype(np.float16).reshape(shape),
+                   heuristic_rul(fault_proba).astype(np.uint8).reshape(shape), model_sha256)
+
+    @property
+    def nbytes(self):
+        return self.labels.nbytes + self.probability.nbytes + self.rul.nbytes
+
+    def index(self, values):
+        """Grid index of ``values``; ValueError if a value is outside its axis."""
+        position = tuple(round((value - start) / step) for value, (start, _, step) in zip(values, self.axes))
+        if any(not 0 <= i < n for i, n in zip(position, self.labels.shape)):
+            raise ValueError(f"{list(values)} is outside the lattice {self.axes}")
+        return position
+
+    def lookup(self, values):
+        """``(label, fault probability, RUL %)`` at the grid point nearest to ``values``."""
+        i = self.index(values)
+        return int(self.labels[i]), float(self.probability[i]), int(self.rul[i])
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, axes=np.array(self.axes), labels=self.labels, probability=self.probability,
+                                rul=self.rul, model_sha256=np.array(self.model_sha256 or ""))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            return cls(f["axes"].tolist(), f["labels"], f["probability"], f["rul"], str(f["model_sha256"]) or None)
+
+    @classmethod
+    def load_or_build(cls, model, axes, model_sha256, directory=MODEL_DIR):
+        """The saved lattice for this grid and model hash, or a freshly built (and saved) one."""
+        path = lattice_path(axes, model_sha256, directory)
+        if os.path.exists(path):
+            try:
+                lattice = cls.load(path)
+                if lattice.model_sha256 == model_sha256 and lattice.axes == _axes(axes):
+                    return lattice
+            except (OSError, ValueError, KeyError):
+                pass  # unreadable or partial file: rebuild it
+        lattice = cls.build(model, axes, model_sha256)
+        try:
+            lattice.save(path)
+            for stale in glob.glob(os.path.join(directory, f"prediction_lattice-{grid_key(axes)}-*.npz")):
+                if stale != path:
+                    os.remove(stale)
+        except OSError:
+            pass  # read-only model directory: keep the lattice in memory only
+        return lattice
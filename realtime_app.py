@@ -1,10 +1,23 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import joblib
+import numpy as np
+from matplotlib.figure import Figure
+import io
 import time
 import os
 from motor_3d_view import render_motor_3d_view
+from csv_tail_reader import CsvTailReader
+from data_watch import DataWatch
+from telemetry_store import StoreTailReader, store_path_for, telemetry_exists
+from scoring_worker import ScoringWorker
+from fast_forest import FlatForest
+from model_registry import get_registry
+from prediction_lattice import PredictionLattice
+from plot_decimation import flagged_indices, minmax_indices, pixel_budget
+from rul_estimator import format_seconds
+from perf_instrumentation import timer_from_env
+from streaming_anomaly import HalfSpaceTrees
+from rolling_features import RollingFeatureModel
 
 st.set_page_config(layout="wide")
 
@@ -39,26 +52,53 @@ else:
     st.success(f"✅ Welcome, {name}!")
 
 
+# --- Per-stage timing of each rerun (enable with DCMOTOR_PERF=1; a no-op otherwise) ---
+@st.cache_resource
+def get_stage_timer():
+    return timer_from_env()
 
 
+perf = get_stage_timer()
+rerun_start = time.perf_counter()
+
+
+
+
+# Models come from the process-wide registry: loaded once, swapped only when the file changes
+registry = get_registry()
+
 # --- Load model ---
-model_path = "dc_motor_fault_model.pkl"
-if not os.path.exists(model_path):
+model = registry.get("fault_model")
+if model is None:
     st.error("Model file not found.")
     st.stop()
-model = joblib.load(model_path)
 
-# --- Load anomaly detection model ---
-anomaly_model_path = "iso_forest_model.pkl"
-if not os.path.exists(anomaly_model_path):
-    st.warning("Anomaly model not found. Skipping anomaly detection.")
-    anomaly_model = None
-else:
-    anomaly_model = joblib.load(anomaly_model_path)
+# Simulation sliders as (min, max, step) per model input; every grid point is scored once per model
+SIM_GRID = ((10.0, 14.0, 0.1), (0.0, 5.0, 0.1), (1000, 1600, 50))
+sim_lattice = registry.derived(
+    "fault_model", ("prediction_lattice", SIM_GRID),
+    # Built from the entry's own model and saved under that same entry's hash
+    lambda entry: PredictionLattice.load_or_build(FlatForest.from_sklearn(entry.model), SIM_GRID, entry.sha256),
+    pass_entry=True)
+
+# --- Load anomaly detection model (offline IsolationForest, or online half-space trees) ---
+ONLINE_DETECTOR = "Half-space trees (online)"
+anomaly_mode = st.sidebar.radio("Anomaly detector", ["Isolation Forest (offline)", ONLINE_DETECTOR])
+anomaly_model = None
+if anomaly_mode != ONLINE_DETECTOR:
+    anomaly_model = registry.get("anomaly_model")
+    if anomaly_model is None:
+        st.warning("Anomaly model not found. Skipping anomaly detection.")
+
+# --- Fault model inputs: raw sensors, or rolling features if train_model.py --features rolling ran ---
+ROLLING_FEATURES = "Rolling features"
+fault_features = "Raw sensors"
+if registry.resolve("rolling_fault_model") is not None:
+    fault_features = st.sidebar.radio("Fault model inputs", ["Raw sensors", ROLLING_FEATURES])
 
 # --- Load real-time data ---
 csv_path = "realtime_dc_motor_data.csv"
-if not os.path.exists(csv_path):
+if not telemetry_exists(csv_path):
     st.warning("⏳ Waiting for real-time data file to be generated...")
     st.stop()
 
@@ -67,7 +107,90 @@ if "auto_refresh" not in st.session_state:
     st.session_state.auto_refresh = True
 
 
-data = pd.read_csv(csv_path)
+# One reader per process: reruns and sessions only parse rows appended since the last read.
+# A binary store written next to the CSV (realtime_dc_motor_data.dcts) is read without parsing.
+@st.cache_resource
+def get_csv_reader(path):
+    store_path = store_path_for(path)
+    return StoreTailReader(store_path) if store_path else CsvTailReader(path)
+
+
+# One watch per process polls the file (or store) for appended rows and wakes the scoring worker
+@st.cache_resource
+def get_data_watch(path):
+    return DataWatch(store_path_for(path) or path).start()
+
+
+# --- Charts are rendered once per data update by the scoring worker, not once per session ---
+PLOT_POINTS = pixel_budget(6)  # decimated to the pixels they are drawn into (6 in wide at 100 dpi)
+SENSOR_PLOTS = [('Voltage (V)', 'blue'), ('Current (A)', 'orange'), ('RPM', 'green')]
+
+
+def figure_png(fig):
+    # Same output as st.pyplot, so sessions only send the bytes
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")
+    return buf.getvalue()
+
+
+def render_charts(data, intervals):
+    plot_times = data['Time (s)'].to_numpy()
+    sample_step = float(np.median(np.diff(plot_times[-100:]))) if len(plot_times) > 1 else 1.0
+    charts = {}
+    for kind in ("Fault", "Anomaly"):
+        # Green for the whole run, one red rectangle per interval of consecutive flagged rows
+        fig_bar = Figure(figsize=(6, 0.6))
+        ax_bar = fig_bar.subplots()
+        ax_bar.broken_barh([(plot_times[0], plot_times[-1] - plot_times[0] + sample_step)], (0, 1), color='green')
+        ax_bar.broken_barh(intervals.xranges(kind, sample_step), (0, 1), color='red')
+        ax_bar.set_xlim(plot_times[0], plot_times[-1] + sample_step)
+        ax_bar.set_ylim(0, 1)
+        ax_bar.set_yticks([])
+        ax_bar.set_xlabel("Time (s)")
+        charts[kind] = figure_png(fig_bar)
+
+    fault_idx = flagged_indices(data['Predicted Fault'].to_numpy(), PLOT_POINTS)
+    for col, color in SENSOR_PLOTS:
+        values = data[col].to_numpy()
+        idx = minmax_indices(values, PLOT_POINTS)
+        fig = Figure(figsize=(6, 2))
+        ax = fig.subplots()
+        ax.plot(plot_times[idx], values[idx], color=color, label=col)
+        ax.scatter(plot_times[fault_idx], values[fault_idx],
+                   color='red', label='Fault Detected', s=20)
+        ax.legend()
+        charts[col] = figure_png(fig)
+    return charts
+
+
+# --- One scoring worker per process and model choice: it reads, scores, applies the rules and
+# renders each data update once, and every session just reads the snapshot it publishes ---
+@st.cache_resource(max_entries=4, on_release=ScoringWorker.close)
+def get_scoring_worker(path, anomaly_mode, fault_features, fault_sha256, anomaly_sha256):
+    def make_models(generation):
+        # Online detectors and rolling features keep per-source state: fresh ones for each new source
+        fault_model = model
+        if fault_features == ROLLING_FEATURES:
+            fault_model = RollingFeatureModel(registry.get("rolling_fault_model"))
+        if anomaly_mode == ONLINE_DETECTOR:
+            return fault_model, HalfSpaceTrees(seed=0)
+        return fault_model, anomaly_model
+
+    return ScoringWorker(get_csv_reader(path), get_data_watch(path), make_models,
+                         render=render_charts, timer=perf)
+
+
+fault_sha = registry.entry("rolling_fault_model" if fault_features == ROLLING_FEATURES else "fault_model").sha256
+anomaly_sha = registry.entry("anomaly_model").sha256 if anomaly_mode != ONLINE_DETECTOR and anomaly_model is not None else None
+scoring_worker = get_scoring_worker(csv_path, anomaly_mode, fault_features, fault_sha, anomaly_sha)
+snapshot = scoring_worker.snapshot()
+st.session_state.data_version = snapshot["version"]
+data = snapshot["data"]  # shared by every session: read-only
+if data.empty:
+    st.warning("⏳ Waiting for real-time data to be written...")
+    st.stop()
+if scoring_worker.last_error:
+    st.sidebar.error("⚠️ The scoring worker failed on the latest data; showing the previous update.")
 
 
 if len(data) >= MAX_SAMPLES:
@@ -76,48 +199,38 @@ if len(data) >= MAX_SAMPLES:
                        "Please find the classification reports at the bottom")
 
 # Load accuracy metric dynamically
-import json
-
-accuracy_display = None
-metrics_path = "model/metrics.json"
-if os.path.exists(metrics_path):
-    with open(metrics_path, "r") as f:
-        metrics = json.load(f)
-        accuracy_display = metrics.get("accuracy")
-
-# --- Run anomaly detection if model is available ---
-if anomaly_model:
-    anomaly_features = data[['Voltage (V)', 'Current (A)', 'RPM']]
-    data['Anomaly'] = anomaly_model.predict(anomaly_features)
-    data['Anomaly'] = data['Anomaly'].map({1: 0, -1: 1})  # 1 = normal, -1 = anomaly -> convert to 1 = anomaly
-else:
-    data['Anomaly'] = 0
-
-AUTO_REFRESH_INTERVAL = 5 #seconds
-
-# --- Self-healing logic ---
-def suggest_action(row):
-    suggestions = []
-
-    if row["Current (A)"] > 2.5:
-        suggestions.append("⚠️ High current: Reduce motor load or check for blockage.")
-    if row["RPM"] < 1150:
-        suggestions.append("⚠️ Low RPM: Inspect motor for wear or shaft issues.")
-    if row["Voltage (V)"] > 12.2 and row["Current (A)"] > 2.0:
-        suggestions.append("⚠️ Voltage-Current stress: Evaluate power supply or motor resistance.")
-    if row["Anomaly"] == 1:
-        suggestions.append("🚨 Anomaly detected: Review recent operational changes.")
-
-    if not suggestions:
-        return "✅ System appears stable."
-    return " | ".join(suggestions)
+metrics = registry.metadata()
+accuracy_display = metrics.get("accuracy")
+if metrics.get("matches_model") is False:
+    st.sidebar.warning("⚠️ model/metrics.json was written for a different fault model file.")
+with st.sidebar.expander("🧩 Loaded models"):
+    st.dataframe(pd.DataFrame(registry.status()), hide_index=True)
 
 
 # --- Auto-refresh ---
 st.sidebar.markdown("### 🔄 Auto-Refresh Settings")
 auto_refresh = st.sidebar.checkbox("Enable Auto-Refresh", value=st.session_state.auto_refresh)
 st.session_state.auto_refresh = auto_refresh  # Keep it in sync
-refresh_interval = 20  # or 5 or 10 as you prefer
+WATCH_INTERVAL = 1.0  # seconds between this session's checks of the scoring worker
+
+
+# Cheap check on a timer; the whole app reruns only when the worker has published a newer snapshot.
+# A full rerun rather than per-section fragments on purpose: every section below reads the same
+# snapshot and must show one consistent version, and a rerun only emits elements from it (the
+# scoring, rules and chart rendering happen once in the worker). The slider and 3D-toggle
+# fragments still rerun on their own for user input.
+@st.fragment(run_every=WATCH_INTERVAL if auto_refresh else None)
+def watch_for_new_data():
+    if scoring_worker.version != st.session_state.data_version:
+        st.rerun()
+    data_watch = get_data_watch(csv_path)
+    if data_watch.last_error:
+        st.warning("⚠️ Checking the data file for new rows failed; retrying.")
+    st.caption(f"📡 {data_watch.per_minute()} data updates in the last minute")
+
+
+with st.sidebar:
+    watch_for_new_data()
 
 # --- Title ---
 st.title("🧠 DC Motor Digital Twin Dashboard")
@@ -130,134 +243,81 @@ elapsed_time = int(data['Time (s)'].iloc[-1])
 st.markdown(f"⏱️ **Elapsed Time:** `{elapsed_time}` seconds")
 
 
-# --- Non-blocking auto-refresh spinner ---
+# --- Live indicator (reruns come from the data watch, not from a timer) ---
 if auto_refresh:
-    refresh_placeholder = st.empty()
-    countdown_seconds = refresh_interval
-
-    if 'last_refresh_time' not in st.session_state:
-        st.session_state.last_refresh_time = time.time()
+    st.markdown("""
+        <div style="display: flex; align-items: center;">
+            <div style="height: 12px; width: 12px; background-color: red; border-radius: 50%; 
+                        animation: blink 1s infinite;"></div>
+            <span style="margin-left: 10px; color: red; font-weight: bold;">Live update</span>
+        </div>
+        <style>
+        @keyframes blink {
+            0%   { opacity: 1; }
+            50%  { opacity: 0; }
+            100% { opacity: 1; }
+        }
+        </style>
+    """, unsafe_allow_html=True)
+
+# --- Predictions, RUL and rule outputs all come from the worker's snapshot ---
+dynamic_accuracy = snapshot["accuracy"]
+trend_rul = snapshot["trend_rul"]
+anomaly_rul_estimate = snapshot["anomaly_rul"]
+
+# --- Sidebar Input Sliders for Simulation (a fragment: moving a slider reruns only this) ---
+@st.fragment
+def manual_simulation():
+    st.header("Manual Input Simulation")
+    (v_min, v_max, v_step), (c_min, c_max, c_step), (r_min, r_max, r_step) = SIM_GRID
+    sim_voltage = st.slider("Voltage (V)", v_min, v_max, 12.0, step=v_step)
+    sim_current = st.slider("Current (A)", c_min, c_max, 2.0, step=c_step)
+    sim_rpm = st.slider("RPM", r_min, r_max, 1400, step=r_step)
+
+    sim_fault, sim_proba, sim_rul = sim_lattice.lookup([sim_voltage, sim_current, sim_rpm])
+
+    st.markdown("### Manual Simulation Result:")
+    if sim_fault == 1:
+        st.error(f"⚠️ Fault Risk: {sim_proba*100:.1f}%")
+    else:
+        st.success(f"✅ Operating Normally ({sim_proba*100:.1f}% risk)")
+    st.progress(sim_rul)
 
-    elapsed_since_refresh = time.time() - st.session_state.last_refresh_time
 
-    if elapsed_since_refresh >= refresh_interval:
-        st.session_state.last_refresh_time = time.time()
-        st.rerun()
-    else:
-        remaining = int(refresh_interval - elapsed_since_refresh)
-        with refresh_placeholder.container():
-            if auto_refresh:
-                st.info("🔄 Auto-refresh is enabled")
-            else:
-                st.warning("🔴 Auto-refresh is disabled")
-
-    with refresh_placeholder.container():
-        st.markdown("""
-            <div style="display: flex; align-items: center;">
-                <div style="height: 12px; width: 12px; background-color: red; border-radius: 50%; 
-                            animation: blink 1s infinite;"></div>
-                <span style="margin-left: 10px; color: red; font-weight: bold;">Live update</span>
-            </div>
-            <style>
-            @keyframes blink {
-                0%   { opacity: 1; }
-                50%  { opacity: 0; }
-                100% { opacity: 1; }
-            }
-            </style>
-        """, unsafe_allow_html=True)
-
-# --- Predict on data ---
-features = data[['Voltage (V)', 'Current (A)', 'RPM']]
-data['Predicted Fault'] = model.predict(features)
-if 'Fault' in data.columns:
-    from sklearn.metrics import accuracy_score
-    true_labels = data['Fault']
-    predicted_labels = data['Predicted Fault']
-    dynamic_accuracy = accuracy_score(true_labels, predicted_labels)
-else:
-    dynamic_accuracy = None
-
-# --- Estimate RUL based on recent window ---
-recent_window = data.tail(60)
-# --- Anomaly-based RUL Estimation ---
-recent_anomalies = recent_window['Anomaly'].sum()
-anomaly_risk = recent_anomalies / len(recent_window)  # Proportion of anomalies
-anomaly_rul_estimate = max(0, int(100 * (1 - anomaly_risk)**2))  # Same formula style
-
-fault_probs = model.predict_proba(recent_window[['Voltage (V)', 'Current (A)', 'RPM']])[:, 1]
-fault_risk = fault_probs.mean()
-rul_estimate = max(0, int(100 * (1 - fault_risk)**2))
-
-# --- Sidebar Input Sliders for Simulation ---
-st.sidebar.header("Manual Input Simulation")
-sim_voltage = st.sidebar.slider("Voltage (V)", 10.0, 14.0, 12.0, step=0.1)
-sim_current = st.sidebar.slider("Current (A)", 0.0, 5.0, 2.0, step=0.1)
-sim_rpm = st.sidebar.slider("RPM", 1000, 1600, 1400, step=50)
-
-sim_input = pd.DataFrame([[sim_voltage, sim_current, sim_rpm]], columns=['Voltage (V)', 'Current (A)', 'RPM'])
-sim_fault = model.predict(sim_input)[0]
-sim_proba = model.predict_proba(sim_input)[0][1]
-sim_rul = max(0, int(100 * (1 - sim_proba)**2))
-
-st.sidebar.markdown("### Manual Simulation Result:")
-if sim_fault == 1:
-    st.sidebar.error(f"⚠️ Fault Risk: {sim_proba*100:.1f}%")
-else:
-    st.sidebar.success(f"✅ Operating Normally ({sim_proba*100:.1f}% risk)")
-st.sidebar.progress(sim_rul)
+with st.sidebar:
+    manual_simulation()
 
 # --- Display RUL ---
 st.subheader("📉 RUL Estimation & Fault Overview")
 col1, col2 = st.columns(2)
 
 with col1:
-    st.metric("RUL (Fault Model)", f"{rul_estimate} %")
-    st.progress(rul_estimate)
+    st.metric("RUL (Degradation Trend)", format_seconds(trend_rul["rul_s"]),
+              help="Time until the Current or RPM trend crosses its fault threshold")
+    st.caption(f"95% band: {format_seconds(trend_rul['lower_s'])} – {format_seconds(trend_rul['upper_s'])} "
+               f"(limited by {trend_rul['signal']})")
 
     st.metric("RUL (Anomaly Model)", f"{anomaly_rul_estimate} %")
     st.progress(anomaly_rul_estimate)
 
 with col2:
-    fault_count = data['Predicted Fault'].sum()
+    fault_count = snapshot["fault_count"]
     st.metric("Detected Fault Points", f"{fault_count}")
     if fault_count > 0:
         st.error("⚠️ Faults detected – consider scheduling maintenance.")
     else:
         st.success("✅ No predicted faults in the current data.")
 
-    anomaly_count = data['Anomaly'].sum()
+    anomaly_count = snapshot["anomaly_count"]
     st.metric("Anomaly Count", f"{anomaly_count}")
     if anomaly_count > 0:
         st.warning("🚨 Anomalies detected in current data.")
 
-# --- Generate maintenance suggestions for each row ---
-data['Suggestion'] = data.apply(suggest_action, axis=1)
-
-
-# --- Simulate Automated Corrective Action ---
-def simulate_corrective_action(row):
-    actions = []
-
-    if row['Predicted Fault'] == 1:
-        if row['Current (A)'] > 2.5:
-            actions.append("🔧 Reduce current draw (lower torque or load).")
-        if row['RPM'] < 1150:
-            actions.append("⚙️ Increase RPM (boost motor voltage or recalibrate load).")
-
-    if row['Anomaly'] == 1 and row['Predicted Fault'] == 0:
-        actions.append("🛠️ Anomaly detected — inspect for irregular sensor drift or noise.")
-
-    return actions if actions else ["✅ No corrective action needed."]
-
-
-# Apply on latest row
-latest_row = data.iloc[-1]
-corrective_actions = simulate_corrective_action(latest_row)
 
+# --- Simulate Automated Corrective Action (rules applied to the latest row) ---
 st.subheader("🤖 Automated Corrective Action")
 
-for action in corrective_actions:
+for action in snapshot["corrective_actions"]:
     if "✅" in action:
         st.success(action)
     elif "🛠️" in action:
@@ -265,56 +325,48 @@ for action in corrective_actions:
     else:
         st.error(action)
 
+charts = snapshot["charts"]
 # --- Fault Timeline Bar ---
 st.markdown("### 🕒 Fault Timeline Bar")
-fig_faults, ax_faults = plt.subplots(figsize=(6, 0.6))
-colors = ['red' if f == 1 else 'green' for f in data['Predicted Fault']]
-ax_faults.bar(data['Time (s)'], height=1, width=1, color=colors)
-ax_faults.set_yticks([])
-ax_faults.set_xlabel("Time (s)")
-st.pyplot(fig_faults)
+st.image(charts["Fault"], width="stretch")
 st.markdown("### 🚨 Anomaly Timeline Bar")
-fig_anom, ax_anom = plt.subplots(figsize=(6, 0.6))
-colors_anom = ['red' if a == 1 else 'green' for a in data['Anomaly']]
-ax_anom.bar(data['Time (s)'], height=1, width=1, color=colors_anom)
-ax_anom.set_yticks([])
-ax_anom.set_xlabel("Time (s)")
-st.pyplot(fig_anom)
+st.image(charts["Anomaly"], width="stretch")
 
 # --- Time-Series Plots ---
 st.markdown("### 📊 Live Motor Sensor Trends")
-sensor_cols = ['Voltage (V)', 'Current (A)', 'RPM']
-colors = ['blue', 'orange', 'green']
-
-for col, color in zip(sensor_cols, colors):
+for col, _ in SENSOR_PLOTS:
     st.subheader(f"{col}")
-    fig, ax = plt.subplots(figsize=(6, 2))
-    ax.plot(data['Time (s)'], data[col], color=color, label=col)
-    ax.scatter(data[data['Predicted Fault'] == 1]['Time (s)'],
-               data[data['Predicted Fault'] == 1][col],
-               color='red', label='Fault Detected', s=20)
-    ax.legend()
-    st.pyplot(fig)
-
-# --- 3D Digital Twin Motor Visualization ---
-st.subheader("🔩 3D Digital Twin Motor View")
-render_motor_3d_view(data)
-
-# --- Show fault timestamps ---
+    st.image(charts[col], width="stretch")
+
+# --- 3D Digital Twin Motor View (a fragment: the toggle reruns only this view) ---
+@st.fragment
+def motor_3d_section(data):
+    st.subheader("🔩 3D Digital Twin Motor View")
+    animate_3d = st.toggle("Animate recent readings in the browser", value=False,
+                           help="Send the last 30 readings as Plotly frames and play them client-side")
+    with perf.span("plotly_3d"):
+        render_motor_3d_view(data, animate=animate_3d, figures=snapshot["motor_figures"])
+
+
+motor_3d_section(data)
+
+# --- Show fault timestamps: one row per interval of consecutive flagged readings ---
 if fault_count > 0:
     st.markdown("### 🕓 Fault Timestamps")
-    fault_times = data[data['Predicted Fault'] == 1]['Time (s)']
-    st.write(fault_times.reset_index(drop=True), height=100)
+    fault_intervals = snapshot["fault_intervals"]
+    st.dataframe(fault_intervals.rename(columns={"Peak": "Peak probability"}), hide_index=True, height=150)
+    st.caption(f"{len(fault_intervals):,} fault episodes covering {fault_count:,} readings")
 else:
     st.markdown("### 🕓 Fault Timestamps")
     st.info("No faults detected in the current data.")
 if anomaly_count > 0:
     st.markdown("### 🕓 Anomaly Timestamps")
-    anomaly_times = data[data['Anomaly'] == 1]['Time (s)']
-    st.write(anomaly_times.reset_index(drop=True), height=100)
+    anomaly_intervals = snapshot["anomaly_intervals"]
+    st.dataframe(anomaly_intervals.rename(columns={"Peak": "Lowest score"}), hide_index=True, height=150)
+    st.caption(f"{len(anomaly_intervals):,} anomaly episodes covering {anomaly_count:,} readings")
 
 st.markdown("### 🛠️ Maintenance Suggestions Summary")
-recent_suggestions = data[data["Suggestion"] != "✅ System appears stable."]["Suggestion"].unique()
+recent_suggestions = snapshot["suggestions"]
 
 if len(recent_suggestions) > 0:
     for suggestion in recent_suggestions:
@@ -326,9 +378,9 @@ else:
 
 # --- Optional: Show raw data ---
 with st.expander("🔍 Show raw data"):
-    st.write(data.tail(100))
+    st.write(snapshot["raw_tail"])
 
-st.caption("🔁 This dashboard updates live from `realtime_dc_motor_data.csv`. Refresh to see new data.")
+st.caption("🔁 This dashboard updates live from `realtime_dc_motor_data.csv` whenever new rows arrive.")
 
 if dynamic_accuracy is not None:
     st.info(f"🎯 Model Accuracy on Current Data: `{dynamic_accuracy * 100:.2f}%`")
@@ -337,8 +389,13 @@ else:
 
 authenticator.logout('Logout', 'sidebar')
 
-if st.session_state.auto_refresh:
-    st.rerun()
+# --- Performance panel: rolling per-stage timings across this process's reruns ---
+perf.record("rerun", time.perf_counter() - rerun_start)
+if perf.enabled:
+    perf.export()
+    with st.sidebar.expander("⏱️ Performance"):
+        st.dataframe(pd.DataFrame(perf.summary()).round(2), hide_index=True)
+        st.caption(f"Exported to `{perf.export_path}` every {perf.export_interval:g} s")
 
 
 #classification report section
@@ -0,0 +1,178 @@
+import copy
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+FEATURE_COLUMNS = ['Voltage (V)', 'Current (A)', 'RPM']
+DEFAULT_WINDOWS = (10, 60, 600)  # seconds
+STATS = ("mean", "std", "slope", "roc", "ewma")
+
+# Below this many rows, per-sample updates beat re-windowing the retained history
+SMALL_BLOCK = 64
+
+
+def rolling_feature_names(columns=FEATURE_COLUMNS, windows=DEFAULT_WINDOWS):
+    return [f"{column} {stat} {window:g}s" for window in windows for stat in STATS for column in columns]
+
+
+class RollingFeatureEngine:
+    """Rolling mean, std, slope, rate of change and EWMA of each column over several windows.
+
+    ``update`` consumes one sample in O(1): a sliding Welford update for mean
+    and variance, running sums for the least-squares slope against time, the
+    sample leaving the window for the rate of change, and an EWMA with span
+    equal to the window. ``update_many`` and ``transform`` compute the same
+    values vectorized, so features for training (``transform`` on a whole
+    history) match the ones served row by row.
+
+    Windows are given in seconds and converted to sample counts with
+    ``sampling_interval``. Until a window has filled, its statistics cover
+    every sample seen so far.
+    """
+
+    def __init__(self, columns=FEATURE_COLUMNS, windows=DEFAULT_WINDOWS, sampling_interval=1.0):
+        self.columns = list(columns)
+        self.windows = tuple(windows)
+        self.sampling_interval = sampling_interval
+        self.sizes = np.array([max(1, int(round(w / sampling_interval))) for w in self.windows])
+        self.alphas = 2.0 / (self.sizes + 1)
+        self.feature_names = rolling_feature_names(self.columns, self.windows)
+        self.reset()
+
+    def reset(self):
+        n_windows, n_columns = len(self.sizes), len(self.columns)
+        self.n_seen = 0
+        self._ring = np.zeros((self.sizes.max() + 1, n_columns))  # last samples, for removal and rate of change
+        self._mean = np.zeros((n_windows, n_columns))
+        self._m2 = np.zeros((n_windows, n_columns))
+        self._sjx = np.zeros((n_windows, n_columns))  # sum of position-in-window * value
+        self._ewma = np.zeros((n_windows, n_columns))
+
+    def update(self, values):
+        """Features for one new sample (in ``feature_names`` order)."""
+        x = np.asarray(values, dtype=np.float64)
+        t, capacity = self.n_seen, len(self._ring)
+        sizes = self.sizes[:, None]
+        sliding = t >= sizes
+        n = np.minimum(t + 1, sizes)
+        lag = np.minimum(t, self.sizes)
+        reference = self._ring[(t - lag) % capacity]  # sample ``lag`` steps back (the one leaving a full window)
+
+        # Sliding Welford: a full window swaps its oldest sample for x, a growing one just adds x
+        mean = self._mean
+        replaced = np.where(sliding, reference, mean)
+        new_mean = mean + (x - replaced) / n
+        self._m2 += (x - replaced) * (x - new_mean + replaced - mean)
+        self._sjx += (n - 1) * x - np.where(sliding, sizes * mean - reference, 0.0)
+        self._mean = new_mean
+        self._ewma = np.tile(x, (len(self.sizes), 1)) if t == 0 else self._ewma + self.alphas[:, None] * (x - self._ewma)
+
+        self._ring[t % capacity] = x
+        self.n_seen += 1
+        lag = lag[:, None]
+        roc = np.where(lag > 0, (x - reference) / (np.maximum(lag, 1) * self.sampling_interval), 0.0)
+        return self._assemble(n, new_mean, self._m2, self._sjx, roc, self._ewma)
+
+    def _assemble(self, n, mean, m2, sjx, roc, ewma):
+        std = np.sqrt(np.maximum(m2 / n, 0.0))
+        position_mean = (n - 1) / 2
+        position_var = (n * n - 1) / 12
+        slope = np.where(n > 1, (sjx / n - position_mean * mean) / np.where(n > 1, position_var, 1.0), 0.0)
+        stats = np.stack([mean, std, slope / self.sampling_interval, roc, ewma], axis=-2)
+        return stats.reshape(*stats.shape[:-3], -1)
+
+    def update_many(self, values):
+        """Features for a block of new samples, vectorized; equivalent to ``update`` on each row."""
+        X = np.asarray(values, dtype=np.float64).reshape(-1, len(self.columns))
+        if len(X) == 0:
+            return np.empty((0, len(self.feature_names)))
+        if len(X) < SMALL_BLOCK:
+            return np.array([self.update(x) for x in X])
+        history = min(self.n_seen, len(self._ring) - 1)
+        tail = self._ring[(self.n_seen - history + np.arange(history)) % len(self._ring)]
+        extended = np.concatenate([tail, X])
+        frame = pd.DataFrame(extended)
+        t = np.arange(len(extended))[:, None]
+        if self.n_seen > history:
+            t = t + (self.n_seen - history)  # global sample numbers, so windows are known to be full
+
+        per_window = []
+        for w, alpha, ewma in zip(self.sizes, self.alphas, self._ewma):
+            rolling = frame.rolling(w, min_periods=1)
+            n = np.minimum(t + 1, w)
+            mean = rolling.mean().to_numpy()
+            m2 = rolling.var(ddof=0).to_numpy() * n
+            # Sum of position-in-window * value: sum(k * x) minus the window start times sum(x)
+            k = np.arange(len(extended))[:, None]
+            sum_x = rolling.sum().to_numpy()
+            sum_kx = pd.DataFrame(k * extended).rolling(w, min_periods=1).sum().to_numpy()
+            sjx = sum_kx - (k - n + 1) * sum_x
+            lag = np.minimum(t, w)
+            reference = extended[np.maximum(k[:, 0] - lag[:, 0], 0)]
+            roc = np.where(lag > 0, (extended - reference) / (np.maximum(lag, 1) * self.sampling_interval), 0.0)
+            start = ewma if self.n_seen else X[0]
+            ewma_values = lfilter([alpha], [1.0, alpha - 1.0], X, axis=0, zi=((1 - alpha) * start)[None, :])[0]
+            new = slice(history, None)
+            per_window.append((n[new], mean[new], m2[new], sjx[new], roc[new], ewma_values))
+
+        parts = [np.stack(arrays, axis=1) for arrays in zip(*per_window)]  # (rows, windows, columns)
+        features = self._assemble(*parts)
+        self._restore(extended, t[-1, 0] + 1, per_window)
+        return features
+
+    def _restore(self, extended, n_seen, per_window):
+        """Set the O(1) update state from the end of a vectorized block."""
+        capacity = len(self._ring)
+        last = extended[-min(len(extended), capacity):]
+        positions = (n_seen - len(last) + np.arange(len(last))) % capacity
+        self._ring[positions] = last
+        for i, w in enumerate(self.sizes):
+            window = extended[-min(len(extended), w):]
+            self._mean[i] = window.mean(axis=0)
+            self._m2[i] = ((window - self._mean[i]) ** 2).sum(axis=0)
+            self._sjx[i] = (np.arange(len(window))[:, None] * window).sum(axis=0)
+            self._ewma[i] = per_window[i][5][-1]
+        self.n_seen = n_seen
+
+    def transform(self, frame):
+        """Rolling features for a whole history, from a fresh state; does not touch this engine."""
+        engine = copy.deepcopy(self)
+        engine.reset()
+        return pd.DataFrame(engine.update_many(frame[self.columns].to_numpy()),
+                            columns=self.feature_names, index=frame.index)
+
+
+def with_rolling_features(frame, engine):
+    """Raw model inputs plus their rolling features, the training matrix for ``--features rolling``."""
+    return pd.concat([frame[engine.columns], engine.transform(frame)], axis=1)
+
+
+class RollingFeatureModel:
+    """A fault classifier over raw + rolling features that keeps its own engine state.
+
+    ``predict_proba`` takes raw rows and must see each row once, in time order,
+    as ScoreStore feeds it. Built from the bundle ``train_model.py --features
+    rolling`` saves: ``{"model": classifier, "feature_engine": engine}``.
+    """
+
+    def __init__(self, bundle):
+        self.model = bundle["model"]
+        self.engine = copy.deepcopy(bundle["feature_engine"])
+        self.engine.reset()
+
+    @property
+    def classes_(self):
+        return self.model.classes_
+
+    def features(self, frame):
+        raw = frame[self.engine.columns]
+        rolling = pd.DataFrame(self.engine.update_many(raw.to_numpy()),
+                               columns=self.engine.feature_names, index=frame.index)
+        return pd.concat([raw, rolling], axis=1)
+
+    def predict_proba(self, frame):
+        return self.model.predict_proba(self.features(frame))
+
+    def predict(self, frame):
+        return self.model.classes_.take(np.argmax(self.predict_proba(frame), axis=1))
@@ -0,0 +1,285 @@
+import threading
+
+import numpy as np
+
+
+def heuristic_rul(risk):
+    """Remaining useful life in percent from a fault risk in [0, 1].
+
+    Inverse of the risk squared, for more sensitivity near healthy operation.
+    Accepts a scalar (returns an int) or an array of risks (returns an int array).
+    """
+    rul = np.maximum(0, (100 * (1 - np.asarray(risk, dtype=np.float64)) ** 2).astype(np.int64))
+    return int(rul) if rul.ndim == 0 else rul
+
+
+# Fault rule thresholds (Current > 2.5 A or RPM < 1150) and Kalman noise settings per signal:
+# ``noise`` is the sensor standard deviation, ``drift`` how fast the slope itself may change (per sqrt(s)).
+DEFAULT_SIGNALS = {
+    "Current (A)": {"threshold": 2.5, "direction": 1, "noise": 0.07, "drift": 2e-3},
+    "RPM": {"threshold": 1150.0, "direction": -1, "noise": 25.0, "drift": 0.1},
+}
+
+# Two-sided normal quantiles for the confidence band
+_Z = {0.8: 1.2816, 0.9: 1.6449, 0.95: 1.96, 0.99: 2.5758}
+
+
+class TrendRulEstimator:
+    """Time to the fault threshold from the degradation trend of each signal, for many motors.
+
+    Each (motor, signal) pair runs a local linear trend Kalman filter whose
+    state is the current level and slope. ``update`` costs O(1) per motor and
+    is vectorized over motors and signals. ``estimate`` extrapolates every
+    trend to its threshold and reports the earliest crossing in seconds, with a
+    ``confidence`` band from the state covariance (delta method). Motors
+    without a trend toward any threshold get an infinite RUL.
+    """
+
+    def __init__(self, n_motors=1, signals=DEFAULT_SIGNALS, confidence=0.95, initial_slope_std=None):
+        self.n_motors = n_motors
+        self.signal_names = list(signals)
+        self.threshold = np.array([signals[s]["threshold"] for s in self.signal_names], dtype=np.float64)
+        self.direction = np.array([signals[s]["direction"] for s in self.signal_names], dtype=np.float64)
+        self.r = np.array([signals[s]["noise"] for s in self.signal_names], dtype=np.float64) ** 2
+        self.q = np.array([signals[s]["drift"] for s in self.signal_names], dtype=np.float64) ** 2
+        self.z = _Z[confidence]
+        self.initial_slope_std = initial_slope_std
+        self.reset()
+
+    def reset(self, motors=None):
+        shape = (self.n_motors, len(self.signal_names))
+        if motors is None:
+            self.time = np.full(self.n_motors, np.nan)
+            self.level = np.zeros(shape)
+            self.slope = np.zeros(shape)
+            self.p00, self.p01, self.p11 = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+            self.n_updates = np.zeros(self.n_motors, dtype=np.int64)
+            return
+        self.time[motors] = np.nan
+        for state in (self.level, self.slope, self.p00, self.p01, self.p11):
+            state[motors] = 0.0
+        self.n_updates[motors] = 0
+
+    def grow(self, n_motors):
+        """Make room for motors up to ``n_motors``; new motors start without data."""
+        if n_motors <= self.n_motors:
+            return
+        extra = n_motors - self.n_motors
+        pad = np.zeros((extra, len(self.signal_names)))
+        self.time = np.concatenate([self.time, np.full(extra, np.nan)])
+        self.level, self.slope = np.vstack([self.level, pad]), np.vstack([self.slope, pad])
+        self.p00, self.p01, self.p11 = (np.vstack([p, pad]) for p in (self.p00, self.p01, self.p11))
+        self.n_updates = np.concatenate([self.n_updates, np.zeros(extra, dtype=np.int64)])
+        self.n_motors = n_motors
+
+    def update(self, times, values, motors=None):
+        """One reading per motor: ``times`` (n,) in seconds and ``values`` (n, signals).
+
+        ``motors`` selects which motors the rows belong to (default: all, in order).
+        """
+        idx = slice(None) if motors is None else np.asarray(motors)
+        t = np.asarray(times, dtype=np.float64)
+        y = np.asarray(values, dtype=np.float64).reshape(-1, len(self.signal_names))
+        level, slope = self.level[idx], self.slope[idx]
+        p00, p01, p11 = self.p00[idx], self.p01[idx], self.p11[idx]
+
+        first = np.isnan(self.time[idx])[:, None]
+        any_first = first.any()
+        dt = (t - self.time[idx])[:, None]
+        if any_first:
+            dt = np.where(first, 0.0, dt)
+
+        # Predict: level moves along the slope; the slope follows a random walk
+        level = level + slope * dt
+        q_dt = self.q * dt
+        p00 = p00 + dt * (2 * p01 + dt * p11 + q_dt * dt / 3)
+        p01 = p01 + dt * (p11 + q_dt / 2)
+        p11 = p11 + q_dt
+
+        if any_first:
+            # A motor's first reading sets the level; the slope starts unknown
+            slope_var = self.initial_slope_std ** 2 if self.initial_slope_std else self.r
+            level = np.where(first, y, level)
+            p00 = np.where(first, self.r, p00)
+            p01 = np.where(first, 0.0, p01)
+            p11 = np.where(first, slope_var, p11)
+
+        # Update with the measured level (on a first reading the innovation is 0; its covariance is reset below)
+        s = p00 + self.r
+        k0 = p00 / s
+        k1 = p01 / s
+        innovation = y - level
+        level = level + k0 * innovation
+        slope = slope + k1 * innovation
+        p11 = p11 - k1 * p01
+        p01 = (1 - k0) * p01
+        p00 = (1 - k0) * p00
+        if any_first:
+            p00 = np.where(first, self.r, p00)
+
+        self.level[idx], self.slope[idx] = level, slope
+        self.p00[idx], self.p01[idx], self.p11[idx] = p00, p01, p11
+        self.time[idx] = t
+        self.n_updates[idx] += 1
+
+    def update_many(self, times, values, motor=0):
+        """Replay a time-ordered series of readings for one motor.
+
+        Same arithmetic as ``update`` row by row, on Python floats: for one
+        motor a per-row ``update`` is almost all numpy call overhead.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if not len(times):
+            return
+        values = np.asarray(values, dtype=np.float64).reshape(len(times), len(self.signal_names))
+        times_list = times.tolist()
+        previous = float(self.time[motor])
+        for j in range(len(self.signal_names)):
+            r, q = float(self.r[j]), float(self.q[j])
+            slope_var = self.initial_slope_std ** 2 if self.initial_slope_std else r
+            level, slope = float(self.level[motor, j]), float(self.slope[motor, j])
+            p00, p01, p11 = float(self.p00[motor, j]), float(self.p01[motor, j]), float(self.p11[motor, j])
+            last = previous
+            for t, y in zip(times_list, values[:, j].tolist()):
+                if last != last:  # NaN: the motor's first reading sets the level; the slope starts unknown
+                    level, p00, p01, p11 = y, r, 0.0, slope_var
+                    last = t
+                    continue
+                dt = t - last
+                last = t
+                level = level + slope * dt
+                q_dt = q * dt
+                p00 = p00 + dt * (2 * p01 + dt * p11 + q_dt * dt / 3)
+                p01 = p01 + dt * (p11 + q_dt / 2)
+                p11 = p11 + q_dt
+                s = p00 + r
+                k0 = p00 / s
+                k1 = p01 / s
+                innovation = y - level
+                level = level + k0 * innovation
+                slope = slope + k1 * innovation
+                p11 = p11 - k1 * p01
+                p01 = (1 - k0) * p01
+                p00 = (1 - k0) * p00
+            self.level[motor, j], self.slope[motor, j] = level, slope
+            self.p00[motor, j], self.p01[motor, j], self.p11[motor, j] = p00, p01, p11
+        self.time[motor] = times_list[-1]
+        self.n_updates[motor] += len(times_list)
+
+    def signal_estimates(self):
+        """Time to threshold (s) and band per motor and signal; inf where there is no trend toward it."""
+        gap = (self.threshold - self.level) * self.direction  # distance still to go, > 0 before crossing
+        rate = self.slope * self.direction  # speed toward the threshold
+        with np.errstate(divide="ignore", invalid="ignore"):
+            tau = np.where(gap <= 0, 0.0, np.where(rate > 0, gap / rate, np.inf))
+            # Var(tau) from Var(level), Var(slope), Cov: d tau/d level = -1/slope, d tau/d slope = -tau/slope
+            d_level = -1.0 / self.slope
+            d_slope = -tau / self.slope
+            var = d_level ** 2 * self.p00 + 2 * d_level * d_slope * self.p01 + d_slope ** 2 * self.p11
+            spread = self.z * np.sqrt(np.maximum(var, 0.0))
+            lower = np.where(np.isfinite(tau), np.maximum(tau - spread, 0.0), np.inf)
+            # The slope may not be significantly toward the threshold: the band is then open-ended
+            significant = rate - self.z * np.sqrt(np.maximum(self.p11, 0.0)) > 0
+            upper = np.where(significant & np.isfinite(tau), tau + spread, np.inf)
+        crossed = gap <= 0
+        lower = np.where(crossed, 0.0, lower)
+        upper = np.where(crossed, 0.0, upper)
+        no_data = (self.n_updates < 2)[:, None]
+        return (np.where(no_data, np.nan, tau), np.where(no_data, np.nan, lower),
+                np.where(no_data, np.nan, upper))
+
+    def estimate(self):
+        """Per motor: RUL in seconds (earliest threshold crossing), its band and the limiting signal index."""
+        tau, lower, upper = self.signal_estimates()
+        limiting = np.argmin(np.where(np.isnan(tau), np.inf, tau), axis=1)
+        rows = np.arange(self.n_motors)
+        return {"rul_s": tau[rows, limiting], "lower_s": lower[rows, limiting],
+                "upper_s": upper[rows, limiting], "signal": limiting}
+
+
+def format_seconds(seconds):
+    """Compact duration for dashboards: ``45 s``, ``12 min``, ``3.5 h`` or ``∞``."""
+    if seconds is None or np.isnan(seconds):
+        return "–"
+    if np.isinf(seconds):
+        return "∞"
+    if seconds < 120:
+        return f"{seconds:.0f} s"
+    if seconds < 7200:
+        return f"{seconds / 60:.0f} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+class SeriesRulTracker:
+    """Feeds an append-only single-motor telemetry frame to a TrendRulEstimator, each row once.
+
+    Like ScoreStore, rows already consumed are skipped on the next ``update``;
+    a shorter frame or a new ``source_version`` (source replaced) starts a
+    fresh estimator. With ``checkpoint_every`` the filter state is also kept
+    after every that many rows, so ``estimate_at`` can answer for any earlier
+    row by replaying at most ``checkpoint_every`` rows from the nearest one.
+    """
+
+    # Estimator arrays saved per checkpoint (row 0 of each; the tracker has one motor)
+    _STATE = ("time", "n_updates", "level", "slope", "p00", "p01", "p11")
+
+    def __init__(self, signals=DEFAULT_SIGNALS, confidence=0.95, checkpoint_every=None):
+        self.signals = signals
+        self.confidence = confidence
+        self.checkpoint_every = checkpoint_every
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, source_version):
+        self.source_version = source_version
+        self.estimator = TrendRulEstimator(1, self.signals, self.confidence)
+        self.n_rows = 0
+        self._checkpoints = []  # filter state after (i + 1) * checkpoint_every rows
+
+    def update(self, data, source_version=None):
+        """Estimate after the last row of ``data``: rul_s, lower_s, upper_s and the limiting signal name."""
+        with self._lock:
+            if len(data) < self.n_rows or source_version != self.source_version:
+                self._reset(source_version)
+            if len(data) > self.n_rows:
+                times = data['Time (s)'].to_numpy()
+                values = data[self.estimator.signal_names].to_numpy()
+                step = self.checkpoint_every or len(data)
+                while self.n_rows < len(data):
+                    # Feed up to the next checkpoint boundary and keep the state there
+                    stop = min((self.n_rows // step + 1) * step, len(data))
+                    self.estimator.update_many(times[self.n_rows:stop], values[self.n_rows:stop])
+                    self.n_rows = stop
+                    if self.checkpoint_every and stop % step == 0:
+                        self._checkpoints.append(self._state(self.estimator))
+            return self._result(self.estimator)
+
+    def estimate_at(self, data, stop):
+        """Estimate after row ``stop - 1`` of the ``data`` last passed to ``update``."""
+        with self._lock:
+            if not 0 < stop <= self.n_rows:
+                raise ValueError(f"row {stop} is outside the {self.n_rows} tracked rows")
+            if stop == self.n_rows:
+                return self._result(self.estimator)
+            estimator = TrendRulEstimator(1, self.signals, self.confidence)
+            start = 0
+            if self.checkpoint_every:
+                n_checkpoints = min(stop // self.checkpoint_every, len(self._checkpoints))
+                if n_checkpoints:
+                    start = n_checkpoints * self.checkpoint_every
+                    for name, value in zip(self._STATE, self._checkpoints[n_checkpoints - 1]):
+                        getattr(estimator, name)[0] = value
+        window = data.iloc[start:stop]
+        estimator.update_many(window['Time (s)'].to_numpy(), window[estimator.signal_names].to_numpy())
+        return self._result(estimator)
+
+    @classmethod
+    def _state(cls, estimator):
+        return tuple(np.copy(getattr(estimator, name)[0]) for name in cls._STATE)
+
+    @staticmethod
+    def _result(estimator):
+        estimate = estimator.estimate()
+        return {"rul_s": float(estimate["rul_s"][0]), "lower_s": float(estimate["lower_s"][0]),
+                "upper_s": float(estimate["upper_s"][0]),
+                "signal": estimator.signal_names[estimate["signal"][0]]}
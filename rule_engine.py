@@ -0,0 +1,82 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+RULES_PATH = os.path.join("config", "maintenance_rules.json")
+
+OPERATORS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+
+class RuleSet:
+    """A table of threshold rules evaluated as boolean masks over whole columns.
+
+    Each rule is a list of ``[column, operator, value]`` clauses that must all
+    hold. ``evaluate`` returns one small integer per row with bit ``i`` set when
+    rule ``i`` fired; text is looked up from the code only when displayed.
+    """
+
+    def __init__(self, rules, default, separator=" | "):
+        if len(rules) > 64:
+            raise ValueError("A rule set supports at most 64 rules.")
+        for rule in rules:
+            for column, op, _ in rule["when"]:
+                if op not in OPERATORS:
+                    raise ValueError(f"Rule {rule.get('id')!r}: unknown operator {op!r} on {column!r}")
+        self.rules = rules
+        self.default = default
+        self.separator = separator
+        self.code_dtype = next(t for t in (np.uint8, np.uint16, np.uint32, np.uint64)
+                               if np.iinfo(t).bits >= max(len(rules), 1))
+        self.columns = sorted({column for rule in rules for column, _, _ in rule["when"]})
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config["rules"], config["default"], config.get("separator", " | "))
+
+    def evaluate(self, frame):
+        """Suggestion code per row of ``frame`` (0 means no rule fired)."""
+        values = {column: frame[column].to_numpy() for column in self.columns}
+        codes = np.zeros(len(frame), dtype=self.code_dtype)
+        for bit, rule in enumerate(self.rules):
+            mask = np.ones(len(frame), dtype=bool)
+            for column, op, threshold in rule["when"]:
+                mask &= OPERATORS[op](values[column], threshold)
+            codes |= mask.astype(self.code_dtype) << self.code_dtype(bit)
+        return codes
+
+    def texts(self, code):
+        """Rule texts for one code, or ``[default]`` when nothing fired."""
+        code = int(code)
+        fired = [rule["text"] for bit, rule in enumerate(self.rules) if code >> bit & 1]
+        return fired or [self.default]
+
+    def describe(self, code):
+        return self.separator.join(self.texts(code))
+
+    def describe_many(self, codes):
+        """Text per code; each distinct code is formatted once."""
+        codes = np.asarray(codes)
+        unique, inverse = np.unique(codes, return_inverse=True)
+        lookup = np.array([self.describe(code) for code in unique], dtype=object)
+        return lookup[inverse.reshape(codes.shape)]
+
+    def unique_texts(self, codes):
+        """Texts of the distinct non-default codes, in order of first appearance."""
+        codes = np.asarray(codes)
+        return [self.describe(code) for code in pd.unique(codes[codes != 0])]
+
+
+def load_rules(path=RULES_PATH):
+    """Load every rule set (e.g. ``suggestions``, ``corrective_actions``) from a JSON config."""
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    return {name: RuleSet.from_config(section) for name, section in config.items()}
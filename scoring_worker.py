@@ -0,0 +1,183 @@
+"""One background scorer per telemetry source, shared by every realtime_app.py session.
+
+Each browser session used to read the CSV, run both models, apply the rule
+tables, update the RUL trend and render the charts on every rerun, so N
+viewers cost N times the CPU. A ScoringWorker does that work once per data
+change instead: its thread sleeps on a DataWatch, folds the new rows into
+the incremental stores (ScoreStore, IntervalStore, SeriesRulTracker) and
+publishes the results as one snapshot dict. Sessions only read
+``snapshot()`` and emit elements, so a data update costs about the same
+whether one or fifty people are watching.
+"""
+import os
+import threading
+import time
+import traceback
+
+import numpy as np
+
+from inference_cache import ScoreStore
+from interval_store import IntervalStore
+from motor_3d_view import build_motor_figures
+from perf_instrumentation import StageTimer
+from rul_estimator import SeriesRulTracker, heuristic_rul
+from rule_engine import RULES_PATH, load_rules
+
+
+class ScoringWorker:
+    """Scores an append-only telemetry source in a thread and publishes immutable snapshots.
+
+    ``reader`` is a CsvTailReader or StoreTailReader and ``watch`` the
+    DataWatch of the same source. ``make_models(generation)`` returns the
+    ``(fault_model, anomaly_model)`` pair for a source generation; it is
+    called again whenever the source is replaced, since online detectors and
+    rolling features keep per-source state. ``render(data, intervals)`` may
+    return pre-rendered charts (e.g. PNG bytes by name) to publish with the
+    scores. Stage timings go to ``timer``, as the per-session spans did.
+
+    A snapshot holds the scored frame (``Predicted Fault``, ``Anomaly`` and
+    ``Suggestion Code`` columns added) and everything derived from it; readers
+    must treat it as read-only. ``version`` counts published snapshots.
+    """
+
+    def __init__(self, reader, watch, make_models, rules_path=RULES_PATH, render=None, recent_window=60,
+                 raw_rows=100, timer=None, wait_timeout=1.0):
+        self.reader = reader
+        self.watch = watch
+        self.make_models = make_models
+        self.rules_path = rules_path
+        self.render = render
+        self.recent_window = recent_window
+        self.raw_rows = raw_rows
+        self.timer = timer if timer is not None else StageTimer(enabled=False)
+        self.wait_timeout = wait_timeout
+        self.version = 0
+        self.refreshes = 0
+        self.last_error = None
+        self._snapshot = None
+        self._generation = None
+        self._models = None
+        self._rules = None
+        self._rules_mtime = None
+        self._refresh_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"scoring-worker:{self.watch.path}",
+                                                daemon=True)
+                self._thread.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+        with self._start_lock:
+            if self._thread is not None:
+                self._thread.join()
+                self._thread = None
+
+    def _run(self):
+        seen = self._snapshot["watch_version"] if self._snapshot is not None else None
+        while not self._stop.is_set():
+            version = self.watch.wait(seen, timeout=self.wait_timeout)
+            if version == seen or self._stop.is_set():
+                continue
+            seen = version
+            try:
+                self.refresh()
+            except Exception:  # keep serving the last snapshot; the next change retries
+                self.last_error = traceback.format_exc()
+
+    def snapshot(self):
+        """The latest published snapshot; the first call scores synchronously and starts the thread."""
+        if self._snapshot is None:
+            self.refresh()
+        self.start()
+        return self._snapshot
+
+    def refresh(self):
+        """Read and score the rows appended since the last refresh, then publish a new snapshot."""
+        with self._refresh_lock:
+            start = time.perf_counter()
+            watch_version = self.watch.version  # taken before reading, so rows landing now trigger another refresh
+            with self.timer.span("csv_load"):
+                data = self.reader.read()
+            generation = self.reader.generation
+            if self._models is None or generation != self._generation:
+                self._generation = generation
+                self._reset(generation)
+            snapshot = {"watch_version": watch_version, "generation": generation, "n_rows": len(data),
+                        "data": data}
+            if len(data):
+                snapshot.update(self._score(data, generation))
+            snapshot["compute_s"] = time.perf_counter() - start
+            snapshot["version"] = self.version + 1
+            self._snapshot = snapshot
+            self.version += 1
+            self.refreshes += 1
+            self.last_error = None
+            return snapshot
+
+    def _reset(self, generation):
+        self._models = self.make_models(generation)
+        self.scores = ScoreStore()
+        self.intervals = IntervalStore()
+        self.rul = SeriesRulTracker()
+
+    def _load_rules(self):
+        mtime = os.path.getmtime(self.rules_path)
+        if mtime != self._rules_mtime:
+            self._rules = load_rules(self.rules_path)  # reloaded whenever operators edit the file
+            self._rules_mtime = mtime
+        return self._rules
+
+    def _score(self, data, generation):
+        fault_model, anomaly_model = self._models
+        with self.timer.span("inference"):
+            scores = self.scores.update(data, fault_model, anomaly_model, source_version=generation)
+            self.intervals.update(data['Time (s)'].to_numpy(), scores, source_version=generation)
+        data['Anomaly'] = scores['Anomaly']  # 1 = anomaly, 0 = normal (0 when no anomaly model)
+        data['Predicted Fault'] = scores['Predicted Fault']
+
+        with self.timer.span("rul"):
+            trend_rul = self.rul.update(data)
+        recent_anomalies = data['Anomaly'].to_numpy()[-self.recent_window:]
+        anomaly_rul = heuristic_rul(recent_anomalies.sum() / len(recent_anomalies))
+
+        rules = self._load_rules()
+        suggestion_rules, corrective_rules = rules["suggestions"], rules["corrective_actions"]
+        with self.timer.span("rules"):
+            data['Suggestion Code'] = suggestion_rules.evaluate(data)
+            corrective_actions = corrective_rules.texts(corrective_rules.evaluate(data.iloc[-1:])[0])
+            suggestions = suggestion_rules.unique_texts(data['Suggestion Code'])
+            raw_tail = data.tail(self.raw_rows).copy()
+            raw_tail['Suggestion'] = suggestion_rules.describe_many(raw_tail.pop('Suggestion Code'))
+
+        accuracy = None
+        if 'Fault' in data.columns:
+            accuracy = float(np.mean(data['Fault'].to_numpy() == data['Predicted Fault'].to_numpy()))
+
+        charts = {}
+        if self.render is not None:
+            with self.timer.span("matplotlib"):
+                charts = self.render(data, self.intervals)
+        with self.timer.span("motor_figures"):
+            motor_figures = build_motor_figures(data)
+
+        return {
+            "trend_rul": trend_rul,
+            "anomaly_rul": anomaly_rul,
+            "fault_count": int(data['Predicted Fault'].sum()),
+            "anomaly_count": int(data['Anomaly'].sum()),
+            "accuracy": accuracy,
+            "fault_intervals": self.intervals.frame("Fault").drop(columns="Type"),
+            "anomaly_intervals": self.intervals.frame("Anomaly").drop(columns="Type"),
+            "corrective_actions": corrective_actions,
+            "suggestions": suggestions,
+            "raw_tail": raw_tail,
+            "charts": charts,
+            "motor_figures": motor_figures,
+        }
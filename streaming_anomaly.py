@@ -0,0 +1,182 @@
+import numpy as np
+
+
+class HalfSpaceTrees:
+    """Streaming Half-Space Trees anomaly detector (Tan, Ting & Liu, 2011).
+
+    Each tree splits a randomly perturbed copy of the feature space in half at
+    every level, independently of the data. Node masses are counted over
+    tumbling windows of ``window_size`` samples: the last complete window is
+    the reference profile used for scoring, the current one is being counted.
+    Learning and scoring cost O(n_trees * depth) per sample and memory is fixed,
+    so the detector follows a motor's new normal without refits.
+
+    ``decision_function`` follows IsolationForest: negative means anomalous,
+    with the threshold set so about ``contamination`` of the last window is
+    flagged. Feature ranges come from the first window (warm-up), during which
+    scores are NaN.
+    """
+
+    def __init__(self, n_trees=25, depth=10, window_size=250, contamination=0.05, size_limit=None, seed=None):
+        self.n_trees = n_trees
+        self.depth = depth
+        self.window_size = window_size
+        self.contamination = contamination
+        self.size_limit = 0.1 * window_size if size_limit is None else size_limit
+        self.seed = seed
+        self.n_features = None
+        self.samples_seen = 0
+        self.offset_ = None
+        self._rng = np.random.default_rng(seed)
+        self._window = None  # samples of the current window, for the warm-up ranges
+        self._window_scores = np.empty(window_size)  # their online scores, for the threshold
+        self._window_fill = 0
+
+    @property
+    def ready(self):
+        return self.offset_ is not None
+
+    def _build(self, X):
+        """Feature scaling from the warm-up window, then random split structure per tree."""
+        lo, hi = X.min(axis=0), X.max(axis=0)
+        self._lo = lo
+        self._scale = np.where(hi > lo, hi - lo, 1.0)
+
+        n_internal = 2 ** self.depth - 1
+        n_nodes = 2 ** (self.depth + 1) - 1
+        d = self.n_features
+        # Work range per tree and dimension: [s - 2 max(s, 1-s), s + 2 max(s, 1-s)], s ~ U(0, 1)
+        s = self._rng.random((self.n_trees, d))
+        half = 2 * np.maximum(s, 1 - s)
+        mins, maxs = (s - half)[:, None, :], (s + half)[:, None, :]
+        self._split_dim = np.empty((self.n_trees, n_internal), dtype=np.int64)
+        self._split_value = np.empty((self.n_trees, n_internal), dtype=np.float64)
+        trees = np.arange(self.n_trees)[:, None]
+        for level in range(self.depth):
+            first, width = 2 ** level - 1, 2 ** level
+            dim = self._rng.integers(0, d, (self.n_trees, width))
+            nodes = np.arange(width)[None, :]
+            mid = (mins[trees, nodes, dim] + maxs[trees, nodes, dim]) / 2
+            self._split_dim[:, first:first + width] = dim
+            self._split_value[:, first:first + width] = mid
+            # Children in heap order: left keeps [min, mid], right keeps [mid, max]
+            left_max, right_min = maxs.copy(), mins.copy()
+            left_max[trees, nodes, dim] = mid
+            right_min[trees, nodes, dim] = mid
+            mins = np.stack([mins, right_min], axis=2).reshape(self.n_trees, 2 * width, d)
+            maxs = np.stack([left_max, maxs], axis=2).reshape(self.n_trees, 2 * width, d)
+        self._reference = np.zeros((self.n_trees, n_nodes), dtype=np.float64)
+        self._latest = np.zeros((self.n_trees, n_nodes), dtype=np.float64)
+
+    def _paths(self, X):
+        """Node index per (sample, tree, level) for normalized samples ``X``."""
+        Xn = (X - self._lo) / self._scale
+        n = len(Xn)
+        trees = np.arange(self.n_trees)
+        rows = np.arange(n)[:, None]
+        paths = np.empty((self.depth + 1, n, self.n_trees), dtype=np.int64)
+        node = np.zeros((n, self.n_trees), dtype=np.int64)
+        for level in range(self.depth):
+            paths[level] = node
+            dim = self._split_dim[trees, node]
+            node = 2 * node + 1 + (Xn[rows, dim] > self._split_value[trees, node])
+        paths[self.depth] = node
+        return paths
+
+    def _raw_scores(self, paths):
+        """Sum over trees of reference mass * 2**level at the first node below ``size_limit`` (or the leaf)."""
+        trees = np.arange(self.n_trees)
+        n = paths.shape[1]
+        score = np.zeros((n, self.n_trees))
+        active = np.ones((n, self.n_trees), dtype=bool)
+        for level in range(self.depth + 1):
+            mass = self._reference[trees, paths[level]]
+            stop = active & (mass < self.size_limit) if level < self.depth else active
+            score[stop] = mass[stop] * 2.0 ** level
+            active &= ~stop
+            if not active.any():
+                break
+        # Normalized so a point in a uniformly populated region scores about 1
+        return score.sum(axis=1) / (self.n_trees * self.window_size)
+
+    def _count(self, paths):
+        n_nodes = self._latest.shape[1]
+        flat = (np.arange(self.n_trees) * n_nodes + paths).ravel()
+        self._latest += np.bincount(flat, minlength=self.n_trees * n_nodes).reshape(self.n_trees, n_nodes)
+
+    def _end_window(self):
+        if self.ready:
+            # Threshold: the contamination quantile of the scores the finished window received
+            self.offset_ = float(np.quantile(self._window_scores, self.contamination))
+        else:
+            self._build(self._window)
+            paths = self._paths(self._window)
+            self._count(paths)
+        self._reference, self._latest = self._latest, self._reference
+        self._latest[:] = 0
+        if not self.ready:
+            # Warm-up: no earlier profile, so score the window against its own
+            self.offset_ = float(np.quantile(self._raw_scores(paths), self.contamination))
+        self._window_fill = 0
+
+    def _check(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2:
+            raise ValueError("Expected a 2D array of samples.")
+        if self.n_features is None:
+            self.n_features = X.shape[1]
+            self._window = np.empty((self.window_size, self.n_features))
+        elif X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}.")
+        return X
+
+    def decision_function(self, X):
+        """Score without learning: negative is anomalous; NaN during warm-up."""
+        X = self._check(X)
+        if not self.ready:
+            return np.full(len(X), np.nan)
+        scores = np.empty(len(X))
+        for start in range(0, len(X), self.window_size):  # bounds the (level, sample, tree) path array
+            chunk = X[start:start + self.window_size]
+            scores[start:start + len(chunk)] = self._raw_scores(self._paths(chunk)) - self.offset_
+        return scores
+
+    def predict(self, X):
+        """-1 for anomalies and 1 for inliers, as IsolationForest.predict (1 during warm-up)."""
+        return np.where(self.decision_function(X) < 0, -1, 1)
+
+    def score_partial_fit(self, X):
+        """Score each sample against the current reference profile, then learn it.
+
+        Samples are processed in order, so the result matches feeding them one
+        at a time; the batch is only split where a window ends.
+        """
+        X = self._check(X)
+        scores = np.full(len(X), np.nan)
+        start = 0
+        while start < len(X):
+            stop = min(len(X), start + self.window_size - self._window_fill)
+            chunk = X[start:stop]
+            fill = slice(self._window_fill, self._window_fill + len(chunk))
+            self._window[fill] = chunk
+            if self.ready:
+                paths = self._paths(chunk)
+                raw = self._raw_scores(paths)
+                self._window_scores[fill] = raw
+                scores[start:stop] = raw - self.offset_
+                self._count(paths)
+            self._window_fill += len(chunk)
+            self.samples_seen += len(chunk)
+            if self._window_fill == self.window_size:
+                self._end_window()
+            start = stop
+        return scores
+
+    def partial_fit(self, X):
+        self.score_partial_fit(X)
+        return self
+
+    @property
+    def nbytes(self):
+        arrays = ("_split_dim", "_split_value", "_reference", "_latest", "_window", "_window_scores")
+        return sum(getattr(self, name).nbytes for name in arrays if getattr(self, name, None) is not None)
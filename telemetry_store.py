@@ -0,0 +1,420 @@
+"""Append-friendly columnar binary storage for motor telemetry.
+
+A store is a directory (``*.dcts``) holding ``schema.json`` and fixed-size
+chunk files. Each chunk starts with a 64-byte header (magic, row count,
+capacity) followed by one fixed-width column block per schema column, so a
+column slice is a memory-mapped NumPy view with no parsing. Appends fill the
+last chunk in place and only then bump its row count, so readers never see
+half-written rows.
+
+    python telemetry_store.py import simulated_dc_motor_data.csv
+    python telemetry_store.py export simulated_dc_motor_data.dcts out.csv
+"""
+import argparse
+import json
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"DCTS0001"
+HEADER = struct.Struct("<8sQQ")  # magic, n_rows, capacity
+HEADER_SIZE = 64
+SCHEMA_FILE = "schema.json"
+STORE_SUFFIX = ".dcts"
+
+# Sensor readings are kept as float32: the tree models compare inputs in float32
+# anyway, so predictions on stored data match predictions on the CSV.
+DEFAULT_DTYPES = {
+    "motor_id": "<i4",
+    "Time (s)": "<f8",
+    "Voltage (V)": "<f4",
+    "Current (A)": "<f4",
+    "RPM": "<f4",
+    "Fault": "<i1",
+    "Anomaly": "<i1",
+    "Predicted Fault": "<i1",
+    "Scenario": "<i1",
+}
+
+
+def infer_dtypes(frame):
+    dtypes = {}
+    for col in frame.columns:
+        if col in DEFAULT_DTYPES:
+            dtypes[col] = DEFAULT_DTYPES[col]
+        elif pd.api.types.is_integer_dtype(frame[col]):
+            dtypes[col] = "<i4"
+        else:
+            dtypes[col] = "<f4"
+    return dtypes
+
+
+class TelemetryStore:
+    def __init__(self, path, writable=False):
+        self.path = path
+        self.writable = writable
+        self._lock = threading.Lock()
+        self.generation = 0
+        self._load_schema()
+        self.refresh()
+
+    def _load_schema(self):
+        schema_path = os.path.join(self.path, SCHEMA_FILE)
+        self._schema_inode = os.stat(schema_path).st_ino
+        with open(schema_path) as f:
+            schema = json.load(f)
+        self.chunk_rows = schema["chunk_rows"]
+        self.columns = [c["name"] for c in schema["columns"]]
+        self.dtypes = {c["name"]: np.dtype(c["dtype"]) for c in schema["columns"]}
+        self._offsets = {}
+        offset = HEADER_SIZE
+        for col in self.columns:
+            self._offsets[col] = offset
+            offset += self.chunk_rows * self.dtypes[col].itemsize
+        self._chunk_bytes = offset
+        self._maps = []
+
+    # --- Creation / opening ---
+    @classmethod
+    def create(cls, path, dtypes, chunk_rows=65536):
+        if chunk_rows % 8:
+            raise ValueError("chunk_rows must be a multiple of 8 to keep columns aligned")
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            if name.startswith("chunk-"):
+                os.remove(os.path.join(path, name))
+        schema = {"version": 1, "chunk_rows": chunk_rows,
+                  "columns": [{"name": k, "dtype": np.dtype(v).str} for k, v in dtypes.items()]}
+        tmp = os.path.join(path, SCHEMA_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(schema, f, indent=2)
+        os.replace(tmp, os.path.join(path, SCHEMA_FILE))
+        return cls(path, writable=True)
+
+    def _chunk_path(self, index):
+        return os.path.join(self.path, f"chunk-{index:06d}.bin")
+
+    def _map_chunk(self, index):
+        mode = "r+" if self.writable else "r"
+        return np.memmap(self._chunk_path(index), dtype=np.uint8, mode=mode, shape=(self._chunk_bytes,))
+
+    def _chunk_rows(self, mm):
+        magic, n_rows, _ = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path}: bad chunk header")
+        return n_rows
+
+    def refresh(self):
+        """Pick up chunks and rows appended by another process."""
+        with self._lock:
+            try:
+                inode = os.stat(os.path.join(self.path, SCHEMA_FILE)).st_ino
+            except FileNotFoundError:
+                inode = self._schema_inode  # mid-recreate; keep what we have
+            if inode != self._schema_inode:
+                # Store was recreated: reload the schema and drop old mappings
+                self._load_schema()
+                self.generation += 1
+            while os.path.exists(self._chunk_path(len(self._maps))):
+                self._maps.append(self._map_chunk(len(self._maps)))
+            self._rows = [self._chunk_rows(mm) for mm in self._maps]
+            self._starts = np.concatenate([[0], np.cumsum(self._rows, dtype=np.int64)])
+        return self
+
+    @property
+    def n_rows(self):
+        return int(self._starts[-1])
+
+    def __len__(self):
+        return self.n_rows
+
+    # --- Writing ---
+    def _new_chunk(self):
+        index = len(self._maps)
+        # Sized and stamped under a temporary name so readers never map an empty or headerless chunk
+        path = self._chunk_path(index)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.truncate(self._chunk_bytes)
+            f.write(HEADER.pack(MAGIC, 0, self.chunk_rows))
+        os.replace(tmp, path)
+        self._maps.append(self._map_chunk(index))
+        self._rows.append(0)
+
+    def append(self, columns):
+        """Append rows given as a DataFrame or a mapping of column -> array."""
+        if not self.writable:
+            raise PermissionError(f"{self.path} was opened read-only")
+        arrays = {col: np.asarray(columns[col]) for col in self.columns}
+        n_new = len(arrays[self.columns[0]])
+        written = 0
+        with self._lock:
+            while written < n_new:
+                if not self._maps or self._rows[-1] == self.chunk_rows:
+                    self._new_chunk()
+                mm, filled = self._maps[-1], self._rows[-1]
+                take = min(self.chunk_rows - filled, n_new - written)
+                for col in self.columns:
+                    dtype = self.dtypes[col]
+                    block = mm[self._offsets[col]:self._offsets[col] + self.chunk_rows * dtype.itemsize]
+                    block.view(dtype)[filled:filled + take] = arrays[col][written:written + take]
+                # Publish the rows only after their data is in place
+                HEADER.pack_into(mm, 0, MAGIC, filled + take, self.chunk_rows)
+                self._rows[-1] = filled + take
+                written += take
+            self._starts = np.concatenate([[0], np.cumsum(self._rows, dtype=np.int64)])
+
+    def write_chunk(self, index, columns):
+        """Write chunk ``index`` whole, for writers filling a store in parallel and out of order.
+
+        The chunk file appears atomically; ``refresh`` picks up chunks up to the
+        first one still missing. Does not touch this instance's mappings.
+        """
+        arrays = {col: np.asarray(columns[col]) for col in self.columns}
+        n_rows = len(arrays[self.columns[0]])
+        if n_rows > self.chunk_rows:
+            raise ValueError(f"{n_rows} rows do not fit a {self.chunk_rows}-row chunk")
+        buffer = np.zeros(self._chunk_bytes, dtype=np.uint8)
+        HEADER.pack_into(buffer, 0, MAGIC, n_rows, self.chunk_rows)
+        for col in self.columns:
+            dtype = self.dtypes[col]
+            block = buffer[self._offsets[col]:self._offsets[col] + self.chunk_rows * dtype.itemsize]
+            block.view(dtype)[:n_rows] = arrays[col]
+        path = self._chunk_path(index)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        buffer.tofile(tmp)
+        os.replace(tmp, path)
+
+    def flush(self):
+        for mm in self._maps[-1:]:
+            mm.flush()
+
+    # --- Reading ---
+    def _chunk_column(self, index, col):
+        dtype = self.dtypes[col]
+        start = self._offsets[col]
+        return self._maps[index][start:start + self.chunk_rows * dtype.itemsize].view(dtype)
+
+    def column(self, col, start=0, stop=None):
+        """Rows ``start:stop`` of one column; a zero-copy view when they sit in one chunk."""
+        stop = self.n_rows if stop is None else min(stop, self.n_rows)
+        if start >= stop:
+            return np.empty(0, dtype=self.dtypes[col])
+        first = int(np.searchsorted(self._starts, start, side="right")) - 1
+        last = int(np.searchsorted(self._starts, stop - 1, side="right")) - 1
+        parts = []
+        for index in range(first, last + 1):
+            lo = max(start - self._starts[index], 0)
+            hi = min(stop - self._starts[index], self._rows[index])
+            parts.append(self._chunk_column(index, col)[lo:hi])
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def read(self, start=0, stop=None, columns=None):
+        columns = self.columns if columns is None else list(columns)
+        return pd.DataFrame({col: self.column(col, start, stop) for col in columns}, copy=False)
+
+    def iter_chunks(self, columns=None):
+        for index, n in enumerate(self._rows):
+            start = int(self._starts[index])
+            yield self.read(start, start + n, columns)
+
+    # --- CSV compatibility ---
+    @classmethod
+    def from_csv(cls, csv_path, path=None, chunk_rows=65536, read_chunksize=500_000):
+        path = path or os.path.splitext(csv_path)[0] + STORE_SUFFIX
+        store = None
+        for frame in pd.read_csv(csv_path, chunksize=read_chunksize):
+            if store is None:
+                store = cls.create(path, infer_dtypes(frame), chunk_rows=chunk_rows)
+            store.append(frame)
+        if store is None:
+            header = pd.read_csv(csv_path, nrows=0)
+            store = cls.create(path, infer_dtypes(header), chunk_rows=chunk_rows)
+        store.flush()
+        return store
+
+    def to_csv(self, csv_path):
+        header = True
+        with open(csv_path, "w", newline="") as f:
+            for frame in self.iter_chunks():
+                frame.to_csv(f, index=False, header=header)
+                header = False
+            if header:
+                pd.DataFrame(columns=self.columns).to_csv(f, index=False)
+
+
+class StoreTailReader:
+    """Same interface as CsvTailReader, backed by a store: reads never parse.
+
+    Rows are copied out of the mapped chunks into growable column buffers
+    once, so each ``read`` costs the rows appended since the last one rather
+    than the whole history. The returned frame shares those buffers and must
+    be treated as read-only (adding new columns is fine). ``keep_rows`` bounds
+    the buffered rows as in CsvTailReader.
+    """
+
+    def __init__(self, path, initial_capacity=1024, keep_rows=None):
+        self.store = TelemetryStore(path)
+        self.initial_capacity = initial_capacity
+        self.keep_rows = keep_rows
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._generation = self.store.generation
+        self._buffers = {}
+        self._n_rows = 0  # rows buffered, store rows first_row onwards
+        self._first_row = 0
+
+    @property
+    def generation(self):
+        return self.store.generation
+
+    @property
+    def n_rows(self):
+        return self._first_row + self._n_rows
+
+    @property
+    def first_row(self):
+        return self._first_row
+
+    def read(self):
+        with self._lock:
+            store = self.store.refresh()
+            if store.generation != self._generation or store.n_rows < self.n_rows:
+                self._reset()
+            total = store.n_rows
+            if total > self.n_rows:
+                start = self.n_rows
+                if self.keep_rows and total - self._first_row > 2 * self.keep_rows:
+                    # Start the buffers over at the last keep_rows rows (or every new row, if more)
+                    first = min(total - self.keep_rows, start)
+                    self._buffers, self._first_row, self._n_rows = {}, first, 0
+                    start = first
+                needed = total - self._first_row
+                for col in store.columns:
+                    buf = self._buffers.get(col)
+                    if buf is None or len(buf) < needed:
+                        # Grow geometrically so appends stay amortized O(1) per row.
+                        grown = np.empty(max(self.initial_capacity, 2 * len(buf) if buf is not None else 0, needed),
+                                         dtype=store.dtypes[col])
+                        if buf is not None:
+                            grown[:self._n_rows] = buf[:self._n_rows]
+                        buf = self._buffers[col] = grown
+                    buf[self._n_rows:needed] = store.column(col, start, total)
+                self._n_rows = needed
+            return pd.DataFrame({col: self._buffers[col][:self._n_rows] if col in self._buffers
+                                 else np.empty(0, dtype=store.dtypes[col]) for col in store.columns}, copy=False)
+
+
+class TelemetryStoreWriter:
+    """Drop-in for BufferedCsvWriter that appends batches to a TelemetryStore."""
+
+    def __init__(self, path, columns, batch_size=1000, flush_interval=1.0, append=False, dtypes=None):
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+        self.flushes = 0
+        self._pending = []
+        self._last_flush = time.monotonic()
+        if append and os.path.exists(os.path.join(path, SCHEMA_FILE)):
+            self.store = TelemetryStore(path, writable=True)
+        else:
+            dtypes = dtypes or {col: DEFAULT_DTYPES.get(col, "<f4") for col in self.columns}
+            self.store = TelemetryStore.create(path, dtypes)
+
+    def write_row(self, values):
+        self.write_rows([values])
+
+    def write_rows(self, rows):
+        self._pending.extend(rows)
+        if len(self._pending) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            batch = list(zip(*self._pending))
+            self.store.append({col: batch[i] for i, col in enumerate(self.columns)})
+            self.rows_written += len(self._pending)
+            self.flushes += 1
+            self._pending.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self.store.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _store_mtime_ns(path):
+    """Latest modification time of a store's schema and chunk files."""
+    with os.scandir(path) as entries:
+        return max(entry.stat().st_mtime_ns for entry in entries
+                   if entry.name == SCHEMA_FILE or (entry.name.startswith("chunk-") and entry.name.endswith(".bin")))
+
+
+def store_path_for(path):
+    """The store to use for ``path``: itself if it is a store, else a sibling ``.dcts``.
+
+    The sibling is only used while it is at least as new as the CSV, so a
+    regenerated CSV is not shadowed by a store imported from its old contents.
+    """
+    if path.endswith(STORE_SUFFIX):
+        return path
+    candidate = os.path.splitext(path)[0] + STORE_SUFFIX
+    if not os.path.exists(os.path.join(candidate, SCHEMA_FILE)):
+        return None
+    try:
+        csv_mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return candidate
+    try:
+        return candidate if _store_mtime_ns(candidate) >= csv_mtime else None
+    except FileNotFoundError:  # store being recreated
+        return None
+
+
+def load_frame(path, columns=None):
+    """Load telemetry, preferring an up-to-date converted binary store over parsing the CSV."""
+    store_path = store_path_for(path)
+    if store_path is not None:
+        return TelemetryStore(store_path).read(columns=columns)
+    return pd.read_csv(path, usecols=columns)
+
+
+def telemetry_exists(path):
+    return store_path_for(path) is not None or os.path.exists(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert telemetry between CSV and the binary store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="CSV -> store")
+    imp.add_argument("csv")
+    imp.add_argument("store", nargs="?")
+    imp.add_argument("--chunk-rows", type=int, default=65536)
+    exp = sub.add_parser("export", help="store -> CSV")
+    exp.add_argument("store")
+    exp.add_argument("csv")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        store = TelemetryStore.from_csv(args.csv, args.store, chunk_rows=args.chunk_rows)
+        print(f"✅ Imported {store.n_rows} rows into {store.path}")
+    else:
+        TelemetryStore(args.store).to_csv(args.csv)
+        print(f"✅ Exported {args.store} to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import os
+import time
+
+from telemetry_store import STORE_SUFFIX, TelemetryStoreWriter
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return repr(value)  # shortest round-trip text, same as pandas.to_csv
+    return str(value)
+
+
+class BufferedCsvWriter:
+    """Append rows to a CSV file through one open handle, flushing in batches.
+
+    Rows are formatted into an in-memory buffer and written when ``batch_size``
+    rows are pending or ``flush_interval`` seconds have passed since the last
+    flush, whichever comes first. Every flush ends on a complete line, so
+    readers tailing the file never see half a batch as a finished row.
+    """
+
+    def __init__(self, path, columns, batch_size=1000, flush_interval=1.0, append=False):
+        self.path = path
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+        self.flushes = 0
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+        self._file = open(path, "a" if append else "w", encoding="utf-8", newline="")
+        if self._file.tell() == 0:
+            self._file.write(",".join(self.columns) + "\n")
+            self._file.flush()
+
+    def write_row(self, values):
+        self._pending.append(",".join(map(_format_value, values)))
+        if len(self._pending) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def write_rows(self, rows):
+        for values in rows:
+            self._pending.append(",".join(map(_format_value, values)))
+        if len(self._pending) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._file.write("\n".join(self._pending) + "\n")
+            self._file.flush()
+            self.rows_written += len(self._pending)
+            self.flushes += 1
+            self._pending.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_writer(path, columns, **kwargs):
+    """BufferedCsvWriter for ``*.csv`` paths, TelemetryStoreWriter for ``*.dcts`` stores."""
+    if path.endswith(STORE_SUFFIX):
+        return TelemetryStoreWriter(path, columns, **kwargs)
+    return BufferedCsvWriter(path, columns, **kwargs)
@@ -0,0 +1,75 @@
+import os
+
+import numpy as np
+
+from csv_tail_reader import CsvTailReader
+
+HEADER = "Time (s),Voltage (V),Current (A),RPM,Fault\n"
+
+
+def rows(start, stop, voltage):
+    return "".join(f"{t},{voltage},2.0,1500,0\n" for t in range(start, stop))
+
+
+def write(path, text, mode="w"):
+    with open(path, mode) as f:
+        f.write(text)
+
+
+def test_remove_recreate_grow(tmp_path):
+    path = tmp_path / "telemetry.csv"
+    write(path, HEADER + rows(0, 5, 12.0))
+    reader = CsvTailReader(str(path))
+    assert len(reader.read()) == 5
+
+    os.remove(path)
+    write(path, HEADER + rows(100, 102, 11.0))
+    write(path, rows(102, 110, 11.0), mode="a")  # grown past the old offset
+    data = reader.read()
+    np.testing.assert_array_equal(data["Time (s)"], np.arange(100, 110))
+    assert (data["Voltage (V)"] == 11.0).all()
+    assert reader.generation == 1
+
+
+def test_truncate_regrow(tmp_path):
+    path = tmp_path / "telemetry.csv"
+    write(path, HEADER + rows(0, 5, 12.0))
+    reader = CsvTailReader(str(path))
+    reader.read()
+    inode = os.stat(path).st_ino
+
+    with open(path, "r+") as f:
+        f.truncate(0)
+    write(path, HEADER + rows(200, 220, 11.0), mode="a")
+    assert os.stat(path).st_ino == inode
+    data = reader.read()
+    np.testing.assert_array_equal(data["Time (s)"], np.arange(200, 220))
+    assert not data.isna().any().any()
+
+
+def test_append_keeps_rows(tmp_path):
+    path = tmp_path / "telemetry.csv"
+    write(path, HEADER + rows(0, 5, 12.0))
+    reader = CsvTailReader(str(path))
+    reader.read()
+    write(path, rows(5, 8, 12.0) + "8,12.", mode="a")  # partial last line
+    np.testing.assert_array_equal(reader.read()["Time (s)"], np.arange(8))
+    write(path, "0,2.0,1500,0\n", mode="a")
+    np.testing.assert_array_equal(reader.read()["Time (s)"], np.arange(9))
+    assert reader.generation == 0
+
+
+def test_keep_rows_bounds_buffer(tmp_path):
+    path = tmp_path / "telemetry.csv"
+    write(path, HEADER)
+    reader = CsvTailReader(str(path), keep_rows=100)
+    total = 0
+    for n in (90, 150, 7, 300, 1):
+        write(path, rows(total, total + n, 12.0), mode="a")
+        total += n
+        data = reader.read()
+        assert reader.n_rows == total
+        assert len(data) <= max(200, n + 100)
+        # every new row is returned, after the kept ones
+        np.testing.assert_array_equal(data["Time (s)"], np.arange(reader.first_row, total))
+        assert reader.first_row <= total - n
@@ -0,0 +1,230 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from inference_cache import FEATURE_COLUMNS
+from interval_store import IntervalStore
+
+# Bucket widths in seconds, finest first; each must be a multiple of the one before
+DEFAULT_TIERS = (1, 10, 60, 600)
+
+
+class _Tier:
+    """Non-empty buckets of one width, in time order, stored in growable arrays."""
+
+    def __init__(self, width, n_values, n_counts, capacity):
+        self.width = width
+        self.n = 0
+        self.bucket = np.empty(capacity, dtype=np.int64)  # bucket start / width
+        self.samples = np.zeros(capacity, dtype=np.int64)
+        self.min = np.empty((capacity, n_values))
+        self.max = np.empty((capacity, n_values))
+        self.sum = np.zeros((capacity, n_values))
+        self.counts = np.zeros((capacity, n_counts), dtype=np.int64)
+
+    def _reserve(self, n):
+        capacity = len(self.bucket)
+        if n <= capacity:
+            return
+        capacity = max(capacity * 2, n + n // 2)  # room for the appends after a bulk load
+        for name in ("bucket", "samples", "min", "max", "sum", "counts"):
+            old = getattr(self, name)
+            new = np.zeros((capacity, *old.shape[1:]), dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    def append(self, times, values, counts):
+        """Fold time-ordered rows in; rows falling in the last bucket are merged into it."""
+        buckets = np.floor(times / self.width).astype(np.int64)
+        if self.n and buckets[0] < self.bucket[self.n - 1]:
+            raise ValueError(f"rows at {times[0]} s are older than the indexed ones")
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        samples = np.diff(np.r_[starts, len(buckets)])
+        mins = np.minimum.reduceat(values, starts, axis=0)
+        maxs = np.maximum.reduceat(values, starts, axis=0)
+        sums = np.add.reduceat(values, starts, axis=0)
+        sub_counts = np.add.reduceat(counts, starts, axis=0)
+
+        if self.n and buckets[0] == self.bucket[self.n - 1]:
+            last = self.n - 1
+            self.samples[last] += samples[0]
+            self.min[last] = np.minimum(self.min[last], mins[0])
+            self.max[last] = np.maximum(self.max[last], maxs[0])
+            self.sum[last] += sums[0]
+            self.counts[last] += sub_counts[0]
+            starts, samples, mins, maxs, sums, sub_counts = (a[1:] for a in (starts, samples, mins, maxs, sums,
+                                                                             sub_counts))
+        n_new = len(starts)
+        self._reserve(self.n + n_new)
+        rows = slice(self.n, self.n + n_new)
+        self.bucket[rows] = buckets[starts]
+        self.samples[rows] = samples
+        self.min[rows] = mins
+        self.max[rows] = maxs
+        self.sum[rows] = sums
+        self.counts[rows] = sub_counts
+        self.n += n_new
+
+    def span(self, lo, hi):
+        """Positions of the buckets numbered ``lo <= bucket < hi``."""
+        buckets = self.bucket[:self.n]
+        return slice(int(np.searchsorted(buckets, lo)), int(np.searchsorted(buckets, hi)))
+
+
+class TimeIndex:
+    """Pre-aggregated pyramid over a telemetry stream for fast time-range queries.
+
+    Every tier holds, per bucket of its width, the sample count, the min, max
+    and mean of each feature column and the number of recorded faults,
+    predicted faults and anomalies. ``update`` takes the append-only,
+    time-ordered telemetry frame and folds in the rows after the ones already
+    indexed, scoring them with one batched call per model, so the models never
+    see a row twice.
+
+    ``query`` answers a range from the coarsest tier that still gives
+    ``n_points`` buckets, and ``totals`` sums a range from the coarsest buckets
+    that fit inside it plus finer ones at the edges; both cost O(tiers +
+    n_points) however long the history is. Ranges resolve to whole buckets of
+    the finest tier. Runs of predicted faults and anomalies are also kept as
+    intervals in ``intervals``, an IntervalStore.
+    """
+
+    def __init__(self, fault_model=None, anomaly_model=None, tiers=DEFAULT_TIERS, columns=FEATURE_COLUMNS,
+                 initial_capacity=1024):
+        if any(coarse % fine for fine, coarse in zip(tiers, tiers[1:])):
+            raise ValueError(f"each tier width must be a multiple of the previous one, got {tiers}")
+        self.fault_model = fault_model
+        self.anomaly_model = anomaly_model
+        self.tiers = tuple(tiers)
+        self.columns = list(columns)
+        self.count_columns = (["Fault"] + (["Predicted Fault"] if fault_model is not None else [])
+                              + (["Anomaly"] if anomaly_model is not None else []))
+        self.initial_capacity = initial_capacity
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, source_version):
+        self.source_version = source_version
+        self.n_rows = 0
+        self.last_time = None
+        self.intervals = IntervalStore()
+        self._tiers = [_Tier(width, len(self.columns), len(self.count_columns), self.initial_capacity)
+                       for width in self.tiers]
+
+    @property
+    def start_time(self):
+        tier = self._tiers[0]
+        return float(tier.bucket[0] * tier.width) if tier.n else None
+
+    def update(self, data, source_version=None):
+        """Index the rows of ``data`` after the ones already seen; returns how many were new.
+
+        The index starts over when ``source_version`` changes or ``data`` no
+        longer starts with the indexed rows.
+        """
+        with self._lock:
+            times = data['Time (s)'].to_numpy()
+            if (source_version != self.source_version or len(data) < self.n_rows
+                    or (self.n_rows and times[self.n_rows - 1] != self.last_time)):
+                self._reset(source_version)
+            new = data.iloc[self.n_rows:]
+            if len(new):
+                self._append(times[self.n_rows:].astype(np.float64), new)
+                self.n_rows = len(data)
+                self.last_time = float(times[-1])
+            return len(new)
+
+    def _append(self, times, new):
+        features = new[self.columns]
+        scores = {'Fault': new['Fault'].to_numpy(dtype=np.int64) if 'Fault' in new.columns
+                  else np.zeros(len(new), dtype=np.int64)}
+        if self.fault_model is not None:
+            proba = self.fault_model.predict_proba(features)
+            scores['Predicted Fault'] = self.fault_model.classes_.take(np.argmax(proba, axis=1)).astype(np.int64)
+            scores['Fault Probability'] = proba[:, 1]
+        if self.anomaly_model is not None:
+            scores['Anomaly Score'] = self.anomaly_model.decision_function(features)
+            scores['Anomaly'] = (scores['Anomaly Score'] < 0).astype(np.int64)
+        values = features.to_numpy(dtype=np.float64)
+        counts = np.column_stack([scores[col] for col in self.count_columns])
+        for tier in self._tiers:
+            tier.append(times, values, counts)
+        self.intervals.append(times, scores)
+
+    def _finest_range(self, t0, t1):
+        width = self.tiers[0]
+        return int(np.floor(t0 / width)), int(np.floor(t1 / width)) + 1
+
+    def query(self, t0, t1, n_points):
+        """At most ``n_points`` buckets overlapping ``t0 <= time <= t1``.
+
+        Returns ``(resolution_s, frame)``; ``frame`` has one row per bucket:
+        its start time, samples, min/max/mean of each column and the counts.
+        When the chosen tier has more than ``n_points`` buckets in range,
+        runs of ``group`` consecutive ones are merged, starting from the first
+        in range, and the resolution is ``group`` times the tier width (the
+        last merged bucket stops at the end of the range).
+        """
+        with self._lock:
+            lo, hi = self._finest_range(t0, t1)
+            for tier in reversed(self._tiers):
+                ratio = tier.width // self.tiers[0]
+                rows = tier.span(lo // ratio, -(-hi // ratio))
+                if rows.stop - rows.start >= n_points:
+                    break
+            buckets = tier.bucket[rows]
+            samples, mins, maxs = tier.samples[rows], tier.min[rows], tier.max[rows]
+            sums, counts = tier.sum[rows], tier.counts[rows]
+            group = 1
+            if len(buckets) > n_points:
+                group = -(-int(buckets[-1] - buckets[0]) // max(n_points - 1, 1))
+                keys = (buckets - buckets[0]) // group
+                starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+                buckets = buckets[0] + keys[starts] * group
+                samples = np.add.reduceat(samples, starts)
+                mins = np.minimum.reduceat(mins, starts, axis=0)
+                maxs = np.maximum.reduceat(maxs, starts, axis=0)
+                sums = np.add.reduceat(sums, starts, axis=0)
+                counts = np.add.reduceat(counts, starts, axis=0)
+            frame = {"Time (s)": (buckets * tier.width).astype(np.float64), "Samples": samples.copy()}
+            for i, col in enumerate(self.columns):
+                frame[f"{col} min"] = mins[:, i].copy()
+                frame[f"{col} max"] = maxs[:, i].copy()
+                frame[f"{col} mean"] = sums[:, i] / samples
+            for i, col in enumerate(self.count_columns):
+                frame[col] = counts[:, i].copy()
+        return tier.width * group, pd.DataFrame(frame)
+
+    def totals(self, t0, t1):
+        """Samples, counts and per-column min/max/mean of ``t0 <= time <= t1`` as a dict."""
+        with self._lock:
+            lo, hi = self._finest_range(t0, t1)
+            parts = []
+            self._collect(len(self._tiers) - 1, lo, hi, parts)
+            samples = sum(int(tier.samples[rows].sum()) for tier, rows in parts)
+            result = {"Samples": samples}
+            for i, col in enumerate(self.count_columns):
+                result[col] = sum(int(tier.counts[rows, i].sum()) for tier, rows in parts)
+            for i, col in enumerate(self.columns):
+                filled = [(tier, rows) for tier, rows in parts if rows.stop > rows.start]
+                result[f"{col} min"] = min((float(t.min[r, i].min()) for t, r in filled), default=np.nan)
+                result[f"{col} max"] = max((float(t.max[r, i].max()) for t, r in filled), default=np.nan)
+                total = sum(float(t.sum[r, i].sum()) for t, r in filled)
+                result[f"{col} mean"] = total / samples if samples else np.nan
+        return result
+
+    def _collect(self, level, lo, hi, parts):
+        """Cover finest-tier buckets ``lo <= b < hi`` with whole buckets of tier ``level`` and finer."""
+        if lo >= hi:
+            return
+        tier = self._tiers[level]
+        ratio = tier.width // self.tiers[0]
+        inner_lo, inner_hi = -(-lo // ratio), hi // ratio
+        if level == 0 or inner_lo < inner_hi:
+            parts.append((tier, tier.span(inner_lo, inner_hi)))
+            if level:
+                self._collect(level - 1, lo, inner_lo * ratio, parts)
+                self._collect(level - 1, inner_hi * ratio, hi, parts)
+        else:
+            self._collect(level - 1, lo, hi, parts)
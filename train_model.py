@@ -1,45 +1,166 @@
-import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
-import joblib
+from sklearn.metrics import accuracy_score, classification_report
+import argparse
 import os
 import json
+from telemetry_store import load_frame
+from model_registry import MODEL_DIR, METRICS_PATH, dump_model, file_sha256
+from hyperparameter_search import DEFAULT_GRID, best_params, run_search
+from rolling_features import RollingFeatureEngine, with_rolling_features
+from out_of_core_training import sample_training_data
 
-# --- Load data ---
-df = pd.read_csv("simulated_dc_motor_data.csv")
-X = df[['Voltage (V)', 'Current (A)', 'RPM']]
-y = df['Fault']
+FEATURE_COLUMNS = ['Voltage (V)', 'Current (A)', 'RPM']
+DATA_PATH = "simulated_dc_motor_data.csv"
+MODEL_PATH = os.path.join(MODEL_DIR, "dc_motor_fault_model.pkl")
+LEADERBOARD_PATH = os.path.join(MODEL_DIR, "leaderboard.csv")
 
-# --- Split data ---
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+# Models on rolling features are saved separately, with the engine that built their inputs
+ROLLING_MODEL_PATH = os.path.join(MODEL_DIR, "dc_motor_fault_model_rolling.pkl")
+ROLLING_METRICS_PATH = os.path.join(MODEL_DIR, "metrics_rolling.json")
+ROLLING_LEADERBOARD_PATH = os.path.join(MODEL_DIR, "leaderboard_rolling.csv")
 
-# --- Train model ---
-model = RandomForestClassifier(n_estimators=100, random_state=42)
-model.fit(X_train, y_train)
 
-# --- Predict on test set ---
-y_pred = model.predict(X_test)
+def split_data(df, test_size=0.2, random_state=42, feature_engine=None):
+    y = df['Fault']
+    if feature_engine is None:
+        return train_test_split(df[FEATURE_COLUMNS], y, test_size=test_size, random_state=random_state)
+    # Rolling windows overlap neighbouring rows, so a random split would leak test rows into training:
+    # hold out the last ``test_size`` of the (time-ordered) history instead
+    X = with_rolling_features(df, feature_engine)
+    return train_test_split(X, y, test_size=test_size, shuffle=False)
 
-# --- Calculate accuracy ---
-accuracy = accuracy_score(y_test, y_pred)
 
-# --- Save model ---
-os.makedirs("model", exist_ok=True)
-joblib.dump(model, "dc_motor_fault_model.pkl")
+def train_fault_model(X_train, y_train, n_estimators=100, random_state=42, n_jobs=None, sample_weight=None,
+                      **params):
+    model = RandomForestClassifier(n_estimators=n_estimators, random_state=random_state, n_jobs=n_jobs, **params)
+    model.fit(X_train, y_train, sample_weight=sample_weight)
+    return model
 
-# --- Save accuracy to metrics.json ---
-with open("model/metrics.json", "w") as f:
-    json.dump({"accuracy": accuracy}, f)
 
-print(f"✅ Model trained and saved with accuracy: {accuracy:.4f}")
+def _grid_value(text):
+    if text.lower() == "none":
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return text
 
-# --- 🔽 NEW: Generate and save classification report ---
-from sklearn.metrics import classification_report
 
-report = classification_report(y_test, y_pred, target_names=["Healthy", "Faulty"])
-report_path = "model/classification_report.txt"
-with open(report_path, "w") as f:
-    f.write(report)
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train the DC motor fault classifier.")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--features", choices=["raw", "rolling"], default="raw",
+                        help="rolling: add rolling mean/std/slope/rate/EWMA features (saved as a separate model)")
+    parser.add_argument("--windows", type=float, nargs="+", default=[10, 60, 600],
+                        help="rolling feature windows in seconds")
+    parser.add_argument("--sampling-interval", type=float, default=1.0,
+                        help="seconds between samples in --data, for the rolling windows")
+    parser.add_argument("--jobs", type=int, default=-1,
+                        help="cores for fitting and for the search pool (-1: all)")
+    parser.add_argument("--search", action="store_true",
+                        help="cross-validated search over forest size, depth and max_features")
+    parser.add_argument("--n-estimators", type=int, nargs="+", default=DEFAULT_GRID["n_estimators"])
+    parser.add_argument("--max-depth", type=_grid_value, nargs="+", default=DEFAULT_GRID["max_depth"])
+    parser.add_argument("--max-features", type=_grid_value, nargs="+", default=DEFAULT_GRID["max_features"])
+    parser.add_argument("--cv", type=int, default=5)
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="seconds; stop starting new fits after this and rank what finished")
+    parser.add_argument("--streaming", action="store_true",
+                        help="read --data in chunks and train on a bounded, fault-stratified sample")
+    parser.add_argument("--memory-budget", type=float, default=512,
+                        help="streaming: MiB for the chunk being read plus the kept sample")
+    parser.add_argument("--chunk-rows", type=int, default=None,
+                        help="streaming: rows per chunk (default: derived from --memory-budget)")
+    return parser.parse_args()
 
-print(f"📄 Classification report saved to {report_path}")
+
+def main():
+    args = parse_args()
+    n_jobs = None if args.jobs == -1 else args.jobs
+
+    feature_engine = None
+    model_path, metrics_path, leaderboard_path = MODEL_PATH, METRICS_PATH, LEADERBOARD_PATH
+    if args.features == "rolling":
+        feature_engine = RollingFeatureEngine(windows=args.windows, sampling_interval=args.sampling_interval)
+        model_path, metrics_path, leaderboard_path = ROLLING_MODEL_PATH, ROLLING_METRICS_PATH, ROLLING_LEADERBOARD_PATH
+
+    params, extra_metrics = {}, {}
+    w_train = None
+    if args.streaming:
+        # --- One chunked pass: fault-stratified training sample (weighted back to the class mix) and test sample ---
+        X_train, X_test, y_train, y_test, w_train, info = sample_training_data(
+            args.data, FEATURE_COLUMNS, memory_mb=args.memory_budget, chunk_rows=args.chunk_rows,
+            feature_engine=feature_engine)
+        print(f"📦 Streamed {info['rows_seen']:,} rows in chunks of {info['chunk_rows']:,}; "
+              f"kept {info['train_rows']:,} for training and {info['test_rows']:,} for testing")
+        extra_metrics["streaming"] = info
+    else:
+        # --- Load data (binary store if one was imported next to the CSV) ---
+        df = load_frame(args.data)
+
+        # --- Rolling features are computed over the time-ordered history, before the split ---
+        if feature_engine is not None:
+            df = df.sort_values('Time (s)', kind="stable")
+
+        # --- Split data ---
+        X_train, X_test, y_train, y_test = split_data(df, feature_engine=feature_engine)
+
+    # --- Train model (optionally pick its parameters by cross-validated search) ---
+    if args.search:
+        grid = {"n_estimators": args.n_estimators, "max_depth": args.max_depth,
+                "max_features": args.max_features}
+        leaderboard = run_search(X_train, y_train, grid, cv=args.cv, n_jobs=n_jobs,
+                                 time_budget=args.time_budget, sample_weight=w_train)
+        info = leaderboard.attrs
+        print(f"🔎 Evaluated {info['evaluated']}/{info['candidates']} parameter sets in "
+              f"{info['wall_seconds']:.1f} s" + (" (time budget reached)" if info["timed_out"] else ""))
+        if leaderboard.empty:
+            raise SystemExit("No parameter set finished within the time budget; raise --time-budget.")
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        leaderboard.to_csv(leaderboard_path, index=False)
+        print(f"📄 Leaderboard saved to {leaderboard_path}")
+        params = best_params(leaderboard, grid)
+        extra_metrics.update(params=params, cv_accuracy=float(leaderboard["mean_accuracy"].iloc[0]),
+                             cv_folds=args.cv, leaderboard_path=leaderboard_path)
+    model = train_fault_model(X_train, y_train, n_jobs=args.jobs, sample_weight=w_train, **params)
+
+    # --- Predict on test set ---
+    y_pred = model.predict(X_test)
+
+    # --- Calculate accuracy ---
+    accuracy = accuracy_score(y_test, y_pred)
+
+    # --- Save model (single-threaded prediction by default in the dashboards) ---
+    model.set_params(n_jobs=None)
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    if feature_engine is None:
+        dump_model(model, model_path)
+    else:
+        feature_engine.reset()
+        dump_model({"model": model, "feature_engine": feature_engine}, model_path)
+        extra_metrics["features"] = list(X_train.columns)
+
+    # --- Save accuracy to metrics.json (with the model hash so dashboards can tell they match) ---
+    with open(metrics_path, "w") as f:
+        json.dump({"accuracy": accuracy,
+                   "model_path": model_path,
+                   "model_sha256": file_sha256(model_path),
+                   **extra_metrics}, f)
+
+    print(f"✅ Model trained and saved to {model_path} with accuracy: {accuracy:.4f}")
+
+    # --- Generate and save classification report ---
+    # A time-ordered holdout may hold only one class, so both labels are listed explicitly
+    report = classification_report(y_test, y_pred, labels=[0, 1], target_names=["Healthy", "Faulty"],
+                                   zero_division=0)
+    report_path = os.path.join(MODEL_DIR, "classification_report.txt" if feature_engine is None
+                               else "classification_report_rolling.txt")
+    with open(report_path, "w") as f:
+        f.write(report)
+
+    print(f"📄 Classification report saved to {report_path}")
+
+
+if __name__ == "__main__":
+    main()